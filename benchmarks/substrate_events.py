@@ -0,0 +1,206 @@
+import gzip
+import json
+import sys
+import time
+import typing
+
+from docopt import docopt
+from scalecodec.base import ScaleBytes
+from substrateinterface import SubstrateInterface
+from substrateinterface.contracts import ContractEvent
+
+sys.path.append(".")
+
+from src.network.substrate_chain import SubstrateChain  # noqa: E402
+
+__doc__ = """
+Benchmark of the Request event scan of SubstrateChain.get_block_events.
+
+Usage:
+  substrate_events.py record <chain> <url> <start_block> <count> <fixture> [<contract> ...]
+  substrate_events.py replay <fixture> [--repeat <repeat>]
+
+Commands:
+   record      Scan `count` blocks from `start_block` on the node `url` and record the
+               node's responses to `fixture` (gzipped JSON).
+   replay      Scan the recorded blocks without a node, once decoding every contract
+               event before filtering by address (baseline) and once filtering the raw
+               addresses first (prefilter).
+
+Options:
+   --repeat <repeat>        Number of scans of the recorded blocks [default: 5]
+"""
+
+
+class RecordingSubstrate(SubstrateInterface):
+    """SubstrateInterface recording every JSON-RPC response."""
+
+    def __init__(self, *args, **kwargs):
+        self.responses: typing.Dict[str, dict] = {}
+        super().__init__(*args, **kwargs)
+
+    def rpc_request(self, method, params, *args, **kwargs):
+        response = super().rpc_request(method, params, *args, **kwargs)
+        self.responses[json.dumps([method, params])] = response
+        return response
+
+
+class ReplaySubstrate(SubstrateInterface):
+    """SubstrateInterface answering JSON-RPC requests from a recording."""
+
+    def __init__(self, responses: typing.Dict[str, dict]):
+        self.responses = responses
+        super().__init__(url="http://replay")
+
+    def rpc_request(self, method, params, *args, **kwargs):
+        return self.responses[json.dumps([method, params])]
+
+
+def record(
+    chain_name: str,
+    url: str,
+    start_block: int,
+    count: int,
+    fixture: str,
+    contracts: typing.List[str],
+) -> None:
+    """Record the node responses needed to scan `count` blocks from `start_block`.
+
+    Args:
+        chain_name (str): name of the chain
+        url (str): websocket URL of the node
+        start_block (int): first block to record
+        count (int): number of blocks to record
+        fixture (str): path of the recording
+        contracts (List[str]): tracked contract addresses
+    """
+    substrate = RecordingSubstrate(url)
+    chain = SubstrateChain(chain_name, url=url, tracked_contracts=contracts)
+    chain.get_connection = lambda validate_chain=True: substrate
+
+    block_hashes = [
+        substrate.get_block_hash(block_nr)
+        for block_nr in range(start_block, start_block + count)
+    ]
+    for block_hash in block_hashes:
+        chain.get_block_events(block_hash)
+
+    with gzip.open(fixture, "wt") as f:
+        json.dump(
+            {
+                "chain": chain_name,
+                "tracked_contracts": contracts,
+                "block_hashes": block_hashes,
+                "responses": substrate.responses,
+            },
+            f,
+        )
+
+    print(f"Recorded {count} blocks of {chain_name} to {fixture}.")
+
+
+def decode_then_filter(
+    chain: SubstrateChain, substrate: SubstrateInterface, block_hash: str
+) -> list:
+    """Scan `block_hash` decoding every contract event before checking its address,
+    as get_block_events did before the address pre-filter.
+
+    Args:
+        chain (SubstrateChain): scanned chain
+        substrate (SubstrateInterface): connection to the chain
+        block_hash (str): block hash
+
+    Returns:
+        list: list of tuples (event, decoded_event)
+    """
+    metadata = chain._get_runtime_metadata(substrate, block_hash)
+    contract_metadata = chain._get_contract_metadata(substrate)
+
+    new_events = []
+    for event in substrate.get_block_events(block_hash, metadata).elements:
+        if (
+            event.event_module.name == "Contracts"
+            and event.event.name == "ContractExecution"
+        ):
+            try:
+                decoded_event = ContractEvent(
+                    data=ScaleBytes(event.params[1]["value"]),
+                    runtime_config=substrate.runtime_config,
+                    contract_metadata=contract_metadata,
+                ).decode()
+            except Exception:
+                # Events of other contracts do not match the oracle metadata
+                continue
+
+            if decoded_event["name"] == "Request":
+                if (
+                    substrate.ss58_encode(event.params[0]["value"])
+                    in chain.tracked_contracts
+                ):
+                    new_events.append((event, decoded_event))
+
+    return new_events
+
+
+def replay(fixture: str, repeat: int) -> None:
+    """Scan the recorded blocks with and without the address pre-filter.
+
+    Args:
+        fixture (str): path of the recording
+        repeat (int): number of scans of the recorded blocks
+    """
+    with gzip.open(fixture, "rt") as f:
+        recording = json.load(f)
+
+    substrate = ReplaySubstrate(recording["responses"])
+    chain = SubstrateChain(
+        recording["chain"], tracked_contracts=recording["tracked_contracts"]
+    )
+    chain.get_connection = lambda validate_chain=True: substrate
+    block_hashes = recording["block_hashes"]
+
+    scans = {
+        "baseline": lambda block_hash: decode_then_filter(chain, substrate, block_hash),
+        "prefilter": chain.get_block_events,
+    }
+
+    # Warm the metadata caches, both variants share them
+    for block_hash in block_hashes:
+        chain.get_block_events(block_hash)
+
+    timings = {}
+    for name, scan in scans.items():
+        started_at = time.perf_counter()
+        for _ in range(repeat):
+            events = [
+                event for block_hash in block_hashes for event in scan(block_hash)
+            ]
+        timings[name] = (time.perf_counter() - started_at) / (
+            repeat * len(block_hashes)
+        )
+        print(
+            f"{name:>10}: {timings[name] * 1000:8.3f} ms/block, "
+            f"{len(events)} Request events"
+        )
+
+    print(f"{'speedup':>10}: {timings['baseline'] / timings['prefilter']:8.2f}x")
+
+
+def main():
+    args = docopt(__doc__)
+
+    if args["record"]:
+        record(
+            args["<chain>"],
+            args["<url>"],
+            int(args["<start_block>"]),
+            int(args["<count>"]),
+            args["<fixture>"],
+            args["<contract>"],
+        )
+    elif args["replay"]:
+        replay(args["<fixture>"], int(args["--repeat"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,19 @@ from sanic import Sanic
 from sanic.log import logger
 from sanic_cors import CORS
 
-from src.api import chains_bp, contracts_bp, ipfs_bp, pql_bp
+from src.api import chains_bp, contracts_bp, ipfs_bp, metrics_bp, pql_bp
 from src.api.jsonrpc import init_jsonrpc_endpoints
 from src.config import config
 from src.logging import DEFAULT_LOGGING_CONFIG
 from src.models.chain import Chain
 from src.models.contract import Contract
 from src.network import chains
+from src.pql.handlers.abi_cache import abi_cache
 from src.process import processor
-from src.process.collector import start_collecting
+from src.process.collector import start_collecting, supervise_collectors
+from src.utils.http import session_manager
+from src.utils.ipfs import ipfs_cache
+from src.utils.postgres import pool_registry
 
 
 def create_app(args: dict = {}) -> Sanic:  # noqa: C901
@@ -33,6 +37,7 @@ def create_app(args: dict = {}) -> Sanic:  # noqa: C901
     app.blueprint(pql_bp)
     app.blueprint(chains_bp)
     app.blueprint(contracts_bp)
+    app.blueprint(metrics_bp)
 
     CORS(app)
 
@@ -47,6 +52,34 @@ def configure_hooks(app: Sanic):
     Args:
         app (Sanic): Sanic app
     """
+
+    @app.listener("before_server_start")
+    async def open_http_session(*args, **kwargs):
+        """Opens the pooled HTTP session shared by PQL handlers."""
+        await session_manager.start()
+
+    @app.listener("before_server_start")
+    async def warm_ipfs_cache(*args, **kwargs):
+        """Loads recently used PQL definitions from the on-disk IPFS cache."""
+        ipfs_cache.warm_start()
+
+    if app.config["ABI_SEED_FOLDER"]:
+
+        @app.listener("before_server_start")
+        async def seed_abi_cache(*args, **kwargs):
+            """Pre-seeds the contract ABI cache from local ABI files."""
+            abi_cache.seed(app.config["ABI_SEED_FOLDER"])
+
+    @app.listener("after_server_stop")
+    async def close_http_session(*args, **kwargs):
+        """Closes the pooled HTTP session after server stops."""
+        await session_manager.close()
+
+    @app.listener("after_server_stop")
+    async def close_sql_pools(*args, **kwargs):
+        """Closes PQL database connection pools after server stops."""
+        await pool_registry.close()
+
     # Configure database listeners
     if app.config["ENABLE_DATABASE"]:
         from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
@@ -57,7 +90,10 @@ def configure_hooks(app: Sanic):
         @app.listener("before_server_start")
         async def connect_to_db(*args, **kwargs):
             """Initalizes DB before server starts."""
-            app.db = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)()
+            app.db_session_factory = sessionmaker(
+                engine, expire_on_commit=False, class_=AsyncSession
+            )
+            app.db = app.db_session_factory()
 
         @app.listener("after_server_start")
         async def check_user_signup(*args, **kwargs):
@@ -93,5 +129,11 @@ def configure_hooks(app: Sanic):
 
         @app.listener("after_server_start")
         async def start_collectors(*args, **kwargs):
-            """Start collectors to listen for oracle events."""
+            """Start collectors to listen for oracle events, and requeue listener
+            tasks that stop sending heartbeats."""
             await start_collecting(processor, chains, app.db)
+
+            if config.COLLECTOR_MODE == "celery":
+                app.add_task(
+                    supervise_collectors(processor, chains, app.db_session_factory)
+                )
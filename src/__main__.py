@@ -2,6 +2,7 @@ import logging
 
 from docopt import docopt
 
+import src.cli.collector
 import src.cli.node
 from src.config import __version__, config
 from src.logging import setup_logging
@@ -14,6 +15,7 @@ Usage: paralink-node [--version] <command> [<args>...] [options <args>]
 
 Commands:
    node       node actions, such as start.
+   collector  collector service actions, such as start.
 
 options:
    -h, --help       display this message.
@@ -30,6 +32,8 @@ def main():
 
     if args["<command>"] == "node":
         src.cli.node.main()
+    elif args["<command>"] == "collector":
+        src.cli.collector.main()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 from src.api.chains import chains_bp
 from src.api.contracts import contracts_bp
 from src.api.ipfs import ipfs_bp
+from src.api.metrics import metrics_bp
 from src.api.pql import pql_bp
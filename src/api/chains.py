@@ -60,6 +60,6 @@ async def set_chain_status(request, chain: str) -> response:
 
     if request.app.config["ENABLE_BACKGROUND_WORKER"]:
         await chains.from_sql(request.app.db)
-        manage_collector(processor, chains.get_chain(chain))
+        await manage_collector(processor, chains.get_chain(chain), request.app.db)
 
     return response.json({"result": "ok"})
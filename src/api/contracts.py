@@ -63,7 +63,9 @@ async def create_contract(request) -> response:
 
     if request.app.config["ENABLE_BACKGROUND_WORKER"]:
         await chains.from_sql(request.app.db)
-        manage_collector(processor, chains.get_chain(data["chain"]))
+        await manage_collector(
+            processor, chains.get_chain(data["chain"]), request.app.db
+        )
     return response.json({"result": "ok"})
 
 
@@ -83,8 +85,10 @@ async def set_contract_status(request, id: str) -> response:
 
     if request.app.config["ENABLE_BACKGROUND_WORKER"]:
         await chains.from_sql(request.app.db)
-        manage_collector(
-            processor, (await Contract.get_contract(request.app.db, int(id))).chain
+        await manage_collector(
+            processor,
+            (await Contract.get_contract(request.app.db, int(id))).chain,
+            request.app.db,
         )
 
     return response.json({"result": "ok"})
@@ -105,8 +109,10 @@ async def delete_contract(request, id: int):
 
     if request.app.config["ENABLE_BACKGROUND_WORKER"]:
         await chains.from_sql(request.app.db)
-        manage_collector(
-            processor, (await Contract.get_contract(request.app.db, id)).chain
+        await manage_collector(
+            processor,
+            (await Contract.get_contract(request.app.db, id)).chain,
+            request.app.db,
         )
 
     return response.json({"result": "ok"})
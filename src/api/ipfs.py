@@ -2,6 +2,8 @@ import ipfshttpclient
 from ipfshttpclient.exceptions import DecodingError
 from sanic import Blueprint, response
 
+from src.utils.ipfs import ipfs_cache
+
 ipfs_bp = Blueprint("ipfs_blueprint", url_prefix="/api/ipfs")
 
 
@@ -34,10 +36,12 @@ async def api_ipfs_hash(request, ipfs_hash: str):
             }
         )
 
-    ipfs = ipfshttpclient.connect(request.app.config["IPFS_API_SERVER_ADDRESS"])
-
     try:
-        js = ipfs.get_json(ipfs_hash, timeout=int(request.app.config["--timeout"]))
+        js = ipfs_cache.get_json(
+            ipfs_hash,
+            timeout=int(request.app.config["--timeout"]),
+            address=request.app.config["IPFS_API_SERVER_ADDRESS"],
+        )
 
         return response.json({"pql": js, "hash": ipfs_hash})
     except DecodingError:
@@ -1,6 +1,5 @@
 import json
 
-import ipfshttpclient
 from ipfshttpclient.exceptions import DecodingError
 from requests.exceptions import ReadTimeout
 from sanic import Blueprint, Sanic, response
@@ -9,6 +8,7 @@ from sanic_jsonrpc import SanicJsonrpc
 
 from src.pql.exceptions import PqlDecodingError
 from src.pql.parser import parse_and_execute
+from src.utils.ipfs import ipfs_cache
 
 
 def init_jsonrpc_endpoints(app: Sanic) -> None:
@@ -54,11 +54,10 @@ def init_jsonrpc_endpoints(app: Sanic) -> None:
         logger.info(f"Execute IPFS PQL {ipfs_address}/{ipfs_hash} request.")
 
         try:
-            # Connect to the IPFS API server
-            ipfs = ipfshttpclient.connect(ipfs_address)
-
-            # Fetch the JSON from the hash
-            req = ipfs.get_json(ipfs_hash, timeout=int(app.config["--timeout"]))
+            # Fetch the JSON from the hash, IPFS is only reached on cache misses
+            req = ipfs_cache.get_json(
+                ipfs_hash, timeout=int(app.config["--timeout"]), address=ipfs_address
+            )
         except DecodingError:
             raise PqlDecodingError("object decoding error, expecting JSON format.")
         except ReadTimeout:
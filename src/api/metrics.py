@@ -0,0 +1,18 @@
+from sanic import Blueprint, response
+
+from src.utils.metrics import metrics
+
+metrics_bp = Blueprint("metrics_blueprint", url_prefix="/api/metrics")
+
+
+@metrics_bp.route("/")
+async def get_metrics(request) -> response:
+    """Get node metrics, such as cache and connection pool statistics.
+
+    Args:
+        request: request
+
+    Returns:
+        response: metrics payload
+    """
+    return response.json({"metrics": metrics.snapshot()})
@@ -0,0 +1,28 @@
+import asyncio
+
+from docopt import docopt
+
+from src.network import chains
+from src.process import processor
+from src.process.collector import CollectorService
+
+__doc__ = """
+Usage: paralink-node collector <command> [<arguments> ...] [options]
+
+Commands:
+   start                    Start the collector service.
+
+The collector service listens for events of all chains in a single process, use it
+with `COLLECTOR_MODE=service` instead of `collect` queue workers.
+"""
+
+
+def main():
+    args = docopt(__doc__)
+
+    if args["<command>"] == "start":
+        asyncio.run(CollectorService(processor).run(chains))
+
+
+if __name__ == "__main__":
+    main()
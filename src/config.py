@@ -51,8 +51,41 @@ class Config:
     )
     WEB3_PROVIDER_URI = getenv("WEB3_PROVIDER_URI")
 
+    # Cache of PQL definitions fetched from IPFS, hot definitions get pinned on the
+    # IPFS node after IPFS_CACHE_PIN_THRESHOLD requests (0 disables pinning)
+    IPFS_CACHE_SIZE = int(getenv("IPFS_CACHE_SIZE", 1024))
+    IPFS_CACHE_DISK_SIZE = int(getenv("IPFS_CACHE_DISK_SIZE", 10000))
+    IPFS_CACHE_PIN_THRESHOLD = int(getenv("IPFS_CACHE_PIN_THRESHOLD", 10))
+
     CELERY_BROKER_URL = getenv("CELERY_BROKER_URL")
 
+    # Executor worker mode: "prefork" runs one PQL request per worker process,
+    # "asyncio" runs requests concurrently on the event loop of a single worker started
+    # with `-P threads -c <concurrency>`, one request per worker thread
+    EXECUTOR_MODE = getenv("EXECUTOR_MODE", "prefork")
+
+    # Shared HTTP client session used by PQL handlers
+    HTTP_POOL_LIMIT = int(getenv("HTTP_POOL_LIMIT", 100))
+    HTTP_POOL_LIMIT_PER_HOST = int(getenv("HTTP_POOL_LIMIT_PER_HOST", 10))
+    HTTP_DNS_CACHE_TTL = int(getenv("HTTP_DNS_CACHE_TTL", 300))
+    HTTP_KEEPALIVE_TIMEOUT = float(getenv("HTTP_KEEPALIVE_TIMEOUT", 30))
+    HTTP_REQUEST_TIMEOUT = float(getenv("HTTP_REQUEST_TIMEOUT", 30))
+
+    # Connection pools used by `sql.postgres` PQL steps. The URIs come from PQL
+    # definitions, so pools open no connections upfront and at most SQL_MAX_POOLS
+    # pools are kept per loop
+    SQL_POOL_MIN_SIZE = int(getenv("SQL_POOL_MIN_SIZE", 0))
+    SQL_MAX_POOLS = int(getenv("SQL_MAX_POOLS", 16))
+    SQL_POOL_MAX_SIZE = int(getenv("SQL_POOL_MAX_SIZE", 10))
+    SQL_POOL_MAX_INACTIVE_CONNECTION_LIFETIME = float(
+        getenv("SQL_POOL_MAX_INACTIVE_CONNECTION_LIFETIME", 300)
+    )
+    SQL_POOL_IDLE_TIMEOUT = float(getenv("SQL_POOL_IDLE_TIMEOUT", 900))
+    SQL_STATEMENT_CACHE_SIZE = int(getenv("SQL_STATEMENT_CACHE_SIZE", 100))
+    SQL_MAX_CACHED_STATEMENT_LIFETIME = int(
+        getenv("SQL_MAX_CACHED_STATEMENT_LIFETIME", 300)
+    )
+
     # Database
     DATABASE_NAME = getenv("DATABASE_NAME", "paralink_node")
     DATABASE_HOST = getenv("DATABASE_HOST", "localhost")
@@ -64,6 +97,97 @@ class Config:
     ENABLE_BACKGROUND_WORKER = getenv("ENABLE_BACKGROUND_WORKER", "True") == "True"
     ENABLE_DATABASE = getenv("ENABLE_DATABASE", True)
 
+    # Seconds after which a cached EVM chain connection is validated again
+    EVM_CHAIN_VALIDATION_INTERVAL = float(getenv("EVM_CHAIN_VALIDATION_INTERVAL", 600))
+
+    # Contract ABI cache for `eth.function` steps, optionally pre-seeded from a folder
+    # of `<address>.json` ABI files
+    ABI_CACHE_SIZE = int(getenv("ABI_CACHE_SIZE", 1024))
+    ABI_CONTRACT_CACHE_SIZE = int(getenv("ABI_CONTRACT_CACHE_SIZE", 1024))
+    ABI_SEED_FOLDER = getenv("ABI_SEED_FOLDER")
+
+    # Default number of concurrent blocking RPC calls per EVM chain, can be set per
+    # chain with `max_concurrency` in chain_config.json
+    EVM_CHAIN_MAX_CONCURRENCY = int(getenv("EVM_CHAIN_MAX_CONCURRENCY", 8))
+
+    # Block head tracking: minimum age in seconds up to which a block number is served
+    # from memory (it is served for at least the estimated block time), bounds of the
+    # polling interval and head subscriptions on websocket chains (`newHeads` on EVM
+    # chains, `chain_subscribeFinalizedHeads` on Substrate chains)
+    HEAD_TRACKER_MAX_STALENESS = float(getenv("HEAD_TRACKER_MAX_STALENESS", 2))
+    HEAD_TRACKER_MIN_POLL_INTERVAL = float(
+        getenv("HEAD_TRACKER_MIN_POLL_INTERVAL", 0.5)
+    )
+    HEAD_TRACKER_MAX_POLL_INTERVAL = float(getenv("HEAD_TRACKER_MAX_POLL_INTERVAL", 30))
+    HEAD_TRACKER_SUBSCRIBE = getenv("HEAD_TRACKER_SUBSCRIBE", "True") == "True"
+    HEAD_TRACKER_SUBSCRIPTION_TIMEOUT = float(
+        getenv("HEAD_TRACKER_SUBSCRIPTION_TIMEOUT", 60)
+    )
+    HEAD_TRACKER_RESUBSCRIBE_DELAY = float(getenv("HEAD_TRACKER_RESUBSCRIBE_DELAY", 60))
+
+    # EVM listeners scan Request logs with `eth_getLogs` over at most
+    # EVM_LOG_SCAN_MAX_BLOCKS blocks per request. On websocket chains a `logs`
+    # subscription can signal the blocks with new Request logs, so blocks without them
+    # are only scanned every EVM_LOGS_SUBSCRIPTION_SCAN_INTERVAL seconds, in case a
+    # notification was missed
+    EVM_LOG_SCAN_MAX_BLOCKS = int(getenv("EVM_LOG_SCAN_MAX_BLOCKS", 2000))
+    EVM_LOGS_SUBSCRIBE = getenv("EVM_LOGS_SUBSCRIBE", "False") == "True"
+    EVM_LOGS_SUBSCRIPTION_SCAN_INTERVAL = float(
+        getenv("EVM_LOGS_SUBSCRIPTION_SCAN_INTERVAL", 30)
+    )
+
+    # Substrate listeners more than SUBSTRATE_CATCH_UP_THRESHOLD blocks behind the
+    # finalised head scan ranges of SUBSTRATE_CATCH_UP_BATCH blocks concurrently on
+    # SUBSTRATE_CATCH_UP_WORKERS threads, closer to the head blocks are scanned one by one
+    SUBSTRATE_CATCH_UP_THRESHOLD = int(getenv("SUBSTRATE_CATCH_UP_THRESHOLD", 10))
+    SUBSTRATE_CATCH_UP_BATCH = int(getenv("SUBSTRATE_CATCH_UP_BATCH", 100))
+    SUBSTRATE_CATCH_UP_WORKERS = int(getenv("SUBSTRATE_CATCH_UP_WORKERS", 8))
+
+    # Collector mode: "celery" runs every chain listener as a task of a `collect` queue
+    # worker, "service" runs all listeners in one `paralink-node collector start`
+    # process with COLLECTOR_MAX_THREADS threads for blocking chain requests
+    COLLECTOR_MODE = getenv("COLLECTOR_MODE", "celery")
+    COLLECTOR_MAX_THREADS = int(getenv("COLLECTOR_MAX_THREADS", 16))
+    COLLECTOR_RESTART_DELAY = float(getenv("COLLECTOR_RESTART_DELAY", 10))
+
+    # Seconds between two heartbeats of a listener task in the collector registry
+    COLLECTOR_HEARTBEAT_INTERVAL = float(getenv("COLLECTOR_HEARTBEAT_INTERVAL", 30))
+    # Seconds without heartbeat after which a listener task is considered dead and the
+    # chain's listener is queued again
+    COLLECTOR_HEARTBEAT_TIMEOUT = float(getenv("COLLECTOR_HEARTBEAT_TIMEOUT", 120))
+
+    # Minimum number of seconds between two writes of a listener's block cursor
+    COLLECTOR_CURSOR_SAVE_INTERVAL = float(getenv("COLLECTOR_CURSOR_SAVE_INTERVAL", 5))
+
+    # `eth.*` requests for the same chain and block arriving within the window (in
+    # seconds) are sent as one JSON-RPC batch
+    ETH_BATCH_WINDOW = float(getenv("ETH_BATCH_WINDOW", 0.005))
+    ETH_BATCH_MAX_SIZE = int(getenv("ETH_BATCH_MAX_SIZE", 100))
+
+    # Number of compiled PQL definitions kept in memory
+    PQL_PLAN_CACHE_SIZE = int(getenv("PQL_PLAN_CACHE_SIZE", 1024))
+
+    # Number of `eth.*` step results (per block) kept in memory
+    ETH_RESULT_CACHE_SIZE = int(getenv("ETH_RESULT_CACHE_SIZE", 4096))
+
+    # Seconds for which PQL results are reused, unless the definition declares its own
+    # `max_age` (0 disables the result cache)
+    PQL_RESULT_MAX_AGE = float(getenv("PQL_RESULT_MAX_AGE", 0))
+    PQL_RESULT_CACHE_SIZE = int(getenv("PQL_RESULT_CACHE_SIZE", 1024))
+
+    # Seconds after which a fulfillment transaction without receipt is replaced by the
+    # same transaction (same nonce) with the gas price raised by
+    # FULFILLMENT_GAS_PRICE_BUMP (nodes require at least 10%), up to
+    # FULFILLMENT_MAX_RESUBMISSIONS times
+    FULFILLMENT_RECEIPT_TIMEOUT = float(getenv("FULFILLMENT_RECEIPT_TIMEOUT", 600))
+    FULFILLMENT_MAX_RESUBMISSIONS = int(getenv("FULFILLMENT_MAX_RESUBMISSIONS", 2))
+    FULFILLMENT_GAS_PRICE_BUMP = float(getenv("FULFILLMENT_GAS_PRICE_BUMP", 0.125))
+
+    # Fulfillments ready within the window (in seconds) are sent as one batched
+    # transaction, or as a burst if the oracle lacks `fulfillRequests` (0 disables)
+    FULFILLMENT_BATCH_WINDOW = float(getenv("FULFILLMENT_BATCH_WINDOW", 0))
+    FULFILLMENT_BATCH_MAX_SIZE = int(getenv("FULFILLMENT_BATCH_MAX_SIZE", 50))
+
     # Default number of confirmations for ETH finality
     DEFAULT_NUM_CONFIRMATIONS = 40
 
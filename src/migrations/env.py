@@ -20,6 +20,8 @@ fileConfig(config.config_file_name)
 
 # for 'autogenerate' support
 from src.models import Base  # noqa: E402
+from src.models.chain_cursor import ChainCursor  # noqa: E402
+from src.models.collector import Collector  # noqa: E402
 from src.models.user import User  # noqa: E402
 
 target_metadata = Base.metadata
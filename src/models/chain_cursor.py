@@ -0,0 +1,50 @@
+import typing
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm.session import Session
+
+from src.models import Base
+
+
+class ChainCursor(Base):
+    """ChainCursor model, the last block of a chain processed by its listener."""
+
+    __tablename__ = "chain_cursors"
+
+    chain = sa.Column(sa.String, sa.ForeignKey("chains.name"), primary_key=True)
+    block_number = sa.Column(sa.BigInteger, nullable=False)
+    updated_at = sa.Column(sa.DateTime, nullable=False, default=datetime.utcnow)
+
+    @staticmethod
+    def get_block_number(session: Session, chain: str) -> typing.Optional[int]:
+        """Get the last processed block of `chain`.
+
+        Args:
+            session (Session): synchronous sqlalchemy session
+            chain (str): name of the chain
+
+        Returns:
+            Optional[int]: last processed block, None if the chain was never processed
+        """
+        return session.execute(
+            sa.select(ChainCursor.block_number).where(ChainCursor.chain == chain)
+        ).scalar()
+
+    @staticmethod
+    def set_block_number(session: Session, chain: str, block_number: int) -> None:
+        """Store `block_number` as the last processed block of `chain`.
+
+        Args:
+            session (Session): synchronous sqlalchemy session
+            chain (str): name of the chain
+            block_number (int): last processed block
+        """
+        values = {"block_number": block_number, "updated_at": datetime.utcnow()}
+        session.execute(
+            insert(ChainCursor)
+            .values(chain=chain, **values)
+            .on_conflict_do_update(index_elements=[ChainCursor.chain], set_=values)
+        )
+        session.commit()
@@ -0,0 +1,99 @@
+import typing
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.future import select
+from sqlalchemy.orm.session import Session
+
+from src.models import Base
+
+
+class Collector(Base):
+    """Collector model, the listener task collecting events of a chain."""
+
+    __tablename__ = "collectors"
+
+    chain = sa.Column(sa.String, sa.ForeignKey("chains.name"), primary_key=True)
+    task_id = sa.Column(sa.String, nullable=False)
+    heartbeat_at = sa.Column(sa.DateTime, nullable=False, default=datetime.utcnow)
+
+    @staticmethod
+    async def get_task_id(session: Session, chain: str) -> typing.Optional[str]:
+        """Get the ID of the listener task registered for `chain`.
+
+        Args:
+            session (Session): sqlalchemy session
+            chain (str): name of the chain
+
+        Returns:
+            Optional[str]: task ID, None if no listener is registered
+        """
+        result = await session.execute(
+            select(Collector.task_id).where(Collector.chain == chain)
+        )
+        return result.scalar()
+
+    @staticmethod
+    async def get_stale(session: Session, max_age: float) -> typing.List[str]:
+        """Get the chains whose listener task sent no heartbeat for `max_age` seconds.
+
+        Args:
+            session (Session): sqlalchemy session
+            max_age (float): seconds after which a listener task is considered dead
+
+        Returns:
+            List[str]: names of the chains
+        """
+        result = await session.execute(
+            select(Collector.chain).where(
+                Collector.heartbeat_at < datetime.utcnow() - timedelta(seconds=max_age)
+            )
+        )
+        return result.scalars().all()
+
+    @staticmethod
+    async def register(
+        session: Session, chain: str, task_id: typing.Optional[str]
+    ) -> None:
+        """Register `task_id` as the listener task of `chain`.
+
+        Args:
+            session (Session): sqlalchemy session
+            chain (str): name of the chain
+            task_id (Optional[str]): task ID, None removes the registered listener
+        """
+        if task_id is None:
+            await session.execute(sa.delete(Collector).where(Collector.chain == chain))
+        else:
+            values = {"task_id": task_id, "heartbeat_at": datetime.utcnow()}
+            await session.execute(
+                insert(Collector)
+                .values(chain=chain, **values)
+                .on_conflict_do_update(index_elements=[Collector.chain], set_=values)
+            )
+        await session.commit()
+
+    @staticmethod
+    def heartbeat(session: Session, chain: str, task_id: str) -> typing.Optional[str]:
+        """Record a heartbeat of the listener task `task_id` of `chain`.
+
+        Args:
+            session (Session): synchronous sqlalchemy session
+            chain (str): name of the chain
+            task_id (str): ID of the listener task
+
+        Returns:
+            Optional[str]: ID of the task registered for `chain`, which differs from
+            `task_id` if the listener was replaced, None if no listener is registered
+        """
+        session.execute(
+            sa.update(Collector)
+            .where(Collector.chain == chain, Collector.task_id == task_id)
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        session.commit()
+
+        return session.execute(
+            sa.select(Collector.task_id).where(Collector.chain == chain)
+        ).scalar()
@@ -3,6 +3,7 @@ from typing import Optional
 
 from sqlalchemy.orm.session import Session
 
+from src.config import config
 from src.models.chain import Chain as ChainDb
 from src.network.chain import Chain
 from src.network.evm_chain import EvmChain
@@ -63,6 +64,9 @@ class Chains:
                         url=chain["url"],
                         credentials=chain.get("credentials", {}),
                         tracked_contracts=chain.get("tracked_contracts", []),
+                        max_concurrency=chain.get(
+                            "max_concurrency", config.EVM_CHAIN_MAX_CONCURRENCY
+                        ),
                     )
                 elif chain["type"] == "substrate":
                     substrate[chain["name"]] = SubstrateChain(
@@ -1,14 +1,84 @@
+import asyncio
+import functools
 import logging
+import math
+import os
+import threading
+import time
 import typing
+from concurrent.futures import ThreadPoolExecutor
 
-from web3 import Web3
+from eth_utils import encode_hex, event_abi_to_log_topic
+from web3 import Web3, WebsocketProvider
+from websockets.exceptions import ConnectionClosed
 
 from src.config import config
 from src.network.chain import Chain
 from src.network.exceptions import ChainValidationFailed
+from src.network.fulfillment import FulfillmentBatcher
+from src.network.head_tracker import HeadTracker
+from src.network.transactions import NonceManager, ReceiptWatcher
 
 logger = logging.getLogger(__name__)
 
+# Errors raised by the providers when the node connection is lost
+CONNECTION_ERRORS = (ConnectionClosed, OSError)
+
+# Methods without side effects, which are safe to send again. Besides these, every
+# `eth_get*` method is read-only.
+READ_ONLY_METHODS = {
+    "eth_blockNumber",
+    "eth_call",
+    "eth_chainId",
+    "eth_estimateGas",
+    "eth_gasPrice",
+    "net_version",
+}
+
+# Errors of nodes receiving a transaction they already have
+KNOWN_TRANSACTION_ERRORS = ("already known", "known transaction")
+
+
+def reconnect_middleware(make_request: typing.Callable, w3: Web3) -> typing.Callable:
+    """Web3 middleware retrying a read-only request once when the connection was
+    dropped.
+
+    Both providers re-establish the underlying connection on the next request after a
+    failure (`WebsocketProvider` discards the broken socket, `HTTPProvider` the broken
+    keep-alive connection), so a single retry reconnects transparently. Other requests
+    (e.g. `eth_sendRawTransaction`) may have reached the node before the connection
+    dropped and are not sent again.
+    """
+
+    def middleware(method, params):
+        try:
+            return make_request(method, params)
+        except CONNECTION_ERRORS as e:
+            if not (method in READ_ONLY_METHODS or method.startswith("eth_get")):
+                raise
+            logger.warning(f"Connection dropped during {method} ({e}), reconnecting.")
+            return make_request(method, params)
+
+    return middleware
+
+
+class LockedWebsocketProvider(WebsocketProvider):
+    """WebsocketProvider sending one request at a time over its connection.
+
+    `WebsocketProvider` reads the reply of a request from the shared socket without
+    matching its id, so requests made concurrently by the chain's threads (pool, head
+    tracker, receipt watcher) would fail on concurrent `recv()` calls or receive each
+    other's replies. Requests are serialised by a lock.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._request_lock = threading.Lock()
+
+    def make_request(self, method, params):
+        with self._request_lock:
+            return super().make_request(method, params)
+
 
 class EvmChain(Chain):
     def __init__(
@@ -21,18 +91,25 @@ class EvmChain(Chain):
         oracle_metadata=config.ORACLE_CONTRACT_ABI,
         evm_chain_reference_data=config.EVM_CHAIN_REFERENCE_DATA,
         chain_reference_data=None,
+        max_concurrency=config.EVM_CHAIN_MAX_CONCURRENCY,
     ):
         super().__init__(name, url, "evm", credentials, active, tracked_contracts)
 
         self.oracle_metadata = oracle_metadata
+        self.max_concurrency = max_concurrency
         self.chain_reference_data = (
             chain_reference_data
             if chain_reference_data
             else self._get_evm_chain_reference_data(evm_chain_reference_data)
         )
 
+        self._init_connection_state()
+
     def get_connection(self, validate_chain: bool = True) -> Web3:
-        """Return Web3 connection to the chain specified by `url`.
+        """Return the Web3 connection to the chain specified by `url`.
+
+        The connection is created once and shared by every caller. Validation runs on
+        first use and again once `config.EVM_CHAIN_VALIDATION_INTERVAL` has elapsed.
 
         Args:
             validate_chain: specify if the chain should be validated.
@@ -40,53 +117,265 @@ class EvmChain(Chain):
         Returns:
             Web3: web3 client used to interact with the evm chain.
         """
-        if self.url.startswith("ws"):
-            w3 = Web3(Web3.WebsocketProvider(self.url))
-        elif self.url.startswith("http"):
-            w3 = Web3(Web3.HTTPProvider(self.url))
-        else:
-            raise ValueError("URL type not supported")
+        self._check_fork()
 
-        if validate_chain:
-            self._validate_chain(w3)
+        with self._connection_lock:
+            if self._w3 is None:
+                self._w3 = self._create_connection()
+                self._validated_at = None
 
-        return w3
+            if validate_chain and (
+                self._validated_at is None
+                or time.monotonic() - self._validated_at
+                > config.EVM_CHAIN_VALIDATION_INTERVAL
+            ):
+                self._validate_chain(self._w3)
+                self._validated_at = time.monotonic()
+
+            return self._w3
+
+    @property
+    def head_tracker(self) -> HeadTracker:
+        """HeadTracker following the latest block of the chain.
+
+        Returns:
+            HeadTracker: head tracker shared by every user of the chain.
+        """
+        self._check_fork()
+
+        with self._connection_lock:
+            if self._head_tracker is None:
+                self._head_tracker = HeadTracker(self)
+
+            return self._head_tracker
+
+    @property
+    def nonce_manager(self) -> NonceManager:
+        """NonceManager allocating the nonces of the chain's accounts.
+
+        Returns:
+            NonceManager: nonce manager shared by every fulfillment on the chain.
+        """
+        self._check_fork()
+
+        with self._connection_lock:
+            if self._nonce_manager is None:
+                self._nonce_manager = NonceManager(self)
+
+            return self._nonce_manager
+
+    @property
+    def receipt_watcher(self) -> ReceiptWatcher:
+        """ReceiptWatcher tracking the submitted fulfillment transactions.
+
+        Returns:
+            ReceiptWatcher: receipt watcher shared by every fulfillment on the chain.
+        """
+        self._check_fork()
+
+        with self._connection_lock:
+            if self._receipt_watcher is None:
+                self._receipt_watcher = ReceiptWatcher(self)
+
+            return self._receipt_watcher
+
+    @property
+    def fulfillment_batcher(self) -> FulfillmentBatcher:
+        """FulfillmentBatcher collecting the results written to the chain.
+
+        Returns:
+            FulfillmentBatcher: batcher shared by every fulfillment on the chain.
+        """
+        self._check_fork()
+
+        with self._connection_lock:
+            if self._fulfillment_batcher is None:
+                self._fulfillment_batcher = FulfillmentBatcher(self)
+
+            return self._fulfillment_batcher
+
+    async def run(self, fn: typing.Callable, *args) -> typing.Any:
+        """Run the blocking `fn` (e.g. a web3 call) on the chain's thread pool.
+
+        The pool has `self.max_concurrency` threads, so at most that many calls to the
+        chain are in flight and the event loop is never blocked by a slow node.
+
+        Args:
+            fn (Callable): blocking function to call
+            args: positional arguments of `fn`
+
+        Returns:
+            typing.Any: return value of `fn`
+        """
+        self._check_fork()
+
+        with self._connection_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix=f"{self.name}-rpc",
+                )
+
+        return await asyncio.get_event_loop().run_in_executor(
+            self._executor, functools.partial(fn, *args)
+        )
+
+    @property
+    def request_event_abi(self) -> dict:
+        """ABI of the oracle `Request` event.
+
+        Returns:
+            dict: event ABI
+        """
+        return next(
+            abi
+            for abi in self.oracle_metadata
+            if abi["type"] == "event" and abi["name"] == "Request"
+        )
+
+    @property
+    def request_topic(self) -> str:
+        """Log topic of the oracle `Request` event.
+
+        Returns:
+            str: hex encoded event signature hash
+        """
+        return encode_hex(event_abi_to_log_topic(self.request_event_abi))
+
+    def get_request_events(self, from_block: int, to_block: int) -> list:
+        """Get the `Request` events of the tracked contracts emitted between
+        `from_block` and `to_block` (inclusive).
+
+        All contracts are scanned by a single `eth_getLogs` request and the logs are
+        decoded in bulk.
+
+        Args:
+            from_block: first block to scan.
+            to_block: last block to scan.
+
+        Returns:
+            list: decoded `Request` events ordered by block
+        """
+        if not self.tracked_contracts:
+            return []
+
+        w3 = self.get_connection()
+        request_event = w3.eth.contract(abi=self.oracle_metadata).events.Request()
+
+        logs = w3.eth.getLogs(
+            {
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "address": self.tracked_contracts,
+                "topics": [self.request_topic],
+            }
+        )
+        return [request_event.processLog(log) for log in logs]
 
     def fulfill(self, event: dict, res: typing.Any) -> None:
         """It writes `res` (result of the PQL definition) to the location specified in the `Request` event.
 
+        Results ready at the same time are submitted together by the chain's
+        FulfillmentBatcher.
+
         Args:
             event: a Request event from ETH chain.
             res: already executed PQL definition
         """
-        w3 = self.get_connection()
-
-        args = event["args"]
-        contract = w3.eth.contract(abi=self.oracle_metadata, address=event["address"])
-
         logger.info(
-            f"[[bold]{self.name}[/]] Fulfill request{args['requestId']} with value {res}."
+            f"[[bold]{self.name}[/]] Fulfill request{event['args']['requestId']} with value {res}."
         )
 
-        eth_key = w3.eth.account.from_key(self.credentials["private_key"])
+        self.fulfillment_batcher.submit(event, res)
+
+    @staticmethod
+    def fulfill_args(w3: Web3, event: dict, res: typing.Any) -> tuple:
+        """Arguments of the `fulfillRequest` call writing `res` for the `Request` event.
 
-        tx = contract.functions.fulfillRequest(
+        Args:
+            w3: web3 client of the chain.
+            event: a Request event from ETH chain.
+            res: already executed PQL definition
+
+        Returns:
+            tuple: `fulfillRequest` arguments
+        """
+        args = event["args"]
+        return (
             args["requestId"],
             args["fee"],
             args["callbackAddress"],
             args["callbackFunctionId"],
             args["expiration"],
             w3.toBytes(int(res)).rjust(32, b"\0"),
-        ).buildTransaction({"from": eth_key.address})
+        )
 
-        tx["gas"] *= 2
-        tx.update({"nonce": w3.eth.getTransactionCount(eth_key.address)})
+    def send_transaction(
+        self,
+        contract_function,
+        description: str,
+        on_failure: typing.Optional[typing.Callable[[str], None]] = None,
+    ) -> str:
+        """Sign and submit a transaction calling `contract_function` without waiting
+        for it to be mined.
 
-        signed_tx = w3.eth.account.signTransaction(tx, eth_key.privateKey)
-        tx_hash = w3.eth.sendRawTransaction(signed_tx.rawTransaction)
-        tx_receipt = w3.eth.waitForTransactionReceipt(tx_hash)
+        The nonce is allocated by the chain's NonceManager. If the node rejects the
+        transaction, the nonce is resynced and the transaction is submitted once more.
+        A node reporting the transaction as already known received it, its locally
+        computed hash is used.
+        The nonce is also resynced if the transaction could not be sent, so it is not
+        left allocated to a transaction the node never received. The receipt is
+        tracked by the chain's ReceiptWatcher, which replaces a transaction that is
+        not mined in time with the same transaction at a higher gas price.
+
+        Args:
+            contract_function (ContractFunction): contract function call to submit
+            description (str): description of the transaction used in logs
+            on_failure (Optional[Callable[[str], None]]): called with "reverted" if the
+                transaction reverted, or "dropped" if neither it nor a replacement was
+                mined
 
-        logger.info(f"[[bold]{self.name}[/]] Received TX receipt: {tx_receipt}")
+        Returns:
+            str: hex encoded transaction hash
+        """
+        w3 = self.get_connection()
+        eth_key = w3.eth.account.from_key(self.credentials["private_key"])
+
+        for attempt in range(2):
+            tx = contract_function.buildTransaction({"from": eth_key.address})
+            tx["gas"] *= 2
+            tx["nonce"] = self.nonce_manager.allocate(eth_key.address)
+
+            try:
+                tx_hash = self._send_signed(w3, tx, eth_key)
+                break
+            except ValueError as e:
+                # The node rejected the transaction, e.g. the nonce was already used
+                self.nonce_manager.resync(eth_key.address)
+                if attempt:
+                    raise
+                logger.warning(
+                    f"[[bold]{self.name}[/]] {description} rejected ({e}), retrying."
+                )
+            except Exception:
+                # e.g. a timeout, the node may or may not have received the transaction
+                self.nonce_manager.resync(eth_key.address)
+                raise
+
+        logger.info(
+            f"[[bold]{self.name}[/]] Submitted {description} with nonce "
+            f"{tx['nonce']}, TX {tx_hash}."
+        )
+        self.receipt_watcher.watch(
+            tx_hash,
+            eth_key.address,
+            description,
+            on_failure,
+            nonce=tx["nonce"],
+            replace=functools.partial(self._replace_transaction, tx, description),
+        )
+
+        return tx_hash
 
     def to_dict(self) -> dict:
         """Serialise EvmChain to dict.
@@ -102,8 +391,128 @@ class EvmChain(Chain):
             "tracked_contracts": self.tracked_contracts,
             "oracle_metadata": self.oracle_metadata,
             "chain_reference_data": self.chain_reference_data,
+            "max_concurrency": self.max_concurrency,
         }
 
+    def __getstate__(self) -> dict:
+        """Exclude the live connection when the chain is serialised."""
+        state = self.__dict__.copy()
+        for attr in (
+            "_w3",
+            "_validated_at",
+            "_pid",
+            "_head_tracker",
+            "_nonce_manager",
+            "_receipt_watcher",
+            "_fulfillment_batcher",
+            "_executor",
+            "_connection_lock",
+        ):
+            state.pop(attr, None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the chain and start without a connection."""
+        self.__dict__.update(state)
+        self._init_connection_state()
+
+    def _init_connection_state(self) -> None:
+        """Set up the cached connection attributes."""
+        self._w3: typing.Optional[Web3] = None
+        self._validated_at: typing.Optional[float] = None
+        self._pid = os.getpid()
+        self._head_tracker: typing.Optional[HeadTracker] = None
+        self._nonce_manager: typing.Optional[NonceManager] = None
+        self._receipt_watcher: typing.Optional[ReceiptWatcher] = None
+        self._fulfillment_batcher: typing.Optional[FulfillmentBatcher] = None
+        self._executor: typing.Optional[ThreadPoolExecutor] = None
+        self._connection_lock = threading.RLock()
+
+    def _check_fork(self) -> None:
+        """Reset the connection state in a process forked after it was created.
+
+        Sockets must not be shared with the parent process and threads do not survive
+        a fork.
+        """
+        if self._pid != os.getpid():
+            self._init_connection_state()
+
+    def _create_connection(self) -> Web3:
+        """Create a new Web3 connection for `self.url`.
+
+        Returns:
+            Web3: web3 client used to interact with the evm chain.
+        """
+        if self.url.startswith("ws"):
+            w3 = Web3(LockedWebsocketProvider(self.url))
+        elif self.url.startswith("http"):
+            w3 = Web3(Web3.HTTPProvider(self.url))
+        else:
+            raise ValueError("URL type not supported")
+
+        w3.middleware_onion.inject(reconnect_middleware, "reconnect", layer=0)
+
+        logger.debug(f"[[bold]{self.name}[/]] Created connection to {self.url}.")
+        return w3
+
+    def _replace_transaction(self, tx: dict, description: str) -> str:
+        """Resend `tx` with the same nonce and a higher gas price.
+
+        Nodes only accept a replacement raising the gas price by at least 10%, the
+        gas price is raised by `config.FULFILLMENT_GAS_PRICE_BUMP`, or to the current
+        gas price of the chain if that is higher. `tx` keeps the raised gas price, so
+        every replacement outbids the previous one.
+
+        Args:
+            tx (dict): transaction to replace
+            description (str): description of the transaction used in logs
+
+        Returns:
+            str: hex encoded hash of the replacement
+        """
+        w3 = self.get_connection()
+        eth_key = w3.eth.account.from_key(self.credentials["private_key"])
+
+        tx["gasPrice"] = max(
+            math.ceil(tx["gasPrice"] * (1 + config.FULFILLMENT_GAS_PRICE_BUMP)),
+            w3.eth.gasPrice,
+        )
+        tx_hash = self._send_signed(w3, tx, eth_key)
+        logger.info(
+            f"[[bold]{self.name}[/]] Replaced {description} with nonce {tx['nonce']} "
+            f"at gas price {tx['gasPrice']}, TX {tx_hash}."
+        )
+
+        return tx_hash
+
+    @staticmethod
+    def _send_signed(w3: Web3, tx: dict, eth_key) -> str:
+        """Sign and send `tx`.
+
+        A node reporting the transaction as already known received it, its locally
+        computed hash is returned.
+
+        Args:
+            w3 (Web3): connection to the chain
+            tx (dict): transaction to send
+            eth_key (LocalAccount): account signing the transaction
+
+        Returns:
+            str: hex encoded transaction hash
+
+        Raises:
+            ValueError: the node rejected the transaction.
+        """
+        signed_tx = w3.eth.account.signTransaction(tx, eth_key.privateKey)
+        try:
+            return w3.eth.sendRawTransaction(signed_tx.rawTransaction).hex()
+        except ValueError as e:
+            if not any(error in str(e) for error in KNOWN_TRANSACTION_ERRORS):
+                raise
+
+            # The node already received this very transaction
+            return signed_tx.hash.hex()
+
     def _validate_chain(self, w3: Web3) -> None:
         """Validates the web3 instance has the expected chainId and networkId.
 
@@ -2,3 +2,9 @@ class ChainValidationFailed(Exception):
     """ChainValidationFailed is raised when the observed chainId and networkId does not match reference data."""
 
     pass
+
+
+class SubscriptionFailed(Exception):
+    """SubscriptionFailed is raised when the node rejects a subscription request."""
+
+    pass
@@ -0,0 +1,230 @@
+import functools
+import logging
+import threading
+import typing
+from concurrent.futures import Future
+
+from eth_utils import function_abi_to_4byte_selector
+from web3 import Web3
+
+from src.config import config
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class FulfillmentBatcher:
+    """FulfillmentBatcher collects results ready to be written to the same oracle
+    contract and submits them together.
+
+    Results arriving within `window` seconds of the first one are sent as a single
+    `fulfillRequests` transaction if the oracle contract implements it, otherwise as a
+    burst of `fulfillRequest` transactions with consecutive nonces. A batch is sent
+    as soon as it holds `max_size` results. A window of 0 submits every result
+    immediately. If a batch transaction reverts or is dropped, its requests are
+    fulfilled individually.
+
+    The following metrics are reported:
+        - `fulfillment.<chain>.batches`: submitted `fulfillRequests` transactions
+        - `fulfillment.<chain>.batched_requests`: requests fulfilled in batches
+        - `fulfillment.<chain>.burst_requests`: requests fulfilled individually
+    """
+
+    def __init__(
+        self,
+        chain,
+        window: float = config.FULFILLMENT_BATCH_WINDOW,
+        max_size: int = config.FULFILLMENT_BATCH_MAX_SIZE,
+    ):
+        """Inits FulfillmentBatcher.
+
+        Args:
+            chain (EvmChain): chain the results are written to.
+            window (float): seconds to wait for more results before sending a batch.
+            max_size (int): maximum number of results in a batch.
+        """
+        self.chain = chain
+        self.window = window
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._pending: typing.Dict[str, list] = {}
+        self._batch_support: typing.Dict[str, bool] = {}
+
+    def submit(self, event: dict, res: typing.Any) -> str:
+        """Queue the fulfillment of the `Request` event with `res` and wait until it
+        is submitted.
+
+        Args:
+            event (dict): a Request event from ETH chain
+            res (Any): already executed PQL definition
+
+        Returns:
+            str: hex encoded hash of the transaction fulfilling the request
+        """
+        future: Future = Future()
+        item = (event, res, future)
+        address = event["address"]
+
+        if self.window <= 0:
+            self._send(address, [item])
+            return future.result()
+
+        with self._lock:
+            batch = self._pending.setdefault(address, [])
+            batch.append(item)
+
+            if len(batch) == 1:
+                timer = threading.Timer(self.window, self._flush, (address, batch))
+                timer.daemon = True
+                timer.start()
+
+            full = len(batch) >= self.max_size
+
+        if full:
+            self._flush(address, batch)
+
+        return future.result()
+
+    def _flush(self, address: str, batch: list) -> None:
+        """Send `batch` if it was not sent yet.
+
+        Args:
+            address (str): oracle contract address
+            batch (list): [(event, res, future)] results to send
+        """
+        with self._lock:
+            if self._pending.get(address) is not batch:
+                return
+            del self._pending[address]
+
+        self._send(address, batch)
+
+    def _send(self, address: str, batch: list) -> None:
+        """Submit `batch` and resolve the futures of its results.
+
+        Every future is resolved, with the error if the batch could not be submitted.
+
+        Args:
+            address (str): oracle contract address
+            batch (list): [(event, res, future)] results to send
+        """
+        try:
+            self._submit(address, batch)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _submit(self, address: str, batch: list) -> None:
+        """Submit `batch` as a single transaction if the oracle contract supports it,
+        otherwise request by request.
+
+        Args:
+            address (str): oracle contract address
+            batch (list): [(event, res, future)] results to send
+        """
+        w3 = self.chain.get_connection()
+        contract = w3.eth.contract(abi=self.chain.oracle_metadata, address=address)
+        calls = [self.chain.fulfill_args(w3, event, res) for event, res, _ in batch]
+
+        if len(batch) > 1 and self._supports_batch(w3, address):
+            try:
+                tx_hash = self.chain.send_transaction(
+                    contract.functions.fulfillRequests(*map(list, zip(*calls))),
+                    f"Fulfillment of {len(batch)} requests",
+                    functools.partial(self._on_batch_failure, contract, batch, calls),
+                )
+                metrics.inc(f"fulfillment.{self.chain.name}.batches")
+                metrics.inc(
+                    f"fulfillment.{self.chain.name}.batched_requests", len(batch)
+                )
+                for _, _, future in batch:
+                    future.set_result(tx_hash)
+                return
+            except Exception as e:
+                # e.g. one of the requests was already fulfilled and reverts the batch
+                logger.warning(
+                    f"[[bold]{self.chain.name}[/]] Batched fulfillment failed ({e}), "
+                    f"fulfilling requests individually."
+                )
+
+        for (event, _, future), call in zip(batch, calls):
+            try:
+                future.set_result(self._send_request(contract, event, call))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _on_batch_failure(
+        self, contract, batch: list, calls: typing.List[tuple], status: str
+    ) -> None:
+        """Fulfill the requests of a batch transaction that reverted or was dropped
+        one by one.
+
+        Args:
+            contract (Contract): oracle contract
+            batch (list): [(event, res, future)] results of the batch
+            calls (List[tuple]): `fulfillRequest` arguments of the results
+            status (str): "reverted" or "dropped"
+        """
+        logger.warning(
+            f"[[bold]{self.chain.name}[/]] Batched fulfillment of {len(batch)} "
+            f"requests {status}, fulfilling requests individually."
+        )
+
+        for (event, _, _), call in zip(batch, calls):
+            try:
+                self._send_request(contract, event, call)
+            except Exception as e:
+                logger.error(
+                    f"[[bold]{self.chain.name}[/]] Failed to fulfill request "
+                    f"{event['args']['requestId']}: {e}"
+                )
+
+    def _send_request(self, contract, event: dict, call: tuple) -> str:
+        """Submit the `fulfillRequest` transaction of a single result.
+
+        Args:
+            contract (Contract): oracle contract
+            event (dict): a Request event from ETH chain
+            call (tuple): `fulfillRequest` arguments of the result
+
+        Returns:
+            str: hex encoded transaction hash
+        """
+        tx_hash = self.chain.send_transaction(
+            contract.functions.fulfillRequest(*call),
+            f"Fulfillment of request {event['args']['requestId']}",
+        )
+        metrics.inc(f"fulfillment.{self.chain.name}.burst_requests")
+        return tx_hash
+
+    def _supports_batch(self, w3: Web3, address: str) -> bool:
+        """Check whether the deployed oracle contract implements `fulfillRequests`.
+
+        Args:
+            w3 (Web3): connection to the chain
+            address (str): oracle contract address
+
+        Returns:
+            bool: True if batched fulfillment is supported
+        """
+        if address not in self._batch_support:
+            fn_abi = next(
+                (
+                    abi
+                    for abi in self.chain.oracle_metadata
+                    if abi.get("name") == "fulfillRequests"
+                ),
+                None,
+            )
+            # The contract dispatcher embeds the selectors of its functions
+            self._batch_support[
+                address
+            ] = fn_abi is not None and function_abi_to_4byte_selector(
+                fn_abi
+            ) in w3.eth.getCode(
+                address
+            )
+
+        return self._batch_support[address]
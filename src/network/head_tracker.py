@@ -0,0 +1,369 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+import typing
+
+from src.config import config
+from src.network.subscription import eth_subscribe, rpc_subscribe
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    """Resolve `future` unless it was already cancelled."""
+    if not future.done():
+        future.set_result(None)
+
+
+class HeadTracker:
+    """HeadTracker keeps the latest block number of an EVM chain in memory.
+
+    A background thread follows the chain head through a `newHeads` subscription when
+    the chain is reached over websocket, or by polling `eth_blockNumber` otherwise.
+    Polls are timed just after the next block is expected from the observed block
+    time, and back off while no new block shows up. If the subscription drops, the
+    tracker polls until it is able to subscribe again.
+
+    The following metrics are reported:
+        - `head_tracker.<chain>.block_number`: latest known block number
+        - `head_tracker.<chain>.block_time`: estimated seconds between blocks
+        - `head_tracker.<chain>.poll_interval`: seconds until the next poll
+    """
+
+    # Name of the subscription used in logs
+    subscription = "newHeads"
+
+    def __init__(
+        self,
+        chain,
+        max_staleness: float = config.HEAD_TRACKER_MAX_STALENESS,
+        min_poll_interval: float = config.HEAD_TRACKER_MIN_POLL_INTERVAL,
+        max_poll_interval: float = config.HEAD_TRACKER_MAX_POLL_INTERVAL,
+        subscribe: bool = config.HEAD_TRACKER_SUBSCRIBE,
+    ):
+        """Inits HeadTracker.
+
+        Args:
+            chain (EvmChain): chain to track.
+            max_staleness (float): minimum age in seconds up to which a block number
+                is served from memory, see `get_block_number`.
+            min_poll_interval (float): minimum number of seconds between two polls,
+                also the delay of a poll after the expected next block.
+            max_poll_interval (float): maximum number of seconds between two polls.
+            subscribe (bool): whether to subscribe to new heads on websocket chains.
+        """
+        self.chain = chain
+        self.max_staleness = max_staleness
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.subscribe = subscribe and chain.url.startswith("ws")
+
+        self.block_number: typing.Optional[int] = None
+        self.block_time: typing.Optional[float] = None
+
+        self._condition = threading.Condition()
+        self._subscribed = threading.Event()
+        self._checked_at = 0.0
+        self._head_seen_at: typing.Optional[float] = None
+        self._async_waiters: typing.List[
+            typing.Tuple[asyncio.AbstractEventLoop, asyncio.Future, int]
+        ] = []
+        self._thread: typing.Optional[threading.Thread] = None
+        self._pid: typing.Optional[int] = None
+        self._stopped = threading.Event()
+
+    def get_block_number(self, max_staleness: typing.Optional[float] = None) -> int:
+        """Get the latest block number, from memory if it is fresh enough.
+
+        The block number is fresh after the last poll or subscription notification
+        for the estimated block time, no new block is expected earlier, and for at
+        least `self.max_staleness` seconds. While the subscription is active, new
+        heads are pushed, so the block number stays fresh for two block times and is
+        only fetched if a notification is missing, e.g. a stalled subscription.
+
+        Args:
+            max_staleness (Optional[float]): maximum age in seconds of the block
+                number, overrides the freshness described above.
+
+        Returns:
+            int: latest block number
+        """
+        self.start()
+
+        if max_staleness is None:
+            max_staleness = self.max_staleness
+            if self.block_time is not None:
+                block_times = 2 if self._subscribed.is_set() else 1
+                max_staleness = max(max_staleness, block_times * self.block_time)
+
+        with self._condition:
+            if (
+                self.block_number is not None
+                and time.monotonic() - self._checked_at <= max_staleness
+            ):
+                return self.block_number
+
+        return self.refresh()
+
+    def refresh(self) -> int:
+        """Fetch the latest block number from the node.
+
+        Returns:
+            int: latest block number
+        """
+        self._update(self._fetch_block_number())
+        return self.block_number
+
+    def wait_for_block(self, block_number: int, timeout: float) -> typing.Optional[int]:
+        """Wait until the head reaches `block_number`.
+
+        Args:
+            block_number (int): block number to wait for
+            timeout (float): maximum number of seconds to wait
+
+        Returns:
+            Optional[int]: latest block number, None if it was not reached in time
+        """
+        self.start()
+
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.block_number is not None
+                and self.block_number >= block_number,
+                timeout=timeout,
+            )
+            if self.block_number is not None and self.block_number >= block_number:
+                return self.block_number
+
+        return None
+
+    async def wait_for_block_async(
+        self, block_number: int, timeout: float
+    ) -> typing.Optional[int]:
+        """Wait until the head reaches `block_number` without blocking the event loop.
+
+        Args:
+            block_number (int): block number to wait for
+            timeout (float): maximum number of seconds to wait
+
+        Returns:
+            Optional[int]: latest block number, None if it was not reached in time
+        """
+        self.start()
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        waiter = (loop, future, block_number)
+
+        with self._condition:
+            if self.block_number is not None and self.block_number >= block_number:
+                return self.block_number
+            self._async_waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._condition:
+                if waiter in self._async_waiters:
+                    self._async_waiters.remove(waiter)
+
+        with self._condition:
+            if self.block_number is not None and self.block_number >= block_number:
+                return self.block_number
+
+        return None
+
+    def poll_interval(self) -> float:
+        """Get the number of seconds until the next poll.
+
+        The next poll is timed `self.min_poll_interval` seconds after the next block is
+        expected. When the block is late, the next poll waits as long as the block is
+        already late, so the interval doubles with every poll and idle chains (e.g.
+        development chains mining on demand) are not polled continuously.
+
+        Returns:
+            float: seconds to the next poll
+        """
+        with self._condition:
+            if self.block_time is None or self._head_seen_at is None:
+                return self.min_poll_interval
+
+            until_next_block = self._head_seen_at + self.block_time - time.monotonic()
+
+        if until_next_block > 0:
+            interval = until_next_block + self.min_poll_interval
+        else:
+            interval = -until_next_block
+
+        return min(self.max_poll_interval, max(self.min_poll_interval, interval))
+
+    def start(self) -> None:
+        """Start the background thread if it is not running in this process."""
+        if self._is_running():
+            return
+
+        with self._condition:
+            # Threads do not survive a fork, start a new one in the child process
+            if not self._is_running():
+                self._stopped.clear()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"head-tracker-{self.chain.name}",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stopped.set()
+
+    def _is_running(self) -> bool:
+        """Check whether the background thread is running in this process."""
+        return (
+            self._thread is not None
+            and self._thread.is_alive()
+            and self._pid == os.getpid()
+        )
+
+    def _run(self) -> None:
+        """Follow the chain head until the tracker is stopped."""
+        while not self._stopped.is_set():
+            if self.subscribe:
+                self._follow_subscription()
+                resubscribe_at = (
+                    time.monotonic() + config.HEAD_TRACKER_RESUBSCRIBE_DELAY
+                )
+            else:
+                resubscribe_at = float("inf")
+
+            while not self._stopped.is_set() and time.monotonic() < resubscribe_at:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.warning(
+                        f"[[bold]{self.chain.name}[/]] Failed to poll block number: {e}"
+                    )
+                poll_interval = self.poll_interval()
+                metrics.set(
+                    f"head_tracker.{self.chain.name}.poll_interval", poll_interval
+                )
+                self._stopped.wait(poll_interval)
+
+    def _follow_subscription(self) -> None:
+        """Update the head from subscription notifications until the subscription
+        drops."""
+        try:
+            for block_number in self._subscribe_block_numbers():
+                self._update(block_number)
+
+                if self._stopped.is_set():
+                    break
+        except Exception as e:
+            logger.warning(
+                f"[[bold]{self.chain.name}[/]] {self.subscription} subscription "
+                f"dropped ({e}), falling back to polling."
+            )
+        finally:
+            self._subscribed.clear()
+
+    def _fetch_block_number(self) -> int:
+        """Fetch the latest block number from the node.
+
+        Returns:
+            int: latest block number
+        """
+        return self.chain.get_connection().eth.blockNumber
+
+    def _subscribe_block_numbers(self) -> typing.Iterator[int]:
+        """Subscribe to new heads of the chain.
+
+        Yields:
+            int: block number of every new head
+        """
+        for header in eth_subscribe(
+            self.chain.url,
+            ["newHeads"],
+            timeout=config.HEAD_TRACKER_SUBSCRIPTION_TIMEOUT,
+            on_subscribed=self._subscribed.set,
+        ):
+            yield int(header["number"], 16)
+
+    def _update(self, block_number: int) -> None:
+        """Record the observed `block_number` and update the block time estimate.
+
+        Args:
+            block_number (int): observed block number
+        """
+        now = time.monotonic()
+
+        with self._condition:
+            self._checked_at = now
+
+            if self.block_number is None or block_number > self.block_number:
+                if self.block_number is not None and self._head_seen_at is not None:
+                    block_time = (now - self._head_seen_at) / (
+                        block_number - self.block_number
+                    )
+                    # Exponential moving average smooths out polling jitter
+                    self.block_time = (
+                        block_time
+                        if self.block_time is None
+                        else 0.8 * self.block_time + 0.2 * block_time
+                    )
+                    metrics.set(
+                        f"head_tracker.{self.chain.name}.block_time", self.block_time
+                    )
+
+                self.block_number = block_number
+                self._head_seen_at = now
+                metrics.set(
+                    f"head_tracker.{self.chain.name}.block_number", block_number
+                )
+                self._condition.notify_all()
+
+                # Wake up coroutines waiting for this block on their own loops
+                for loop, future, waited_block in self._async_waiters:
+                    if waited_block <= block_number and not loop.is_closed():
+                        loop.call_soon_threadsafe(_resolve, future)
+
+
+class FinalizedHeadTracker(HeadTracker):
+    """FinalizedHeadTracker keeps the latest finalised block number of a Substrate
+    chain in memory.
+
+    New finalised heads are announced by a `chain_subscribeFinalizedHeads`
+    subscription. While it is down, the finalised head is polled with an interval
+    adapted to the observed block time.
+    """
+
+    subscription = "chain_subscribeFinalizedHeads"
+
+    def _fetch_block_number(self) -> int:
+        """Fetch the latest finalised block number from the node.
+
+        Returns:
+            int: latest finalised block number
+        """
+        substrate = self.chain.get_connection()
+        return substrate.get_block_number(substrate.get_chain_finalised_head())
+
+    def _subscribe_block_numbers(self) -> typing.Iterator[int]:
+        """Subscribe to finalised heads of the chain.
+
+        Yields:
+            int: block number of every finalised head
+        """
+        for header in rpc_subscribe(
+            self.chain.url,
+            "chain_subscribeFinalizedHeads",
+            [],
+            timeout=config.HEAD_TRACKER_SUBSCRIPTION_TIMEOUT,
+            on_subscribed=self._subscribed.set,
+        ):
+            yield int(header["number"], 16)
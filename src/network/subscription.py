@@ -0,0 +1,164 @@
+import json
+import logging
+import threading
+import typing
+
+import websocket
+
+from src.config import config
+from src.network.exceptions import SubscriptionFailed
+
+logger = logging.getLogger(__name__)
+
+
+def rpc_subscribe(
+    url: str,
+    method: str,
+    params: list,
+    timeout: float,
+    on_subscribed: typing.Optional[typing.Callable[[], None]] = None,
+) -> typing.Iterator[dict]:
+    """Open a JSON-RPC pub/sub subscription on the websocket node `url` and yield its
+    notifications.
+
+    The subscription has its own connection, so it does not interfere with requests
+    made through the chain's provider. The connection is closed when the generator is
+    closed.
+
+    Args:
+        url (str): websocket URL of the node
+        method (str): subscription method, e.g. "eth_subscribe" or
+            "chain_subscribeFinalizedHeads"
+        params (list): params of the subscription method
+        timeout (float): seconds to wait for a message before the subscription is
+            considered dropped
+        on_subscribed (Optional[Callable]): called once the node accepted the
+            subscription
+
+    Yields:
+        dict: `result` of every subscription notification
+
+    Raises:
+        SubscriptionFailed: the node rejected the subscription.
+        websocket.WebSocketException: the connection was dropped or timed out.
+    """
+    ws = websocket.create_connection(url, timeout=timeout)
+    try:
+        ws.send(
+            json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params})
+        )
+        response = json.loads(ws.recv())
+        if "error" in response:
+            raise SubscriptionFailed(
+                f"Subscription {method} {params} failed: {response['error']}"
+            )
+
+        subscription_id = response["result"]
+        if on_subscribed is not None:
+            on_subscribed()
+
+        while True:
+            message = json.loads(ws.recv())
+            # Notifications of every subscription type carry the subscription id
+            if (
+                isinstance(message.get("params"), dict)
+                and message["params"].get("subscription") == subscription_id
+            ):
+                yield message["params"]["result"]
+    finally:
+        ws.close()
+
+
+def eth_subscribe(
+    url: str,
+    params: list,
+    timeout: float,
+    on_subscribed: typing.Optional[typing.Callable[[], None]] = None,
+) -> typing.Iterator[dict]:
+    """Open an `eth_subscribe` subscription on the websocket node `url` and yield its
+    notifications.
+
+    Args:
+        url (str): websocket URL of the node
+        params (list): `eth_subscribe` params, e.g. ["newHeads"]
+        timeout (float): seconds to wait for a message before the subscription is
+            considered dropped
+        on_subscribed (Optional[Callable]): called once the node accepted the
+            subscription
+
+    Yields:
+        dict: `result` of every subscription notification
+    """
+    return rpc_subscribe(url, "eth_subscribe", params, timeout, on_subscribed)
+
+
+class SubscriptionSignal:
+    """SubscriptionSignal follows an `eth_subscribe` subscription in a background
+    thread and signals that notifications arrived, without keeping their content.
+
+    It is used to skip work while nothing happens on chain. Consumers should only rely
+    on it while `active` is set, the subscription is reopened after
+    `config.HEAD_TRACKER_RESUBSCRIBE_DELAY` seconds when it drops. For notifications
+    carrying a `blockNumber` (e.g. `logs`), the highest one is kept in
+    `notified_block`, it is updated before `notified` is set.
+    """
+
+    def __init__(self, name: str, url: str, params: list):
+        """Inits SubscriptionSignal and starts following the subscription.
+
+        Args:
+            name (str): name used in logs, e.g. the chain name.
+            url (str): websocket URL of the node.
+            params (list): `eth_subscribe` params.
+        """
+        self.name = name
+        self.url = url
+        self.params = params
+
+        self.active = threading.Event()
+        self.notified = threading.Event()
+        self.notified_block: typing.Optional[int] = None
+        self._stopped = threading.Event()
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"subscription-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop following the subscription once the next message arrives."""
+        self._stopped.set()
+
+    def _run(self) -> None:
+        """Follow the subscription, reopening it until stopped."""
+        while not self._stopped.is_set():
+            try:
+                for result in eth_subscribe(
+                    self.url,
+                    self.params,
+                    timeout=config.HEAD_TRACKER_SUBSCRIPTION_TIMEOUT,
+                    on_subscribed=self.active.set,
+                ):
+                    if isinstance(result, dict) and "blockNumber" in result:
+                        block_number = int(result["blockNumber"], 16)
+                        if (
+                            self.notified_block is None
+                            or block_number > self.notified_block
+                        ):
+                            self.notified_block = block_number
+                    self.notified.set()
+
+                    if self._stopped.is_set():
+                        break
+            except websocket.WebSocketTimeoutException:
+                # Quiet subscriptions time out regularly, reopen them right away
+                continue
+            except Exception as e:
+                logger.warning(
+                    f"[[bold]{self.name}[/]] Subscription {self.params[0]} dropped "
+                    f"({e})."
+                )
+            finally:
+                self.active.clear()
+
+            self._stopped.wait(config.HEAD_TRACKER_RESUBSCRIBE_DELAY)
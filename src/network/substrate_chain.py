@@ -1,20 +1,43 @@
 import logging
+import os
+import threading
 import typing
+from concurrent.futures import ThreadPoolExecutor
 
 from scalecodec.base import ScaleBytes
+from scalecodec.block import MetadataDecoder
 from substrateinterface import Keypair, SubstrateInterface
 from substrateinterface.contracts import (
     ContractEvent,
     ContractInstance,
     ContractMetadata,
 )
+from substrateinterface.utils.ss58 import ss58_decode
+from websocket import WebSocketException
 
 from src.config import config
 from src.network.chain import Chain
 from src.network.exceptions import ChainValidationFailed
+from src.network.head_tracker import FinalizedHeadTracker
 
 logger = logging.getLogger(__name__)
 
+# Errors raised by the substrate interface when the node connection is lost
+CONNECTION_ERRORS = (WebSocketException, ConnectionError)
+
+
+def normalize_account_id(account_id: str) -> str:
+    """Normalize a hex encoded account ID for comparison.
+
+    Args:
+        account_id (str): hex encoded account ID, with or without the 0x prefix
+
+    Returns:
+        str: lowercase account ID without the 0x prefix
+    """
+    account_id = account_id.lower()
+    return account_id[2:] if account_id.startswith("0x") else account_id
+
 
 class SubstrateChain(Chain):
     """SubstrateChain is an abstraction of a parachain."""
@@ -40,9 +63,15 @@ class SubstrateChain(Chain):
 
         self.metadata_file = metadata_file
 
+        self._init_runtime_state()
+
     def get_connection(self, validate_chain: bool = True) -> SubstrateInterface:
         """Connects to Substrate chain on given `url` and returns `SubstrateInterface`.
 
+        The connection is created once per thread (websocket connections can not be
+        shared between threads) and reused by every following call. The chain is
+        validated when the connection is created.
+
         Args:
             validate_chain: specify if the chain should be validated.
 
@@ -52,13 +81,35 @@ class SubstrateChain(Chain):
         Raises:
             ConnectionRefusedError: connection could not be established.
         """
-        substrate_interface = SubstrateInterface(self.url)
+        self._check_fork()
 
-        if validate_chain:
+        substrate_interface = getattr(self._local, "substrate", None)
+        if substrate_interface is None:
+            substrate_interface = SubstrateInterface(self.url)
+            self._local.substrate = substrate_interface
+            self._local.validated = False
+
+        if validate_chain and not self._local.validated:
             self._validate_chain(substrate_interface)
+            self._local.validated = True
 
         return substrate_interface
 
+    @property
+    def head_tracker(self) -> FinalizedHeadTracker:
+        """FinalizedHeadTracker following the latest finalised block of the chain.
+
+        Returns:
+            FinalizedHeadTracker: head tracker shared by every user of the chain.
+        """
+        self._check_fork()
+
+        with self._runtime_lock:
+            if self._head_tracker is None:
+                self._head_tracker = FinalizedHeadTracker(self)
+
+            return self._head_tracker
+
     def check_valid_contracts(self, substrate: SubstrateInterface = None) -> None:
         """Iterates over `self.tracked_contracts` and checks whether the contract is
         deployed."""
@@ -95,33 +146,51 @@ class SubstrateChain(Chain):
             substrate=substrate,
         )
 
-    def get_block_events(self, block_hash: str) -> list:
+    def get_block_events(
+        self, block_hash: str, spec_version: typing.Optional[int] = None
+    ) -> list:
         """Find `Request` events for the given `block_hash`.
 
         Args:
             block_hash (str): block hash for which to find event.
+            spec_version (Optional[int]): runtime spec version of the block, if it is
+                already known. Blocks requested out of order must pass it.
 
         Returns:
             list: list of tuples (event, decoded_event), where `event` represents a raw
             `Request` events and `decoded_event` is a dict of the decoded event.
         """
-        substrate = self.get_connection()
-        spec_version = substrate.get_block_runtime_version(block_hash).get(
-            "specVersion", 0
-        )
+        try:
+            substrate = self.get_connection()
+            metadata = self._get_runtime_metadata(substrate, block_hash, spec_version)
+            events = substrate.get_block_events(block_hash, metadata).elements
+        except CONNECTION_ERRORS as e:
+            # The thread's connection is broken, reconnect and try once more
+            logger.warning(f"[[bold]{self.name}[/]] Connection dropped ({e}).")
+            self._local.substrate = None
+            substrate = self.get_connection()
+            metadata = self._get_runtime_metadata(substrate, block_hash, spec_version)
+            events = substrate.get_block_events(block_hash, metadata).elements
 
-        # Obtain metadata
-        metadata = substrate.get_block_metadata(block_hash, spec_version)
-        contract_metadata = ContractMetadata.create_from_file(
-            self.metadata_file, substrate
-        )
+        contract_metadata = self._get_contract_metadata(substrate)
+
+        # A runtime upgrade applies from the next block on
+        if any(
+            event.event_module.name == "System" and event.event.name == "CodeUpdated"
+            for event in events
+        ):
+            self._runtime_upgraded = True
 
-        # Iterate through raw events in the block
+        # Iterate through raw events in the block, only events emitted by tracked
+        # contracts are SCALE decoded
+        tracked_account_ids = self._get_tracked_account_ids()
         new_events = []
-        for event in substrate.get_block_events(block_hash, metadata).elements:
+        for event in events:
             if (
                 event.event_module.name == "Contracts"
                 and event.event.name == "ContractExecution"
+                and normalize_account_id(event.params[0]["value"])
+                in tracked_account_ids
             ):
                 contract_event_obj = ContractEvent(
                     data=ScaleBytes(event.params[1]["value"]),
@@ -132,14 +201,49 @@ class SubstrateChain(Chain):
 
                 # Request event was found, add it to the list
                 if decoded_event["name"] == "Request":
-                    if (
-                        substrate.ss58_encode(event.params[0]["value"])
-                        in self.tracked_contracts
-                    ):
-                        new_events.append((event, decoded_event))
+                    new_events.append((event, decoded_event))
 
         return new_events
 
+    def get_blocks_events(
+        self, from_block: int, to_block: int
+    ) -> typing.Iterator[typing.Tuple[int, list]]:
+        """Find `Request` events of the blocks `from_block` to `to_block` (inclusive),
+        fetching and decoding the blocks concurrently on the chain's worker pool.
+
+        The runtime version is checked at both ends of the range. Spec versions only
+        increase, so when they are equal every block of the range shares the runtime
+        metadata, otherwise the version of each block is fetched.
+
+        Args:
+            from_block (int): first block to scan.
+            to_block (int): last block to scan.
+
+        Returns:
+            Iterator[Tuple[int, list]]: (block number, events as returned by
+            `get_block_events`) of every block, in block order.
+        """
+        substrate = self.get_connection()
+        spec_versions = {
+            substrate.get_block_runtime_version(substrate.get_block_hash(block_nr)).get(
+                "specVersion", 0
+            )
+            for block_nr in (from_block, to_block)
+        }
+        spec_version = spec_versions.pop() if len(spec_versions) == 1 else None
+
+        with self._runtime_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=config.SUBSTRATE_CATCH_UP_WORKERS,
+                    thread_name_prefix=f"{self.name}-scan",
+                )
+
+        return self._executor.map(
+            lambda block_nr: self._scan_block(block_nr, spec_version),
+            range(from_block, to_block + 1),
+        )
+
     def fulfill(self, contract: ContractInstance, args: dict, res: int) -> None:
         keypair = Keypair.create_from_private_key(
             private_key=self.credentials["private_key"],
@@ -209,6 +313,149 @@ class SubstrateChain(Chain):
             "metadata_file": self.metadata_file,
         }
 
+    def __getstate__(self) -> dict:
+        """Exclude connections and runtime caches when the chain is serialised."""
+        state = self.__dict__.copy()
+        for attr in (
+            "_local",
+            "_pid",
+            "_runtime_lock",
+            "_metadata",
+            "_spec_version",
+            "_runtime_upgraded",
+            "_contract_metadata",
+            "_tracked_account_ids",
+            "_executor",
+            "_head_tracker",
+        ):
+            state.pop(attr, None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the chain and start without connections."""
+        self.__dict__.update(state)
+        self._init_runtime_state()
+
+    def _init_runtime_state(self) -> None:
+        """Set up the cached connection and runtime metadata attributes."""
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._runtime_lock = threading.Lock()
+        self._metadata: typing.Dict[int, MetadataDecoder] = {}
+        self._spec_version: typing.Optional[int] = None
+        self._runtime_upgraded = True
+        self._contract_metadata: typing.Optional[ContractMetadata] = None
+        self._tracked_account_ids: typing.Tuple[tuple, typing.FrozenSet[str]] = (
+            (),
+            frozenset(),
+        )
+        self._executor: typing.Optional[ThreadPoolExecutor] = None
+        self._head_tracker: typing.Optional[FinalizedHeadTracker] = None
+
+    def _check_fork(self) -> None:
+        """Reset the connections in a process forked after they were created."""
+        if self._pid != os.getpid():
+            self._init_runtime_state()
+
+    def _scan_block(
+        self, block_nr: int, spec_version: typing.Optional[int]
+    ) -> typing.Tuple[int, list]:
+        """Find `Request` events of block `block_nr` on a worker thread.
+
+        Args:
+            block_nr (int): block number
+            spec_version (Optional[int]): runtime spec version of the block, fetched
+                if None
+
+        Returns:
+            Tuple[int, list]: block number and its events
+        """
+        substrate = self.get_connection()
+        block_hash = substrate.get_block_hash(block_nr)
+        if spec_version is None:
+            spec_version = substrate.get_block_runtime_version(block_hash).get(
+                "specVersion", 0
+            )
+
+        return block_nr, self.get_block_events(block_hash, spec_version)
+
+    def _get_runtime_metadata(
+        self,
+        substrate: SubstrateInterface,
+        block_hash: str,
+        spec_version: typing.Optional[int] = None,
+    ) -> MetadataDecoder:
+        """Get the runtime metadata of the block `block_hash`.
+
+        Metadata is cached by `specVersion`. Without an explicit `spec_version` the
+        runtime version is only fetched again after a block with a runtime upgrade
+        (`System.CodeUpdated`), so blocks are expected to be requested in order.
+
+        Args:
+            substrate (SubstrateInterface): connection to the chain
+            block_hash (str): block hash
+            spec_version (Optional[int]): runtime spec version of the block, if known
+
+        Returns:
+            MetadataDecoder: decoded runtime metadata
+        """
+        with self._runtime_lock:
+            if spec_version is None:
+                if self._runtime_upgraded or self._spec_version is None:
+                    self._spec_version = substrate.get_block_runtime_version(
+                        block_hash
+                    ).get("specVersion", 0)
+                    self._runtime_upgraded = False
+
+                spec_version = self._spec_version
+
+            metadata = self._metadata.get(spec_version)
+
+        if metadata is None:
+            metadata = substrate.get_block_metadata(block_hash)
+            logger.info(
+                f"[[bold]{self.name}[/]] Loaded runtime metadata of spec version {spec_version}."
+            )
+            with self._runtime_lock:
+                self._metadata[spec_version] = metadata
+
+        return metadata
+
+    def _get_tracked_account_ids(self) -> typing.FrozenSet[str]:
+        """Get the account IDs of `self.tracked_contracts`.
+
+        Returns:
+            FrozenSet[str]: hex encoded account IDs, without the 0x prefix
+        """
+        tracked_contracts = tuple(self.tracked_contracts)
+        if self._tracked_account_ids[0] != tracked_contracts:
+            self._tracked_account_ids = (
+                tracked_contracts,
+                frozenset(
+                    normalize_account_id(ss58_decode(address))
+                    for address in tracked_contracts
+                ),
+            )
+
+        return self._tracked_account_ids[1]
+
+    def _get_contract_metadata(self, substrate: SubstrateInterface) -> ContractMetadata:
+        """Get the oracle contract metadata parsed from `self.metadata_file`.
+
+        Args:
+            substrate (SubstrateInterface): connection to the chain
+
+        Returns:
+            ContractMetadata: parsed contract metadata
+        """
+        with self._runtime_lock:
+            if self._contract_metadata is None:
+                self._contract_metadata = ContractMetadata.create_from_file(
+                    self.metadata_file, substrate
+                )
+
+            return self._contract_metadata
+
     def _validate_chain(self, substrate_interface: SubstrateInterface) -> None:
         """Validates the SubstrateInterface is connected to the expected chain.
 
@@ -0,0 +1,313 @@
+import logging
+import os
+import threading
+import time
+import typing
+
+from web3.exceptions import TransactionNotFound
+
+from src.config import config
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class NonceManager:
+    """NonceManager hands out transaction nonces of the chain's accounts locally.
+
+    The next nonce of an account is read from the node once (counting pending
+    transactions) and then incremented in memory, so concurrent fulfillments do not
+    race on `getTransactionCount`. When the node rejects a transaction, or one is
+    dropped, the account is resynced from the node.
+    """
+
+    def __init__(self, chain):
+        """Inits NonceManager.
+
+        Args:
+            chain (EvmChain): chain the accounts send transactions to.
+        """
+        self.chain = chain
+
+        self._lock = threading.Lock()
+        self._nonces: typing.Dict[str, int] = {}
+
+    def allocate(self, address: str) -> int:
+        """Allocate the next nonce of `address`.
+
+        Args:
+            address (str): account address
+
+        Returns:
+            int: allocated nonce
+        """
+        with self._lock:
+            if address not in self._nonces:
+                w3 = self.chain.get_connection()
+                self._nonces[address] = w3.eth.getTransactionCount(address, "pending")
+
+            nonce = self._nonces[address]
+            self._nonces[address] += 1
+
+            return nonce
+
+    def resync(self, address: str) -> None:
+        """Forget the local nonce of `address`, the next allocation reads it from the
+        node.
+
+        Args:
+            address (str): account address
+        """
+        with self._lock:
+            self._nonces.pop(address, None)
+
+        logger.info(f"[[bold]{self.chain.name}[/]] Resyncing nonce of {address}.")
+
+
+class ReceiptWatcher:
+    """ReceiptWatcher tracks the receipts of submitted transactions in a background
+    thread, so submitting a transaction does not block until it is mined.
+
+    Pending transactions are checked on every new block. A transaction without a
+    receipt after `timeout` seconds is not necessarily dropped, it may still be mined:
+    while its nonce is unused, it is replaced through its `replace` callback, e.g. by
+    the same transaction with a higher gas price, and the receipts of all its
+    replacements are tracked. It is considered dropped, and the nonce of its account
+    resynced, once the nonce was used by another transaction or no replacement is
+    left. The submitter of a transaction that reverted or was dropped is told through
+    its `on_failure` callback.
+
+    The following metrics are reported:
+        - `fulfillment.<chain>.pending`: number of transactions awaiting a receipt
+        - `fulfillment.<chain>.confirmed`: transactions mined successfully
+        - `fulfillment.<chain>.reverted`: transactions mined with a failed status
+        - `fulfillment.<chain>.replaced`: transactions resent without a receipt in time
+        - `fulfillment.<chain>.dropped`: transactions given up without a receipt
+        - `fulfillment.<chain>.confirmation_seconds`: submission to receipt time of
+          the last mined transaction
+    """
+
+    def __init__(self, chain, timeout: float = config.FULFILLMENT_RECEIPT_TIMEOUT):
+        """Inits ReceiptWatcher.
+
+        Args:
+            chain (EvmChain): chain the transactions were sent to.
+            timeout (float): seconds after which a transaction without receipt is
+                replaced.
+        """
+        self.chain = chain
+        self.timeout = timeout
+
+        self._condition = threading.Condition()
+        self._pending: typing.Dict[str, dict] = {}
+        self._thread: typing.Optional[threading.Thread] = None
+        self._pid: typing.Optional[int] = None
+        self._stopped = threading.Event()
+
+    def watch(
+        self,
+        tx_hash: str,
+        address: str,
+        description: str,
+        on_failure: typing.Optional[typing.Callable[[str], None]] = None,
+        nonce: typing.Optional[int] = None,
+        replace: typing.Optional[typing.Callable[[], str]] = None,
+        replacements: int = config.FULFILLMENT_MAX_RESUBMISSIONS,
+    ) -> None:
+        """Track the receipt of transaction `tx_hash`.
+
+        Args:
+            tx_hash (str): hex encoded transaction hash
+            address (str): account that sent the transaction
+            description (str): description of the transaction used in logs
+            on_failure (Optional[Callable[[str], None]]): called on the watcher thread
+                with "reverted" or "dropped" if the transaction failed
+            nonce (Optional[int]): nonce of the transaction, without it the
+                transaction is considered dropped after `timeout` seconds
+            replace (Optional[Callable[[], str]]): resends the transaction with the
+                same nonce and returns the hash of the replacement
+            replacements (int): number of times the transaction is replaced
+        """
+        self.start()
+
+        with self._condition:
+            self._pending[tx_hash] = {
+                "address": address,
+                "description": description,
+                "submitted_at": time.monotonic(),
+                "on_failure": on_failure,
+                "nonce": nonce,
+                "hashes": [tx_hash],
+                "replace": replace if nonce is not None else None,
+                "replacements": replacements,
+            }
+            self._report_pending()
+            self._condition.notify_all()
+
+    def start(self) -> None:
+        """Start the background thread if it is not running in this process."""
+        if self._is_running():
+            return
+
+        with self._condition:
+            # Threads do not survive a fork, start a new one in the child process
+            if not self._is_running():
+                if self._pid != os.getpid():
+                    self._pending = {}
+                self._stopped.clear()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"receipt-watcher-{self.chain.name}",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+
+    def _is_running(self) -> bool:
+        """Check whether the background thread is running in this process."""
+        return (
+            self._thread is not None
+            and self._thread.is_alive()
+            and self._pid == os.getpid()
+        )
+
+    def _run(self) -> None:
+        """Check the pending transactions on every new block until stopped."""
+        last_block = None
+
+        while not self._stopped.is_set():
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._pending or self._stopped.is_set()
+                )
+
+            try:
+                head_tracker = self.chain.head_tracker
+                if last_block is None:
+                    last_block = head_tracker.get_block_number()
+                else:
+                    last_block = (
+                        head_tracker.wait_for_block(
+                            last_block + 1, timeout=config.HEAD_TRACKER_MAX_STALENESS
+                        )
+                        or last_block
+                    )
+
+                self._check_receipts()
+            except Exception as e:
+                logger.warning(
+                    f"[[bold]{self.chain.name}[/]] Failed to check receipts: {e}"
+                )
+                self._stopped.wait(config.HEAD_TRACKER_MAX_STALENESS)
+
+    def _check_receipts(self) -> None:
+        """Check the receipts of all pending transactions."""
+        w3 = self.chain.get_connection()
+
+        with self._condition:
+            pending = list(self._pending.items())
+
+        for key, tx in pending:
+            elapsed = time.monotonic() - tx["submitted_at"]
+            # Read before the receipts, so a transaction mined in between is not taken
+            # for another one using the nonce
+            nonce_used = (
+                elapsed > self.timeout
+                and tx["nonce"] is not None
+                and w3.eth.getTransactionCount(tx["address"], "latest") > tx["nonce"]
+            )
+
+            # Any of the replacements may be mined, including the original transaction
+            tx_hash, receipt = tx["hashes"][-1], None
+            for sent_hash in tx["hashes"]:
+                try:
+                    receipt = w3.eth.getTransactionReceipt(sent_hash)
+                except TransactionNotFound:
+                    receipt = None
+                if receipt is not None:
+                    tx_hash = sent_hash
+                    break
+
+            if receipt is not None and receipt["status"]:
+                status = "confirmed"
+                metrics.set(
+                    f"fulfillment.{self.chain.name}.confirmation_seconds", elapsed
+                )
+                logger.info(
+                    f"[[bold]{self.chain.name}[/]] {tx['description']} confirmed in "
+                    f"block {receipt['blockNumber']}, TX {tx_hash}."
+                )
+            elif receipt is not None:
+                status = "reverted"
+                logger.error(
+                    f"[[bold]{self.chain.name}[/]] {tx['description']} reverted in "
+                    f"block {receipt['blockNumber']}, TX {tx_hash}."
+                )
+            elif elapsed <= self.timeout:
+                continue
+            elif not nonce_used and tx["replace"] and tx["replacements"] > 0:
+                self._replace(tx, tx_hash, elapsed)
+                continue
+            else:
+                status = "dropped"
+                reason = "its nonce was used" if nonce_used else "no replacement left"
+                logger.warning(
+                    f"[[bold]{self.chain.name}[/]] {tx['description']} TX {tx_hash} "
+                    f"not mined after {int(elapsed)}s and {reason}, considering it "
+                    f"dropped."
+                )
+                self.chain.nonce_manager.resync(tx["address"])
+
+            metrics.inc(f"fulfillment.{self.chain.name}.{status}")
+            with self._condition:
+                self._pending.pop(key, None)
+                self._report_pending()
+
+            if status != "confirmed" and tx["on_failure"] is not None:
+                try:
+                    tx["on_failure"](status)
+                except Exception as e:
+                    logger.error(
+                        f"[[bold]{self.chain.name}[/]] Failed to handle {status} "
+                        f"{tx['description']} TX {tx_hash}: {e}"
+                    )
+
+    def _replace(self, tx: dict, tx_hash: str, elapsed: float) -> None:
+        """Replace the pending transaction `tx` and track the receipt of the
+        replacement as well.
+
+        Args:
+            tx (dict): pending transaction
+            tx_hash (str): hex encoded hash of the latest replacement
+            elapsed (float): seconds since the latest replacement was submitted
+        """
+        logger.warning(
+            f"[[bold]{self.chain.name}[/]] {tx['description']} TX {tx_hash} not mined "
+            f"after {int(elapsed)}s, replacing it."
+        )
+        try:
+            replacement = tx["replace"]()
+            metrics.inc(f"fulfillment.{self.chain.name}.replaced")
+        except Exception as e:
+            # e.g. the transaction was mined meanwhile, the next check finds out
+            logger.warning(
+                f"[[bold]{self.chain.name}[/]] Failed to replace {tx['description']} "
+                f"TX {tx_hash}: {e}"
+            )
+            replacement = None
+
+        with self._condition:
+            if replacement is not None and replacement not in tx["hashes"]:
+                tx["hashes"].append(replacement)
+            tx["replacements"] -= 1
+            tx["submitted_at"] = time.monotonic()
+
+    def _report_pending(self) -> None:
+        """Report the number of pending transactions."""
+        metrics.set(f"fulfillment.{self.chain.name}.pending", len(self._pending))
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import logging
+import os
+import typing
+from pathlib import Path
+
+from web3 import Web3
+from web3.contract import Contract
+
+from src.config import config
+from src.utils.cache import MISSING, LRUCache
+from src.utils.metrics import metrics
+from src.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class AbiCache:
+    """AbiCache stores contract ABIs in memory and on disk.
+
+    ABIs are stored content-addressed on disk, i.e. `objects/<sha256>.json` holds the
+    ABI and `addresses/<address>` points to the hash of the ABI deployed on the
+    address. Contracts sharing an ABI (e.g. ERC20 tokens) therefore share one file.
+    Lookups check the in-memory LRU first, then the disk, and only then the remote
+    source. Concurrent remote lookups for the same address are collapsed into one.
+    """
+
+    def __init__(
+        self,
+        folder: Path = config.DATA_FOLDER.joinpath("abi"),
+        maxsize: int = config.ABI_CACHE_SIZE,
+        contract_cache_size: int = config.ABI_CONTRACT_CACHE_SIZE,
+    ):
+        """Inits AbiCache.
+
+        Args:
+            folder (Path): folder of the on-disk store.
+            maxsize (int): number of ABIs kept in memory.
+            contract_cache_size (int): number of web3 contract objects kept in memory.
+        """
+        self.folder = Path(folder)
+        self._abis = LRUCache(maxsize, name="abi_cache")
+        self._contracts = LRUCache(contract_cache_size, name="abi_cache.contracts")
+        self._fetches = SingleFlight(name="abi_cache.fetches")
+
+    async def get_abi(
+        self, address: str, fetch: typing.Callable[[str], typing.Awaitable[list]]
+    ) -> list:
+        """Get the ABI of the contract on `address`.
+
+        Args:
+            address (str): contract address
+            fetch (Callable): coroutine function fetching the ABI for an address from a
+                remote source, only called on a cache miss.
+
+        Returns:
+            list: contract ABI
+        """
+        key = address.lower()
+
+        abi = self._abis.get(key)
+        if abi is not MISSING:
+            return abi
+
+        abi = self._load(key)
+        if abi is not None:
+            metrics.inc("abi_cache.disk_hits")
+            self._abis.set(key, abi)
+            return abi
+
+        return await self._fetches.do(key, lambda: self._fetch(key, fetch))
+
+    def get_contract(self, w3: Web3, address: str, abi: list) -> Contract:
+        """Get a memoized web3 contract object for `address` built from `abi`.
+
+        Args:
+            w3 (Web3): web3 connection the contract is bound to
+            address (str): contract address
+            abi (list): contract ABI
+
+        Returns:
+            Contract: web3 contract object
+        """
+        key = (id(w3), address.lower())
+
+        contract = self._contracts.get(key)
+        if contract is MISSING:
+            contract = w3.eth.contract(address=address, abi=abi)
+            self._contracts.set(key, contract)
+
+        return contract
+
+    def seed(self, folder: Path) -> int:
+        """Pre-seed the cache from local ABI files.
+
+        Every `<address>.json` file in `folder` is expected to contain either the ABI
+        list or a compiler artifact with an `abi` field.
+
+        Args:
+            folder (Path): folder containing ABI files
+
+        Returns:
+            int: number of seeded ABIs
+        """
+        seeded = 0
+        for abi_file in Path(folder).glob("*.json"):
+            with open(abi_file) as f:
+                abi = json.load(f)
+            if isinstance(abi, dict):
+                abi = abi.get("abi")
+
+            if not isinstance(abi, list) or not Web3.isAddress(abi_file.stem):
+                logger.warning(
+                    f"Skipping {abi_file}, not an ABI of a contract address."
+                )
+                continue
+
+            self._store(abi_file.stem.lower(), abi)
+            seeded += 1
+
+        logger.info(f"Seeded {seeded} ABIs from {folder}.")
+        return seeded
+
+    async def _fetch(
+        self, key: str, fetch: typing.Callable[[str], typing.Awaitable[list]]
+    ) -> list:
+        """Fetch the ABI from the remote source and store it.
+
+        Args:
+            key (str): lowercase contract address
+            fetch (Callable): coroutine function fetching the ABI
+
+        Returns:
+            list: contract ABI
+        """
+        metrics.inc("abi_cache.remote_fetches")
+        abi = await fetch(key)
+        self._store(key, abi)
+        return abi
+
+    def _load(self, key: str) -> typing.Optional[list]:
+        """Load the ABI of `key` from disk.
+
+        Args:
+            key (str): lowercase contract address
+
+        Returns:
+            Optional[list]: contract ABI if it is stored on disk
+        """
+        address_file = self.folder.joinpath("addresses", key)
+        if not address_file.exists():
+            return None
+
+        object_file = self.folder.joinpath(
+            "objects", f"{address_file.read_text()}.json"
+        )
+        if not object_file.exists():
+            return None
+
+        return json.loads(object_file.read_text())
+
+    def _store(self, key: str, abi: list) -> None:
+        """Store the ABI of `key` in memory and on disk.
+
+        Args:
+            key (str): lowercase contract address
+            abi (list): contract ABI
+        """
+        self._abis.set(key, abi)
+
+        content = json.dumps(abi, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+        object_file = self.folder.joinpath("objects", f"{digest}.json")
+        if not object_file.exists():
+            self._write_atomic(object_file, content)
+        self._write_atomic(self.folder.joinpath("addresses", key), digest)
+
+    @staticmethod
+    def _write_atomic(path: Path, content: str) -> None:
+        """Write `content` to `path` so concurrent readers never see partial files.
+
+        Args:
+            path (Path): destination file
+            content (str): file content
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(content)
+        os.replace(tmp_path, path)
+
+
+abi_cache = AbiCache()
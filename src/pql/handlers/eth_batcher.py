@@ -0,0 +1,205 @@
+import asyncio
+import itertools
+import json
+import logging
+import typing
+
+from src.config import config
+from src.network.evm_chain import reconnect_middleware
+from src.pql.exceptions import ExternalError
+from src.utils.http import session_manager
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class EthRequestBatcher:
+    """EthRequestBatcher coalesces JSON-RPC requests to the same chain and block.
+
+    Requests arriving within `window` seconds of the first one are sent together as a
+    single JSON-RPC batch and the results are fanned back out to each caller. Identical
+    requests within a batch are sent only once. Chains reached over websocket do not
+    support batches through the web3 provider, their requests are deduplicated and
+    then sent sequentially over the connection.
+
+    The following metrics are reported:
+        - `eth_batcher.batches`: number of sent batches
+        - `eth_batcher.requests`: number of requests sent to the nodes
+        - `eth_batcher.deduplicated`: number of requests served by an identical request
+          in the same batch
+    """
+
+    def __init__(
+        self,
+        window: float = config.ETH_BATCH_WINDOW,
+        max_size: int = config.ETH_BATCH_MAX_SIZE,
+    ):
+        """Inits EthRequestBatcher.
+
+        Args:
+            window (float): seconds to wait for more requests before sending a batch.
+            max_size (int): maximum number of requests in a batch.
+        """
+        self.window = window
+        self.max_size = max_size
+
+        self._pending: typing.Dict[tuple, typing.Dict[tuple, list]] = {}
+        self._ids = itertools.count()
+
+    async def request(
+        self, evm_chain, method: str, params: list, block: int
+    ) -> typing.Any:
+        """Queue a JSON-RPC request and wait for its result.
+
+        Args:
+            evm_chain (EvmChain): chain to send the request to
+            method (str): JSON-RPC method
+            params (list): JSON-RPC params
+            block (int): block the request targets
+
+        Returns:
+            Any: JSON-RPC `result` of the request
+
+        Raises:
+            ExternalError: the node returned an error or could not be reached.
+        """
+        loop = asyncio.get_event_loop()
+        batch_key = (loop, evm_chain.name, block)
+        request_key = (method, json.dumps(params, sort_keys=True))
+
+        batch = self._pending.get(batch_key)
+        if batch is None:
+            batch = self._pending[batch_key] = {}
+            loop.call_later(self.window, self._flush, batch_key, evm_chain, batch)
+
+        future = loop.create_future()
+        if request_key in batch:
+            metrics.inc("eth_batcher.deduplicated")
+            batch[request_key].append(future)
+        else:
+            batch[request_key] = [future]
+
+        if len(batch) >= self.max_size:
+            self._flush(batch_key, evm_chain, batch)
+
+        return await future
+
+    def _flush(
+        self, batch_key: tuple, evm_chain, batch: typing.Dict[tuple, list]
+    ) -> None:
+        """Send `batch` if it was not sent yet.
+
+        The window timer of a batch sent early because it was full must not send a
+        newer batch under the same key.
+
+        Args:
+            batch_key (tuple): (loop, chain name, block) key of the batch
+            evm_chain (EvmChain): chain to send the batch to
+            batch (dict): {(method, params): [futures]} requests to send
+        """
+        if self._pending.get(batch_key) is not batch:
+            return
+        del self._pending[batch_key]
+
+        asyncio.ensure_future(self._send(evm_chain, batch))
+
+    async def _send(self, evm_chain, batch: typing.Dict[tuple, list]) -> None:
+        """Send `batch` and resolve the futures of its requests.
+
+        Args:
+            evm_chain (EvmChain): chain to send the batch to
+            batch (dict): {(method, params): [futures]} requests to send
+        """
+        requests = {
+            next(self._ids): (method, json.loads(params), futures)
+            for (method, params), futures in batch.items()
+        }
+        metrics.inc("eth_batcher.batches")
+        metrics.inc("eth_batcher.requests", len(requests))
+
+        try:
+            if evm_chain.url.startswith("http"):
+                responses = await self._send_http_batch(evm_chain, requests)
+            else:
+                responses = await self._send_individually(evm_chain, requests)
+        except Exception as e:
+            responses = {
+                request_id: {"error": {"message": f"{str(type(e))}: {e}"}}
+                for request_id in requests
+            }
+
+        for request_id, (method, params, futures) in requests.items():
+            response = responses.get(
+                request_id, {"error": {"message": "No response in batch."}}
+            )
+            for future in futures:
+                if future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(
+                        ExternalError(
+                            f"{method} failed: {response['error'].get('message')}"
+                        )
+                    )
+                else:
+                    future.set_result(response["result"])
+
+    @staticmethod
+    async def _send_http_batch(evm_chain, requests: dict) -> typing.Dict[int, dict]:
+        """Send `requests` as a single JSON-RPC batch over HTTP.
+
+        Args:
+            evm_chain (EvmChain): chain to send the batch to
+            requests (dict): {id: (method, params, futures)} requests to send
+
+        Returns:
+            Dict[int, dict]: JSON-RPC responses by request id
+        """
+        payload = [
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+            for request_id, (method, params, _) in requests.items()
+        ]
+
+        session = session_manager.get_session()
+        async with session.post(evm_chain.url, json=payload) as resp:
+            data = await resp.json(content_type=None)
+
+        # Nodes reply with a single error object if they reject the whole batch
+        if isinstance(data, dict):
+            return {request_id: data for request_id in requests}
+
+        return {response["id"]: response for response in data}
+
+    @staticmethod
+    async def _send_individually(evm_chain, requests: dict) -> typing.Dict[int, dict]:
+        """Send `requests` one by one through the chain's web3 provider.
+
+        The websocket connection serves a single request at a time, so the requests
+        are sent sequentially from one thread of the chain's pool.
+
+        Args:
+            evm_chain (EvmChain): chain to send the requests to
+            requests (dict): {id: (method, params, futures)} requests to send
+
+        Returns:
+            Dict[int, dict]: JSON-RPC responses by request id
+        """
+
+        def send_all() -> typing.Dict[int, dict]:
+            w3 = evm_chain.get_connection()
+            make_request = reconnect_middleware(w3.manager.provider.make_request, w3)
+
+            responses = {}
+            for request_id, (method, params, _) in requests.items():
+                try:
+                    responses[request_id] = make_request(method, params)
+                except Exception as e:
+                    responses[request_id] = {
+                        "error": {"message": f"{str(type(e))}: {e}"}
+                    }
+            return responses
+
+        return await evm_chain.run(send_all)
+
+
+eth_batcher = EthRequestBatcher()
@@ -1,13 +1,21 @@
 import json
 import typing
 
-import aiohttp
+from hexbytes import HexBytes
 from sanic.log import logger
+from web3 import Web3
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
 
 from src.config import config
 from src.network import chains
+from src.network.evm_chain import CONNECTION_ERRORS
 from src.pql.exceptions import ExternalError
+from src.pql.handlers.abi_cache import abi_cache
+from src.pql.handlers.eth_batcher import eth_batcher
 from src.pql.handlers.handler import Handler
+from src.utils.cache import MISSING, LRUCache
+from src.utils.http import session_manager
 
 
 class EthHandler(Handler):
@@ -15,73 +23,136 @@ class EthHandler(Handler):
 
     URL = "https://api.etherscan.io/api"
 
+    # Results of calls against a concrete block never change, they are cached by
+    # (chain, address, function signature, args, block)
+    RESULTS = LRUCache(config.ETH_RESULT_CACHE_SIZE, name="eth_result_cache")
+
     @staticmethod
     async def execute(step: dict) -> typing.Any:
         method = step["method"].split(".")[-1]
 
-        w3 = chains.evm[step["chain"]].get_connection()
-
-        if not w3.isConnected():
-            raise ExternalError("Could not connect to Ethereum node.")
+        evm_chain = chains.evm[step["chain"]]
+        params = step["params"]
+        num_confirmations = (
+            config.DEFAULT_NUM_CONFIRMATIONS
+            if "num_confirmations" not in params
+            else params["num_confirmations"]
+        )
 
-        if method == "balance":
-            # set params
-            params = step["params"]
-            num_confirmations = (
-                config.DEFAULT_NUM_CONFIRMATIONS
-                if "num_confirmations" not in params
-                else params["num_confirmations"]
-            )
+        try:
+            w3 = await evm_chain.run(evm_chain.get_connection)
             block = (
-                w3.eth.blockNumber - num_confirmations
+                await evm_chain.run(evm_chain.head_tracker.get_block_number)
+                - num_confirmations
                 if params["block"] == "latest"
                 else params["block"]
             )
+        except CONNECTION_ERRORS:
+            raise ExternalError("Could not connect to Ethereum node.")
 
-            # execute getBalance
-            try:
-                logger.info(
-                    f"Obtaining balance for address {step['address']} (block: {block} | orig: {params['block']}), "
-                    f"num_confirmations: {num_confirmations}"
-                )
-                return w3.eth.getBalance(step["address"], block_identifier=block)
-            except Exception as e:
-                raise ExternalError(f"{str(type(e))}: {e.args[0]}")
+        # Blocks within reach of a reorg are not immutable yet
+        cacheable = params["block"] != "latest" or num_confirmations > 0
+
+        if method == "balance":
+            key = (step["chain"], step["address"].lower(), "balance", (), block)
+            result = EthHandler.RESULTS.get(key) if cacheable else MISSING
+            if result is not MISSING:
+                return result
+
+            # execute getBalance, batched with other requests for the same block
+            logger.info(
+                f"Obtaining balance for address {step['address']} (block: {block} | orig: {params['block']}), "
+                f"num_confirmations: {num_confirmations}"
+            )
+            balance = await eth_batcher.request(
+                evm_chain, "eth_getBalance", [step["address"], hex(block)], block
+            )
+            result = int(balance, 16)
 
         elif method == "function":
-            # Parse params
-            params = step["params"]
             args = params["args"]
-            num_confirmations = (
-                config.DEFAULT_NUM_CONFIRMATIONS
-                if "num_confirmations" not in params
-                else params["num_confirmations"]
+            key = (
+                step["chain"],
+                step["address"].lower(),
+                params["function"],
+                tuple(args),
+                block,
             )
+            result = EthHandler.RESULTS.get(key) if cacheable else MISSING
+            if result is not MISSING:
+                return result
 
-            block = (
-                w3.eth.blockNumber - num_confirmations
-                if params["block"] == "latest"
-                else params["block"]
+            # Get contract ABI from the cache or Etherscan API
+            contract_abi = await abi_cache.get_abi(
+                step["address"], EthHandler.fetch_abi
             )
 
-            # Get contract ABI from Etherscan API
-            data_abi = await EthHandler.fetch_from_explorer(step["address"], "getabi")
-            contract_abi = json.loads(data_abi["result"].strip())
-
             # Create contract object and find function
-            con = w3.eth.contract(address=step["address"], abi=contract_abi)
+            con = abi_cache.get_contract(w3, step["address"], contract_abi)
 
             try:
-                fun = con.get_function_by_signature(params["function"])
+                fun = con.get_function_by_signature(params["function"])(*args)
+                data = fun._encode_transaction_data()
+            except Exception as e:
+                raise ExternalError(f"{str(type(e))}: {e.args[0]}")
 
-                logger.info(
-                    f"Obtaining balance for address {step['address']} (block: {block} | orig: {params['block']}), "
-                    f"num_confirmations: {num_confirmations}"
-                )
-                return fun(*args).call(block_identifier=block)
+            # execute eth_call, batched with other requests for the same block
+            logger.info(
+                f"Obtaining balance for address {step['address']} (block: {block} | orig: {params['block']}), "
+                f"num_confirmations: {num_confirmations}"
+            )
+            output = await eth_batcher.request(
+                evm_chain,
+                "eth_call",
+                [{"to": step["address"], "data": data}, hex(block)],
+                block,
+            )
+
+            try:
+                result = EthHandler.decode_function_output(w3, fun.abi, output)
             except Exception as e:
                 raise ExternalError(f"{str(type(e))}: {e.args[0]}")
 
+        if cacheable:
+            EthHandler.RESULTS.set(key, result)
+
+        return result
+
+    @staticmethod
+    def decode_function_output(w3: Web3, fn_abi: dict, output: str) -> typing.Any:
+        """Decode the raw `eth_call` output the same way `ContractFunction.call` does.
+
+        Args:
+            w3 (Web3): web3 connection
+            fn_abi (dict): ABI of the called function
+            output (str): hex encoded `eth_call` result
+
+        Returns:
+            typing.Any: a single value, or a list if the function returns several
+        """
+        output_types = get_abi_output_types(fn_abi)
+        output_data = w3.codec.decode_abi(output_types, HexBytes(output))
+        normalized_data = map_abi_data(
+            BASE_RETURN_NORMALIZERS, output_types, output_data
+        )
+
+        if len(normalized_data) == 1:
+            return normalized_data[0]
+        return normalized_data
+
+    @staticmethod
+    async def fetch_abi(address: str) -> list:
+        """fetch_abi fetches the contract ABI of the given address from Etherscan API.
+
+        Args:
+            address (str): contract address
+
+        Returns:
+            list: contract ABI
+        """
+        data_abi = await EthHandler.fetch_from_explorer(address, "getabi")
+        return json.loads(data_abi["result"].strip())
+
     @staticmethod
     async def fetch_from_explorer(address: str, action: str) -> typing.Dict:
         """fetch_from_explorer extracts contract ABI from the given address.
@@ -105,18 +176,18 @@ class EthHandler(Handler):
             raise ExternalError("ETHERSCAN_KEY was not supplied in .env file")
 
         logger.debug(f"Fetching source of {address}")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(EthHandler.URL, params=params) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    raise ExternalError(
-                        f"Etherscan API returned status {resp.status} when querying {action}: {text}"
-                    )
-
-                data = await resp.json()
-                if int(data["status"]) != 1:
-                    raise ExternalError(
-                        f"Failed to retrieve data from Etherscan API: {data['result']}"
-                    )
-
-                return data
+        session = session_manager.get_session()
+        async with session.get(EthHandler.URL, params=params) as resp:
+            if resp.status != 200:
+                text = await resp.text()
+                raise ExternalError(
+                    f"Etherscan API returned status {resp.status} when querying {action}: {text}"
+                )
+
+            data = await resp.json()
+            if int(data["status"]) != 1:
+                raise ExternalError(
+                    f"Failed to retrieve data from Etherscan API: {data['result']}"
+                )
+
+            return data
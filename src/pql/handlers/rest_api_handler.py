@@ -1,9 +1,8 @@
 import json
 import typing
 
-import aiohttp
-
 from src.pql.handlers.handler import Handler
+from src.utils.http import session_manager
 
 
 class RestApiHandler(Handler):
@@ -20,15 +19,14 @@ class RestApiHandler(Handler):
             typing.Any: result
         """
         method = step["method"].split(".")[-1]
+        session = session_manager.get_session()
 
         if method == "get":
-            async with aiohttp.ClientSession() as session:
-                async with session.get(step["uri"]) as resp:
-                    data = await resp.read()
+            async with session.get(step["uri"]) as resp:
+                data = await resp.read()
 
-                    return json.loads(data)
+                return json.loads(data)
         elif method == "post":
-            async with aiohttp.ClientSession() as session:
-                async with session.post(step["uri"], json=step["params"]) as resp:
-                    data = await resp.read()
-                    return json.loads(data)
+            async with session.post(step["uri"], json=step["params"]) as resp:
+                data = await resp.read()
+                return json.loads(data)
@@ -1,8 +1,7 @@
 import typing
 
-import asyncpg
-
 from src.pql.handlers.handler import Handler
+from src.utils.postgres import pool_registry
 
 
 class SqlHandler(Handler):
@@ -21,9 +20,5 @@ class SqlHandler(Handler):
         method = step["method"].split(".")[-1]
 
         if method == "postgres":
-            conn = await asyncpg.connect(step["uri"])
-            values = await conn.fetch(step["query"])
-
-            await conn.close()
-
-            return values
+            async with pool_registry.acquire(step["uri"]) as conn:
+                return await conn.fetch(step["query"])
@@ -3,12 +3,12 @@ import typing
 from decimal import Decimal
 
 import numpy as np
-from jsonschema import Draft7Validator, ValidationError
 
-from src.pql.exceptions import PqlValidationError
+from src.config import config
 from src.pql.pipeline import Pipeline
+from src.pql.plan import compile_pql, validate_pql
 from src.pql.query_sql import execute_sql_query, prepare_data
-from src.pql.schema import pql as pql_schema
+from src.pql.result_cache import result_cache
 
 
 class Parser:
@@ -22,7 +22,8 @@ class Parser:
         Args:
             pql (dict): a valid PQL dict object
         """
-        self.pql = self.validate_pql(pql)
+        self.plan = compile_pql(pql)
+        self.pql = self.plan.pql
         self.pipelines: typing.List[Pipeline] = []
 
     @staticmethod
@@ -35,10 +36,7 @@ class Parser:
         Returns:
             dict: validated pql dict that conforms to schema
         """
-        errors = [error for error in Draft7Validator(pql_schema).iter_errors(pql)]
-        if errors:
-            raise PqlValidationError("\n".join([error.message for error in errors]))
-        return pql
+        return validate_pql(pql)
 
     async def execute(self) -> typing.Any:
         """Executes given PQL dict object.
@@ -49,7 +47,8 @@ class Parser:
         """
         # Execute pipelines
         self.pipelines = [
-            Pipeline(pipeline_pql) for pipeline_pql in self.pql["sources"]
+            Pipeline(pipeline_pql, steps)
+            for pipeline_pql, steps in zip(self.pql["sources"], self.plan.sources)
         ]
 
         await asyncio.gather(*[pipeline.execute() for pipeline in self.pipelines])
@@ -95,10 +94,19 @@ async def parse_and_execute(pql: dict) -> typing.Any:
     """parse_and_execute parses the initial PQL version and selects the correct Parser
     class.
 
+    Results are reused for `max_age` seconds if the definition declares it, or for
+    `PQL_RESULT_MAX_AGE` seconds otherwise.
+
     Args:
         pql (dict): a valid PQL JSON
 
     Returns:
         typing.Any: executed result
     """
-    return await Parser(pql).execute()
+    parser = Parser(pql)
+
+    max_age = parser.pql.get("max_age", config.PQL_RESULT_MAX_AGE)
+    if not max_age:
+        return await parser.execute()
+
+    return await result_cache.get_or_execute(parser.plan.key, max_age, parser.execute)
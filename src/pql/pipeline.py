@@ -6,6 +6,7 @@ import pandas as pd
 from src.config import config
 from src.pql.exceptions import NoInputValue
 from src.pql.handlers.eth_handler import EthHandler
+from src.pql.handlers.handler import Handler
 from src.pql.handlers.rest_api_handler import RestApiHandler
 from src.pql.handlers.sql_handler import SqlHandler
 from src.pql.query_sql import execute_sql_query, prepare_data
@@ -14,13 +15,20 @@ from src.pql.query_sql import execute_sql_query, prepare_data
 class Pipeline:
     """Pipeline holds the information about the specific PQL pipeline as well as the executed results."""
 
-    def __init__(self, pipeline: dict):
+    def __init__(
+        self, pipeline: dict, steps: typing.Optional[typing.Sequence[tuple]] = None
+    ):
         """Initialize Pipeline object.
 
         Args:
             pipeline (dict): pipeline PQL json.
+            steps (Optional[Sequence[tuple]]): pre-resolved (function, step) pairs of
+                the pipeline, resolved from `pipeline` if not given.
         """
         self.pipeline = pipeline
+        self.steps = (
+            steps if steps is not None else Pipeline.resolve_steps(pipeline["pipeline"])
+        )
         self.step_results: typing.List[typing.Any] = []
 
     async def execute(self) -> None:
@@ -31,38 +39,85 @@ class Pipeline:
         Returns:
             None: the results are available through `self.step_results`.
         """
-        for i, step in enumerate(self.pipeline["pipeline"]):
-            if step["step"] == "extract":
-                result = await self.extract(step)
-            elif step["step"] == "traverse":
-                result = await self.traverse(step, i)
-            elif step["step"] == "get_index":
-                result = await self.get_index(step, i)
-            elif step["step"] == "math":
-                result = await self.math(step, i)
-            elif step["step"].startswith("custom"):
-                result = config.PQL_CUSTOM_METHODS[step["step"]].execute(step, i, self)
-            elif step["step"] == "query.sql":
-                result = await self.query_sql(step, i)
+        for i, (execute_step, step) in enumerate(self.steps):
+            result = await execute_step(self, step, i)
 
             self.step_results.append(result)
 
     @staticmethod
-    async def extract(step: dict) -> typing.Any:
-        """Parses `extract` step, finds the correct handler and executes the step.
+    def resolve_steps(steps: typing.List[dict]) -> typing.Tuple[tuple, ...]:
+        """Resolve each step to the function executing it.
+
+        Args:
+            steps: list of step PQL jsons.
+
+        Returns:
+            Tuple[tuple, ...]: (function, step) pairs, the function is called with
+            the pipeline, the step and the step index.
+        """
+        return tuple((Pipeline.resolve_step(step), step) for step in steps)
+
+    @staticmethod
+    def resolve_step(step: dict) -> typing.Callable:
+        """Find the function executing `step`.
+
+        Args:
+            step: step PQL json.
+
+        Returns:
+            typing.Callable: coroutine function accepting the pipeline, the step and the
+            step index.
+        """
+        if step["step"] == "extract":
+            handler = Pipeline.resolve_handler(step)
+
+            async def extract(pipeline: "Pipeline", step: dict, index: int):
+                return await handler.execute(step)
+
+            return extract
+        elif step["step"].startswith("custom"):
+            custom_method = config.PQL_CUSTOM_METHODS[step["step"]]
+
+            async def custom(pipeline: "Pipeline", step: dict, index: int):
+                return custom_method.execute(step, index, pipeline)
+
+            return custom
+
+        return {
+            "traverse": Pipeline.traverse,
+            "get_index": Pipeline.get_index,
+            "math": Pipeline.math,
+            "query.sql": Pipeline.query_sql,
+        }[step["step"]]
+
+    @staticmethod
+    def resolve_handler(step: dict) -> typing.Type[Handler]:
+        """Find the handler of an `extract` step.
 
         Args:
             step: `extract` step PQL json.
 
         Returns:
-            typing.Any: result of the extraction.
+            Type[Handler]: handler executing the step.
         """
         if step["method"].startswith("http"):
-            return await RestApiHandler.execute(step)
+            return RestApiHandler
         if step["method"].startswith("sql"):
-            return await SqlHandler.execute(step)
+            return SqlHandler
         if step["method"].startswith("eth"):
-            return await EthHandler.execute(step)
+            return EthHandler
+
+    @staticmethod
+    async def extract(step: dict) -> typing.Any:
+        """Parses `extract` step, finds the correct handler and executes the step.
+
+        Args:
+            step: `extract` step PQL json.
+
+        Returns:
+            typing.Any: result of the extraction.
+        """
+        return await Pipeline.resolve_handler(step).execute(step)
 
     async def traverse(self, step: dict, index: int) -> typing.Any:
         """Traverse the result from the previous step given the `method`.
@@ -0,0 +1,100 @@
+import copy
+import hashlib
+import json
+import typing
+
+from jsonschema import Draft7Validator
+
+from src.config import config
+from src.pql.exceptions import PqlValidationError
+from src.pql.pipeline import Pipeline
+from src.pql.schema import pql as pql_schema
+from src.utils.cache import MISSING, LRUCache
+
+# The schema does not change at runtime, so the validator is built once
+pql_validator = Draft7Validator(pql_schema)
+
+
+class Plan(typing.NamedTuple):
+    """Plan is a compiled PQL definition: validated once, with every step resolved to
+    the function executing it. Plans are shared between executions and never
+    modified.
+
+    Attributes:
+        key: cache key of the plan.
+        pql: a private copy of the validated PQL dict.
+        sources: for each source, a tuple of (function, step) pairs.
+    """
+
+    key: tuple
+    pql: dict
+    sources: typing.Tuple[typing.Tuple[tuple, ...], ...]
+
+
+plans = LRUCache(config.PQL_PLAN_CACHE_SIZE, name="pql_plan_cache")
+
+
+def pql_hash(pql: dict) -> str:
+    """Compute the canonical hash of the PQL definition, independent of key order and
+    whitespace.
+
+    Args:
+        pql (dict): PQL definition
+
+    Returns:
+        str: hex encoded SHA-256 hash
+    """
+    canonical = json.dumps(pql, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def validate_pql(pql: dict) -> dict:
+    """Validate the PQL dict adheres to the PQL schema.
+
+    Args:
+        pql (dict): the PQL dict to be validated
+
+    Returns:
+        dict: validated pql dict that conforms to schema
+
+    Raises:
+        PqlValidationError: the PQL definition does not adhere to the PQL schema.
+    """
+    errors = [error for error in pql_validator.iter_errors(pql)]
+    if errors:
+        raise PqlValidationError("\n".join([error.message for error in errors]))
+    return pql
+
+
+def compile_pql(pql: dict) -> Plan:
+    """Compile the PQL definition into a Plan, or get the cached one.
+
+    Plans are cached by the hash of the definition's content, never by a name supplied
+    with it (e.g. an IPFS hash whose content was not verified).
+
+    Args:
+        pql (dict): PQL definition
+
+    Returns:
+        Plan: compiled PQL definition
+
+    Raises:
+        PqlValidationError: the PQL definition does not adhere to the PQL schema.
+    """
+    key = ("sha256", pql_hash(pql))
+
+    plan = plans.get(key)
+    if plan is not MISSING:
+        return plan
+
+    pql = copy.deepcopy(validate_pql(pql))
+    plan = Plan(
+        key=key,
+        pql=pql,
+        sources=tuple(
+            Pipeline.resolve_steps(source["pipeline"]) for source in pql["sources"]
+        ),
+    )
+    plans.set(key, plan)
+
+    return plan
@@ -0,0 +1,81 @@
+import time
+import typing
+
+from src.config import config
+from src.utils.cache import MISSING, LRUCache
+from src.utils.metrics import metrics
+from src.utils.singleflight import SingleFlight
+
+
+class ResultCache:
+    """ResultCache serves recent results of PQL definitions within their freshness
+    window.
+
+    A result is fresh for `max_age` seconds, declared by the definition's `max_age`
+    field or globally by `PQL_RESULT_MAX_AGE`. Concurrent executions of a definition
+    without a fresh result are collapsed into one.
+
+    The following metrics are reported:
+        - `pql_result_cache.hits`: executions served by a fresh result
+        - `pql_result_cache.misses`: executions of definitions without a cached result
+        - `pql_result_cache.stale`: executions of definitions whose result expired
+    """
+
+    def __init__(self, maxsize: int = config.PQL_RESULT_CACHE_SIZE):
+        """Inits ResultCache.
+
+        Args:
+            maxsize (int): maximum number of cached results.
+        """
+        self._results = LRUCache(maxsize)
+        self._executions = SingleFlight(name="pql_result_cache")
+
+    async def get_or_execute(
+        self,
+        key: typing.Hashable,
+        max_age: float,
+        execute: typing.Callable[[], typing.Awaitable],
+    ) -> typing.Any:
+        """Get the result cached under `key` if it is fresh, otherwise execute it.
+
+        Args:
+            key (Hashable): cache key of the PQL definition
+            max_age (float): seconds for which a result is fresh
+            execute (Callable): function returning the awaitable executing the
+                definition
+
+        Returns:
+            Any: fresh result of the definition
+        """
+        cached = self._results.get(key)
+        if cached is MISSING:
+            metrics.inc("pql_result_cache.misses")
+        elif time.monotonic() - cached[0] > max_age:
+            metrics.inc("pql_result_cache.stale")
+        else:
+            metrics.inc("pql_result_cache.hits")
+            return cached[1]
+
+        return await self._executions.do(key, lambda: self._execute(key, execute))
+
+    async def _execute(
+        self, key: typing.Hashable, execute: typing.Callable[[], typing.Awaitable]
+    ) -> typing.Any:
+        """Execute the definition and cache its result.
+
+        Args:
+            key (Hashable): cache key of the PQL definition
+            execute (Callable): function returning the awaitable executing the
+                definition
+
+        Returns:
+            Any: result of the definition
+        """
+        # The freshness window starts when the data is fetched, not when it arrives
+        executed_at = time.monotonic()
+        result = await execute()
+        self._results.set(key, (executed_at, result))
+        return result
+
+
+result_cache = ResultCache()
@@ -149,6 +149,7 @@ pql = {
     "properties": {
         "name": {"type": "string"},
         "psql_version": {"type": "string"},
+        "max_age": {"type": "number", "minimum": 0},
         "sources": {"type": "array", "items": source},
         "aggregate": aggregate,
     },
@@ -1,5 +1,11 @@
 from celery import Celery
-from celery.signals import setup_logging
+from celery.signals import (
+    setup_logging,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 
 from src.config import config
 
@@ -24,6 +30,16 @@ processor.conf.update(
     },
 )
 
+if config.EXECUTOR_MODE == "asyncio":
+    # Every worker thread holds at most one unacknowledged request, so the broker
+    # stops delivering once every thread (`-c`) executes a request and requests of a
+    # crashed worker are redelivered
+    processor.conf.update(
+        worker_prefetch_multiplier=1,
+        task_acks_late=True,
+        task_reject_on_worker_lost=True,
+    )
+
 
 @setup_logging.connect
 def config_loggers(*args, **kwags):
@@ -32,3 +48,45 @@ def config_loggers(*args, **kwags):
     from src.logging import DEFAULT_LOGGING_CONFIG
 
     dictConfig(DEFAULT_LOGGING_CONFIG)
+
+
+@worker_init.connect
+def init_worker(*args, **kwargs):
+    """Warm the PQL definition cache when the worker starts, before prefork pool
+    processes are forked off so they inherit it."""
+    from src.utils.ipfs import ipfs_cache
+
+    ipfs_cache.warm_start()
+
+
+@worker_process_init.connect
+def init_worker_process(*args, **kwargs):
+    """Drop client sessions inherited from the parent process after fork and start
+    the process' event loop.
+
+    Only sent to prefork pool processes, the `threads` and `solo` pools start the
+    event loop when their first task runs on it."""
+    from src.process.runtime import runtime
+    from src.utils.http import session_manager
+    from src.utils.postgres import pool_registry
+
+    session_manager.reset()
+    pool_registry.reset()
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def shutdown_worker_process(*args, **kwargs):
+    """Stop the process' event loop and close pooled client sessions before the
+    worker process exits.
+
+    Connected to the shutdown of both prefork pool processes and the worker itself,
+    which runs the tasks of the `threads` and `solo` pools."""
+    from src.process.runtime import runtime
+    from src.utils.http import session_manager
+    from src.utils.postgres import pool_registry
+
+    runtime.stop()
+    session_manager.shutdown()
+    pool_registry.shutdown()
@@ -1,135 +1,757 @@
+import asyncio
+import functools
+import socket
+import threading
 import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
 
 from celery import Celery
 from celery.utils.log import get_task_logger
+from kombu import Exchange, Queue
 from sqlalchemy.orm import Session
 
+from src.config import config
+from src.models.collector import Collector
 from src.network.chain import Chain
 from src.network.chains import Chains
 from src.network.evm_chain import EvmChain
+from src.network.subscription import SubscriptionSignal
 from src.network.substrate_chain import SubstrateChain
 from src.process import processor
+from src.process.cursor import BlockCursor, get_engine
 from src.process.executor import (
     handle_evm_request_event,
     handle_substrate_request_event,
 )
+from src.utils.metrics import metrics
 
 logger = get_task_logger(__name__)
 
+# Chain updates sent by `manage_collector` to the collector service
+COLLECTOR_CONTROL_QUEUE = Queue(
+    "collector_control",
+    Exchange("collector_control", type="direct"),
+    routing_key="collector_control",
+)
+
+# Returned by `collector_heartbeat` when the registry could not be reached
+HEARTBEAT_FAILED = object()
+
 
-def manage_collector(processor: Celery, chain: Chain) -> None:
+async def manage_collector(processor: Celery, chain: Chain, session: Session) -> None:
     """Manage collector to reflect updated chain statuses.
 
+    With `COLLECTOR_MODE=service` the chain is sent to the collector service, which
+    restarts or stops its listener. The message is published on the loop's default
+    executor and retried at most three times if the broker is unreachable. Otherwise the listener task registered for the
+    chain in the collector registry is terminated, and a new one is queued and
+    registered if the chain is active.
+
     Args:
         processor (Celery): processor celery application
         chain (Chain): chain to reconcile
+        session (Session): sqlalchemy session
     """
-    for worker, tasks in processor.control.inspect().active().items():
-        for task in tasks:
-            if (
-                task["name"]
-                in [
-                    listen_for_evm_events.name,
-                    listen_for_substrate_events.name,
-                ]
-                and task["args"][0]["name"] == chain.name
-            ):
-                logger.info(
-                    f"[[bold]{chain.name}[/]][yellow]Terminate chain collector.[/]"
+    if config.COLLECTOR_MODE == "service":
+        logger.info(
+            f"[[bold]{chain.name}[/]] Sent chain to the [yellow]collector service[/]."
+        )
+
+        def publish():
+            with processor.connection_for_write() as connection:
+                connection.Producer().publish(
+                    {"type": chain.type, "chain": chain.to_dict()},
+                    exchange=COLLECTOR_CONTROL_QUEUE.exchange,
+                    routing_key=COLLECTOR_CONTROL_QUEUE.routing_key,
+                    declare=[COLLECTOR_CONTROL_QUEUE],
+                    serializer="json",
+                    retry=True,
+                    retry_policy={"max_retries": 3},
                 )
-                processor.control.terminate(task["id"])
 
+        await run_blocking(publish)
+        return
+
+    task_id = await Collector.get_task_id(session, chain.name)
+    if task_id is not None:
+        logger.info(f"[[bold]{chain.name}[/]][yellow]Terminate chain collector.[/]")
+        processor.control.terminate(task_id)
+
+    task_id = None
     if chain.active:
         if chain.type == "evm":
             logger.info(
                 f"[[bold]{chain.name}[/]] Queued [yellow]listening for EVM events[/] task."
             )
-            listen_for_evm_events.delay(chain.to_dict())
+            task_id = listen_for_evm_events.delay(chain.to_dict()).id
         elif chain.type == "substrate":
             logger.info(
                 f"[[bold]{chain.name}[/]] Queued [yellow]listening for Substrate events[/] task."
             )
-            listen_for_substrate_events.delay(chain.to_dict())
+            task_id = listen_for_substrate_events.delay(chain.to_dict()).id
+
+    await Collector.register(session, chain.name, task_id)
 
 
 async def start_collecting(processor: Celery, chains: Chains, session: Session) -> None:
     """Initiates collecting tasks for addresses specified in the `chains` object."""
     await chains.from_sql(session)
     for chain in chains.get_chains().values():
-        manage_collector(processor, chain)
+        await manage_collector(processor, chain, session)
 
 
-@processor.task
-def listen_for_evm_events(chain_payload: dict, poll_interval=2) -> None:
-    """listen_for_request_events takes the given contract
-    oracle addresses and
-    listens for any Request events.
+async def requeue_stale_collectors(
+    processor: Celery, chains: Chains, session: Session
+) -> None:
+    """Queue a new listener task for every active chain whose registered task sent no
+    heartbeat for `COLLECTOR_HEARTBEAT_TIMEOUT` seconds, e.g. because its worker died.
 
     Args:
-        chain_payload: chain payload containing chain information.
-        poll_interval: time between the checks.
+        processor (Celery): processor celery application
+        chains (Chains): chains served by the node
+        session (Session): sqlalchemy session
+    """
+    for name in await Collector.get_stale(session, config.COLLECTOR_HEARTBEAT_TIMEOUT):
+        chain = chains.get_chain(name)
+        if chain is not None and chain.active:
+            logger.warning(
+                f"[[bold]{name}[/]] Listener sent no heartbeat for "
+                f"{config.COLLECTOR_HEARTBEAT_TIMEOUT}s, queuing it again."
+            )
+            await manage_collector(processor, chain, session)
+
+
+async def supervise_collectors(
+    processor: Celery, chains: Chains, session_factory: typing.Callable[[], Session]
+) -> None:
+    """Requeue stale listener tasks every `COLLECTOR_HEARTBEAT_INTERVAL` seconds.
+
+    Every check runs in a new session, the supervisor runs concurrently with request
+    handlers and must not share their session.
+
+    Args:
+        processor (Celery): processor celery application
+        chains (Chains): chains served by the node
+        session_factory (Callable[[], Session]): sqlalchemy async session factory
     """
-    evm_chain = EvmChain(**chain_payload)
-    w3 = evm_chain.get_connection()
+    while True:
+        await asyncio.sleep(config.COLLECTOR_HEARTBEAT_INTERVAL)
+        try:
+            async with session_factory() as session:
+                await requeue_stale_collectors(processor, chains, session)
+        except Exception as e:
+            logger.warning(f"Failed to check collector heartbeats: {e}")
+
 
-    event_filters = []
-    for contract_address in evm_chain.tracked_contracts:
-        contract = w3.eth.contract(
-            abi=evm_chain.oracle_metadata, address=contract_address
+@processor.task(bind=True)
+def listen_for_evm_events(self, chain_payload: dict) -> None:
+    """Run `evm_listener` for the given chain until the task is terminated or
+    replaced.
+
+    Args:
+        chain_payload: chain payload containing chain information.
+    """
+    asyncio.run(
+        run_registered_listener(
+            chain_payload["name"],
+            self.request.id,
+            evm_listener(EvmChain(**chain_payload)),
         )
-        filt = contract.events.Request.createFilter(fromBlock="latest")
+    )
 
-        logger.info(
-            f"[[bold]{evm_chain.name}[/]] Creating filter {filt} for address {contract_address}."
+
+async def evm_listener(evm_chain: EvmChain) -> None:
+    """evm_listener takes the given contract oracle addresses and listens for any
+    Request events.
+
+    The listener resumes after the last block it processed, scanning the missed blocks
+    in `EVM_LOG_SCAN_MAX_BLOCKS` ranges until it reaches the head. Every new block
+    range is then scanned for Request events of all tracked contracts by a single
+    `eth_getLogs` request. With `EVM_LOGS_SUBSCRIBE` on a websocket chain, a
+    `logs` subscription signals the blocks containing Request events. While the
+    subscription is active, the blocks without them are only scanned every
+    `EVM_LOGS_SUBSCRIPTION_SCAN_INTERVAL` seconds, so events of a missed notification
+    are collected late but not lost.
+
+    Between scans the listener waits for the chain's head tracker to see a new block,
+    it polls at the chain's block cadence or follows a `newHeads` subscription.
+    Blocking requests run on the loop's default executor.
+
+    Args:
+        evm_chain: chain to listen to.
+    """
+    await run_blocking(evm_chain.get_connection)
+
+    logger.info(
+        f"[[bold]{evm_chain.name}[/]] Scanning Request events of {evm_chain.tracked_contracts}."
+    )
+
+    cursor = BlockCursor(evm_chain.name)
+    head_tracker = evm_chain.head_tracker
+    last_block = await run_blocking(cursor.load)
+    from_block = (
+        last_block + 1
+        if last_block is not None
+        else await run_blocking(head_tracker.get_block_number) + 1
+    )
+    logger.info(f"[[bold]{evm_chain.name}[/]] Resuming from block {from_block}.")
+
+    subscription = None
+    if config.EVM_LOGS_SUBSCRIBE and evm_chain.url.startswith("ws"):
+        subscription = SubscriptionSignal(
+            evm_chain.name,
+            evm_chain.url,
+            [
+                "logs",
+                {
+                    "address": evm_chain.tracked_contracts,
+                    "topics": [evm_chain.request_topic],
+                },
+            ],
         )
-        event_filters.append(filt)
 
-    while True:
-        for event_filter in event_filters:
-            for event in event_filter.get_new_entries():
-                logger.info(
-                    f"[[bold]{evm_chain.name}[/]] Request found: {event} with filter {event_filter}."
+    scanned_at = time.monotonic()
+    try:
+        while True:
+            head = await run_blocking(head_tracker.get_block_number)
+
+            # The notified block may be ahead of the head tracker, the scan covers it.
+            # The flag is cleared before the block is read, so a later notification
+            # sets it again and is not lost.
+            to_block = head
+            notified = subscription is not None and subscription.notified.is_set()
+            if notified:
+                subscription.notified.clear()
+                to_block = max(head, subscription.notified_block or head)
+
+            # Skipped blocks stay in the range, so a notification arriving after the
+            # head moved on still gets its block scanned
+            if to_block >= from_block and (
+                subscription is None
+                or not subscription.active.is_set()
+                or notified
+                or to_block - from_block + 1 >= config.EVM_LOG_SCAN_MAX_BLOCKS
+                or time.monotonic() - scanned_at
+                >= config.EVM_LOGS_SUBSCRIPTION_SCAN_INTERVAL
+            ):
+                await run_scan(
+                    collect_evm_request_events, evm_chain, from_block, to_block, cursor
                 )
+                from_block = to_block + 1
+                scanned_at = time.monotonic()
 
-                handle_evm_request_event.delay(evm_chain, event)
+            await head_tracker.wait_for_block_async(
+                head + 1, timeout=config.HEAD_TRACKER_SUBSCRIPTION_TIMEOUT
+            )
+    finally:
+        if subscription is not None:
+            subscription.stop()
 
-        time.sleep(poll_interval)
 
+def collect_evm_request_events(
+    evm_chain: EvmChain,
+    from_block: int,
+    to_block: int,
+    cursor: BlockCursor,
+    stopped: typing.Optional[threading.Event] = None,
+) -> None:
+    """Dispatch the Request events emitted between `from_block` and `to_block`
+    (inclusive), scanning at most `EVM_LOG_SCAN_MAX_BLOCKS` blocks per request.
 
-@processor.task
-def listen_for_substrate_events(chain_payload: dict, poll_interval=2) -> None:
-    """listen_for_substrate_events takes the given substrate chain with `tracked_contracts`
-    addresses and watches for any `Request` events on the chain.
+    The cursor advances after the events of each range are dispatched. The delay
+    between the last Request event of a range and its dispatch is reported as
+    `collector.<chain>.detection_delay` seconds.
 
     Args:
-        chain_payload: chain payload containing chain information.
-        poll_interval: time between the checks.
+        evm_chain: chain to scan.
+        from_block: first block to scan.
+        to_block: last block to scan.
+        cursor: block cursor of the chain's listener.
+        stopped: the scan returns before the next range once it is set.
     """
-    substrate_chain = SubstrateChain(**chain_payload)
-    substrate = substrate_chain.get_connection()
+    for start in range(from_block, to_block + 1, config.EVM_LOG_SCAN_MAX_BLOCKS):
+        if stopped is not None and stopped.is_set():
+            return
+
+        end = min(start + config.EVM_LOG_SCAN_MAX_BLOCKS - 1, to_block)
+        events = evm_chain.get_request_events(start, end)
+        for event in events:
+            logger.info(
+                f"[[bold]{evm_chain.name}[/]] Request found: {event} in block {event['blockNumber']}."
+            )
+            handle_evm_request_event.delay(evm_chain, event)
+
+        if events:
+            report_detection_delay(evm_chain, events[-1]["blockNumber"])
+
+        cursor.advance(end, to_block)
+
+
+def report_detection_delay(evm_chain: EvmChain, block_number: int) -> None:
+    """Report the seconds between the timestamp of block `block_number` and now as
+    `collector.<chain>.detection_delay`.
+
+    Args:
+        evm_chain: scanned chain.
+        block_number: block containing the last dispatched Request event.
+    """
+    try:
+        block = evm_chain.get_connection().eth.getBlock(block_number)
+        metrics.set(
+            f"collector.{evm_chain.name}.detection_delay",
+            max(0.0, time.time() - block["timestamp"]),
+        )
+    except Exception as e:
+        logger.debug(
+            f"[[bold]{evm_chain.name}[/]] Failed to report detection delay: {e}"
+        )
+
+
+@processor.task(bind=True)
+def listen_for_substrate_events(self, chain_payload: dict) -> None:
+    """Run `substrate_listener` for the given chain until the task is terminated or
+    replaced.
 
-    finalised_block_nr = substrate.get_block_number(
-        substrate.get_chain_finalised_head()
+    Args:
+        chain_payload: chain payload containing chain information.
+    """
+    asyncio.run(
+        run_registered_listener(
+            chain_payload["name"],
+            self.request.id,
+            substrate_listener(SubstrateChain(**chain_payload)),
+        )
     )
 
-    # Iterate over every block
+
+async def substrate_listener(substrate_chain: SubstrateChain) -> None:
+    """substrate_listener takes the given substrate chain with `tracked_contracts`
+    addresses and watches for any `Request` events on the chain.
+
+    The listener resumes after the last block it processed and walks every finalised
+    block until it reaches the finalised head. While it is more than
+    `SUBSTRATE_CATCH_UP_THRESHOLD` blocks behind, blocks are scanned concurrently.
+    New finalised blocks are processed as soon as the chain's head tracker sees them.
+    Blocking requests run on the loop's default executor.
+
+    Args:
+        substrate_chain: chain to listen to.
+    """
+    await run_blocking(substrate_chain.get_connection)
+    head_tracker = substrate_chain.head_tracker
+
+    finalised_head = await run_blocking(head_tracker.refresh)
+
+    cursor = BlockCursor(substrate_chain.name)
+    last_block = await run_blocking(cursor.load)
+    block_nr = last_block + 1 if last_block is not None else finalised_head
+    logger.info(f"[[bold]{substrate_chain.name}[/]] Resuming from block {block_nr}.")
+
+    # Iterate over every finalised block
     while True:
-        block_hash = substrate.get_block_hash(finalised_block_nr)
+        # Once the listener reaches the finalised head, wait for it to move on
+        if block_nr > finalised_head:
+            finalised_head = (
+                await head_tracker.wait_for_block_async(
+                    block_nr, timeout=config.HEAD_TRACKER_SUBSCRIPTION_TIMEOUT
+                )
+                or finalised_head
+            )
+            continue
 
-        # If the block exists, check for any events, otherwise go back to sleep
-        if block_hash:
-            events = substrate_chain.get_block_events(block_hash)
+        await run_scan(
+            collect_substrate_request_events,
+            substrate_chain,
+            block_nr,
+            finalised_head,
+            cursor,
+        )
+        block_nr = finalised_head + 1
+
+
+def collect_substrate_request_events(
+    substrate_chain: SubstrateChain,
+    from_block: int,
+    to_block: int,
+    cursor: BlockCursor,
+    stopped: typing.Optional[threading.Event] = None,
+) -> None:
+    """Dispatch the Request events emitted between `from_block` and `to_block`
+    (inclusive) in block order.
+
+    While more than `SUBSTRATE_CATCH_UP_THRESHOLD` blocks are left, ranges of
+    `SUBSTRATE_CATCH_UP_BATCH` blocks are fetched and decoded concurrently, the last
+    blocks are scanned one by one. The cursor advances after each block.
+
+    Args:
+        substrate_chain: chain to scan.
+        from_block: first block to scan.
+        to_block: last block to scan.
+        cursor: block cursor of the chain's listener.
+        stopped: the scan returns before the next block once it is set.
+    """
+    if to_block - from_block >= config.SUBSTRATE_CATCH_UP_THRESHOLD:
+        logger.info(
+            f"[[bold]{substrate_chain.name}[/]] Catching up {to_block - from_block + 1} blocks."
+        )
+
+    block_nr = from_block
+    while block_nr <= to_block:
+        if to_block - block_nr >= config.SUBSTRATE_CATCH_UP_THRESHOLD:
+            end = min(block_nr + config.SUBSTRATE_CATCH_UP_BATCH - 1, to_block)
+            blocks = substrate_chain.get_blocks_events(block_nr, end)
+        else:
+            end = block_nr
+            block_hash = substrate_chain.get_connection().get_block_hash(block_nr)
+            blocks = [(block_nr, substrate_chain.get_block_events(block_hash))]
+
+        for number, events in blocks:
+            if stopped is not None and stopped.is_set():
+                return
 
             for event, decoded_event in events:
                 logger.info(
-                    f"[[bold]{substrate_chain.name}[/]] Found event {event} | {decoded_event}, block_nr {finalised_block_nr}, "
+                    f"[[bold]{substrate_chain.name}[/]] Found event {event} | {decoded_event}, block_nr {number}, "
                 )
                 handle_substrate_request_event.delay(
                     substrate_chain,
                     decoded_event,
-                    {"params": event.params},
+                    {"params": event.params, "block_number": number},
                 )
 
-            finalised_block_nr += 1
-        else:
-            time.sleep(poll_interval)
+            cursor.advance(number, to_block)
+
+        block_nr = end + 1
+
+
+async def run_blocking(fn: typing.Callable, *args) -> typing.Any:
+    """Run the blocking `fn` (e.g. a chain request) on the loop's default executor.
+
+    Args:
+        fn (Callable): blocking function to call
+        args: positional arguments of `fn`
+
+    Returns:
+        typing.Any: return value of `fn`
+    """
+    return await asyncio.get_event_loop().run_in_executor(
+        None, functools.partial(fn, *args)
+    )
+
+
+async def run_scan(fn: typing.Callable, *args) -> None:
+    """Run the blocking scan `fn` on the loop's default executor.
+
+    `fn` receives a `stopped` event as its last argument. If the calling listener is
+    cancelled, the event is set and the cancellation waits for the scan to return, so
+    a stopped listener does not keep dispatching events or moving its cursor while a
+    new listener of the chain runs.
+
+    Args:
+        fn (Callable): blocking scan to call
+        args: positional arguments of `fn`, before the stop event
+    """
+    stopped = threading.Event()
+    scan = asyncio.ensure_future(run_blocking(fn, *args, stopped))
+    try:
+        await asyncio.shield(scan)
+    except asyncio.CancelledError:
+        stopped.set()
+        await asyncio.gather(scan, return_exceptions=True)
+        raise
+
+
+async def run_registered_listener(
+    chain: str, task_id: str, listener: typing.Awaitable
+) -> None:
+    """Run `listener` while recording heartbeats of its task in the collector
+    registry every `COLLECTOR_HEARTBEAT_INTERVAL` seconds.
+
+    The listener is stopped once another task, or no task, is registered for the
+    chain, so a listener whose termination was missed does not keep collecting events.
+    It keeps running while the registry cannot be reached.
+
+    Args:
+        chain (str): name of the chain
+        task_id (str): ID of the listener task
+        listener (Awaitable): listener coroutine
+    """
+    listener = asyncio.ensure_future(listener)
+    try:
+        while True:
+            done, _ = await asyncio.wait(
+                [listener], timeout=config.COLLECTOR_HEARTBEAT_INTERVAL
+            )
+            if done:
+                # Raises the exception of a failed listener
+                listener.result()
+                return
+
+            registered_task_id = await run_blocking(collector_heartbeat, chain, task_id)
+            if registered_task_id is HEARTBEAT_FAILED:
+                continue
+            if registered_task_id is None:
+                logger.info(f"[[bold]{chain}[/]] Listener no longer registered.")
+                return
+            if registered_task_id != task_id:
+                logger.info(
+                    f"[[bold]{chain}[/]] Listener replaced by task {registered_task_id}."
+                )
+                return
+    finally:
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+
+
+def collector_heartbeat(chain: str, task_id: str) -> typing.Any:
+    """Record a heartbeat of the listener task `task_id` of `chain`.
+
+    Args:
+        chain (str): name of the chain
+        task_id (str): ID of the listener task
+
+    Returns:
+        Any: ID of the task registered for `chain`, None if no task is registered,
+        `HEARTBEAT_FAILED` if the database is disabled or could not be reached
+    """
+    if not config.ENABLE_DATABASE:
+        return HEARTBEAT_FAILED
+
+    try:
+        with Session(get_engine()) as session:
+            return Collector.heartbeat(session, chain, task_id)
+    except Exception as e:
+        logger.warning(f"[[bold]{chain}[/]] Failed to record collector heartbeat: {e}")
+        return HEARTBEAT_FAILED
+
+
+CHAIN_TYPES = {"evm": EvmChain, "substrate": SubstrateChain}
+LISTENERS = {"evm": evm_listener, "substrate": substrate_listener}
+
+
+class CollectorService:
+    """CollectorService runs the listeners of all chains as coroutines of a single
+    process, instead of occupying a Celery worker per chain (`COLLECTOR_MODE=service`).
+
+    Blocking chain requests of all listeners share a pool of `max_threads` threads,
+    listeners waiting for new blocks do not hold a thread. Chains are loaded from the
+    chain configuration and the database on start, later updates arrive from
+    `manage_collector` through the `collector_control` queue. A listener that fails is
+    restarted after `COLLECTOR_RESTART_DELAY` seconds. The listener of an updated
+    chain starts once the scan of its previous listener has stopped, and it gets a new
+    chain object unless only the tracked contracts changed.
+
+    The following metrics are reported:
+        - `collector.listeners`: number of running chain listeners
+    """
+
+    def __init__(
+        self, processor: Celery, max_threads: int = config.COLLECTOR_MAX_THREADS
+    ):
+        """Inits CollectorService.
+
+        Args:
+            processor (Celery): processor celery application, its broker carries the
+                control messages.
+            max_threads (int): number of threads running blocking chain requests.
+        """
+        self.processor = processor
+        self.max_threads = max_threads
+        self.loop: typing.Optional[asyncio.AbstractEventLoop] = None
+
+        self._chains: typing.Dict[str, Chain] = {}
+        self._payloads: typing.Dict[str, dict] = {}
+        self._listeners: typing.Dict[str, asyncio.Task] = {}
+        self._done: typing.Optional[asyncio.Event] = None
+        self._stopped = threading.Event()
+
+    async def run(self, chains: Chains) -> None:
+        """Start the listeners of `chains` and follow chain updates until stopped.
+
+        Args:
+            chains (Chains): chains of the node configuration.
+        """
+        self.loop = asyncio.get_event_loop()
+        self.loop.set_default_executor(
+            ThreadPoolExecutor(
+                max_workers=self.max_threads, thread_name_prefix="collector"
+            )
+        )
+        self._done = asyncio.Event()
+        self._stopped.clear()
+
+        if config.ENABLE_DATABASE:
+            from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+            engine = create_async_engine(config.DATABASE_URL)
+            try:
+                async with AsyncSession(engine) as session:
+                    await chains.from_sql(session)
+            finally:
+                await engine.dispose()
+
+        for chain in chains.get_chains().values():
+            self.reconcile(chain)
+
+        threading.Thread(
+            target=self._consume_control, name="collector-control", daemon=True
+        ).start()
+
+        try:
+            await self._done.wait()
+        finally:
+            self._stopped.set()
+            listeners = list(self._listeners.values())
+            for name in list(self._listeners):
+                self.stop_listener(name)
+            await asyncio.gather(*listeners, return_exceptions=True)
+
+    def stop(self) -> None:
+        """Stop the service, may be called from any thread."""
+        if self.loop is not None and self._done is not None:
+            self.loop.call_soon_threadsafe(self._done.set)
+
+    def reconcile(self, chain: Chain) -> None:
+        """Start, restart or stop the listener of `chain` to reflect its status.
+
+        Args:
+            chain (Chain): updated chain
+        """
+        payload = chain.to_dict()
+        previous_payload = self._payloads.get(chain.name)
+        if (
+            chain.active
+            and chain.name in self._listeners
+            and previous_payload == payload
+        ):
+            return
+
+        previous_listener = self.stop_listener(chain.name)
+        if not chain.active:
+            self._chains.pop(chain.name, None)
+            self._payloads.pop(chain.name, None)
+            return
+
+        known = self._chains.get(chain.name)
+        if (
+            known is not None
+            and previous_payload is not None
+            and known.type == chain.type
+            and self._settings(previous_payload) == self._settings(payload)
+        ):
+            # Only the contracts changed, keep the connections and head tracker
+            known.tracked_contracts = chain.tracked_contracts
+            chain = known
+
+        logger.info(
+            f"[[bold]{chain.name}[/]] Started [yellow]listening for events[/] in the "
+            f"collector service."
+        )
+        self._chains[chain.name] = chain
+        self._payloads[chain.name] = payload
+        self._listeners[chain.name] = self.loop.create_task(
+            self._run_listener(chain, LISTENERS[chain.type], previous_listener)
+        )
+        metrics.set("collector.listeners", len(self._listeners))
+
+    def stop_listener(self, name: str) -> typing.Optional[asyncio.Task]:
+        """Cancel the listener of chain `name` if it is running.
+
+        Args:
+            name (str): chain name
+
+        Returns:
+            Optional[asyncio.Task]: cancelled listener task, it finishes once its
+            running scan has stopped
+        """
+        listener = self._listeners.pop(name, None)
+        if listener is not None:
+            logger.info(f"[[bold]{name}[/]][yellow]Terminate chain collector.[/]")
+            listener.cancel()
+            metrics.set("collector.listeners", len(self._listeners))
+
+        return listener
+
+    async def _run_listener(
+        self,
+        chain: Chain,
+        listener: typing.Callable[[Chain], typing.Awaitable],
+        previous_listener: typing.Optional[asyncio.Task] = None,
+    ) -> None:
+        """Run `listener` for `chain`, restarting it when it fails.
+
+        Args:
+            chain (Chain): chain to listen to
+            listener (Callable): listener coroutine function
+            previous_listener (Optional[asyncio.Task]): cancelled listener of the
+                chain, the new listener starts once it has finished
+        """
+        if previous_listener is not None:
+            await asyncio.gather(previous_listener, return_exceptions=True)
+
+        while True:
+            try:
+                await listener(chain)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"[[bold]{chain.name}[/]] Listener failed ({e}), restarting in "
+                    f"{config.COLLECTOR_RESTART_DELAY}s."
+                )
+                await asyncio.sleep(config.COLLECTOR_RESTART_DELAY)
+
+    @staticmethod
+    def _settings(payload: typing.Optional[dict]) -> typing.Optional[dict]:
+        """Chain payload without the tracked contracts and status, which a running
+        chain object can take over.
+
+        Args:
+            payload (Optional[dict]): chain payload
+
+        Returns:
+            Optional[dict]: payload without `tracked_contracts` and `active`
+        """
+        if payload is None:
+            return None
+
+        return {
+            key: value
+            for key, value in payload.items()
+            if key not in ("tracked_contracts", "active")
+        }
+
+    def _consume_control(self) -> None:
+        """Receive chain updates sent by `manage_collector`, reconnecting to the
+        broker until the service is stopped."""
+        while not self._stopped.is_set():
+            try:
+                with self.processor.connection_for_read() as connection:
+                    with connection.Consumer(
+                        COLLECTOR_CONTROL_QUEUE,
+                        callbacks=[self._on_control_message],
+                        accept=["json"],
+                    ):
+                        while not self._stopped.is_set():
+                            try:
+                                connection.drain_events(timeout=1)
+                            except socket.timeout:
+                                pass
+            except Exception as e:
+                logger.warning(f"Collector control queue unavailable ({e}).")
+                self._stopped.wait(config.COLLECTOR_RESTART_DELAY)
+
+    def _on_control_message(self, body: dict, message) -> None:
+        """Reconcile the chain of a control message on the service loop.
+
+        Args:
+            body (dict): {"type": chain type, "chain": chain payload}
+            message (kombu.Message): received message
+        """
+        try:
+            chain = CHAIN_TYPES[body["type"]](**body["chain"])
+            self.loop.call_soon_threadsafe(self.reconcile, chain)
+        except Exception as e:
+            logger.warning(f"Invalid collector control message {body}: {e}")
+        message.ack()
@@ -0,0 +1,112 @@
+import logging
+import os
+import time
+import typing
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.config import config
+from src.models.chain_cursor import ChainCursor
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_engine = None
+_engine_pid: typing.Optional[int] = None
+
+
+def get_engine():
+    """Get the synchronous database engine of this process.
+
+    Listeners run in Celery worker processes outside of an event loop, so they use a
+    psycopg2 engine instead of the server's async engine. Engines do not survive a
+    fork, a new one is created in the child process.
+
+    Returns:
+        Engine: sqlalchemy engine
+    """
+    global _engine, _engine_pid
+
+    if _engine is None or _engine_pid != os.getpid():
+        _engine = create_engine(config.DATABASE_URL, pool_pre_ping=True, pool_size=2)
+        _engine_pid = os.getpid()
+
+    return _engine
+
+
+class BlockCursor:
+    """BlockCursor keeps the last block processed by a chain listener in the
+    database, so the listener resumes where it stopped after a restart.
+
+    Writes are throttled to one per `save_interval` seconds, a restart may therefore
+    process the last few blocks again. Without a database the cursor only lives in
+    memory.
+
+    The following metrics are reported:
+        - `collector.<chain>.cursor`: last processed block
+        - `collector.<chain>.lag`: blocks between the cursor and the chain head
+    """
+
+    def __init__(
+        self, chain: str, save_interval: float = config.COLLECTOR_CURSOR_SAVE_INTERVAL
+    ):
+        """Inits BlockCursor.
+
+        Args:
+            chain (str): name of the chain.
+            save_interval (float): minimum number of seconds between two writes.
+        """
+        self.chain = chain
+        self.save_interval = save_interval
+
+        self.block_number: typing.Optional[int] = None
+        self._saved_block_number: typing.Optional[int] = None
+        self._saved_at = 0.0
+
+    def load(self) -> typing.Optional[int]:
+        """Load the last processed block from the database.
+
+        Returns:
+            Optional[int]: last processed block, None if it is not known
+        """
+        if config.ENABLE_DATABASE:
+            try:
+                with Session(get_engine()) as session:
+                    self.block_number = ChainCursor.get_block_number(
+                        session, self.chain
+                    )
+                    self._saved_block_number = self.block_number
+            except Exception as e:
+                logger.warning(
+                    f"[[bold]{self.chain}[/]] Failed to load block cursor: {e}"
+                )
+
+        return self.block_number
+
+    def advance(self, block_number: int, head: int) -> None:
+        """Mark the blocks up to `block_number` as processed.
+
+        Args:
+            block_number (int): last processed block
+            head (int): latest block of the chain
+        """
+        self.block_number = block_number
+        metrics.set(f"collector.{self.chain}.cursor", block_number)
+        metrics.set(f"collector.{self.chain}.lag", max(0, head - block_number))
+
+        if time.monotonic() - self._saved_at >= self.save_interval:
+            self.save()
+
+    def save(self) -> None:
+        """Write the cursor to the database if it moved since the last write."""
+        if not config.ENABLE_DATABASE or self.block_number == self._saved_block_number:
+            return
+
+        self._saved_at = time.monotonic()
+        try:
+            with Session(get_engine()) as session:
+                ChainCursor.set_block_number(session, self.chain, self.block_number)
+            self._saved_block_number = self.block_number
+        except Exception as e:
+            logger.warning(f"[[bold]{self.chain}[/]] Failed to save block cursor: {e}")
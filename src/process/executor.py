@@ -1,20 +1,47 @@
-import asyncio
+import typing
 from datetime import datetime
 
-import ipfshttpclient
 from celery.utils.log import get_task_logger
 
-from src.config import config
 from src.network import chains
 from src.network.evm_chain import EvmChain
 from src.network.substrate_chain import SubstrateChain
 from src.pql.parser import parse_and_execute
-from src.utils.ipfs import bytes32_to_ipfs
+from src.utils.ipfs import bytes32_to_ipfs, ipfs_cache
+from src.utils.singleflight import SingleFlight
 
 from . import processor
+from .runtime import runtime
 
 logger = get_task_logger(__name__)
 
+# Identical requests in flight share one execution, `pql_executions.shared` counts
+# the executions saved
+executions = SingleFlight(name="pql_executions")
+
+
+async def execute_pql(req: dict, ipfs_hash: str, block_context: tuple) -> typing.Any:
+    """Execute PQL definition `req`, or join the execution of an identical request.
+
+    Requests for the same PQL definition emitted in the same block resolve to the same
+    result, so while one of them is executing the others await its result.
+
+    Args:
+        req (dict): PQL definition
+        ipfs_hash (str): IPFS hash of the PQL definition
+        block_context (tuple): (chain name, block number) the request was emitted in
+
+    Returns:
+        typing.Any: executed result
+    """
+    # Requests queued before the block number was recorded are not deduplicated
+    if None in block_context:
+        return await parse_and_execute(req)
+
+    return await executions.do(
+        (ipfs_hash, block_context), lambda: parse_and_execute(req)
+    )
+
 
 @processor.task(bind=True)
 def handle_evm_request_event(self, evm_chain: EvmChain, event: dict) -> None:
@@ -28,18 +55,21 @@ def handle_evm_request_event(self, evm_chain: EvmChain, event: dict) -> None:
         evm_chain: EvmChain to write the response to
         event: Solidity Request event
     """
+    # Use the process-wide chain instance so its connection is reused across tasks
+    evm_chain = chains.evm.get(evm_chain.name, evm_chain)
     args = event["args"]
 
     ipfs_hash = bytes32_to_ipfs(args["ipfsHash"])
     expiration = datetime.fromtimestamp(args["expiration"])
 
     try:
-        ipfs = ipfshttpclient.connect(config.IPFS_API_SERVER_ADDRESS)
-        req = ipfs.get_json(ipfs_hash, timeout=3)
+        req = ipfs_cache.get_json(ipfs_hash, timeout=3)
 
         logger.debug(f"[[bold]{evm_chain.name}[/]] Obtained PQL definition {req}.")
 
-        res = asyncio.run(parse_and_execute(req))
+        res = runtime.run(
+            execute_pql(req, ipfs_hash, (evm_chain.name, event["blockNumber"]))
+        )
         logger.info(
             f"[[bold]{evm_chain.name}[/]] Obtained result {res} for {ipfs_hash}."
         )
@@ -72,7 +102,7 @@ def handle_substrate_request_event(
         substrate_chain (SubstrateChain): SubstrateChain to write the response to
         decoded_event (dict): decoded SCALE Request event
         params (dict): params of the Request event not provided by the
-                       decoded_event, such as external data.
+                       decoded_event, such as external data and the block number.
     """
     substrate = substrate_chain.get_connection()
 
@@ -85,14 +115,17 @@ def handle_substrate_request_event(
 
     # Execute IPFS response
     try:
-        ipfs = ipfshttpclient.connect(config.IPFS_API_SERVER_ADDRESS)
-        req = ipfs.get_json(ipfs_hash, timeout=3)
+        req = ipfs_cache.get_json(ipfs_hash, timeout=3)
 
         logger.debug(
             f"[[bold]{substrate_chain.name}[/]] Obtained PQL definition {req}."
         )
 
-        res = asyncio.run(parse_and_execute(req))
+        res = runtime.run(
+            execute_pql(
+                req, ipfs_hash, (substrate_chain.name, params.get("block_number"))
+            )
+        )
         logger.info(
             f"[[bold]{substrate_chain.name}[/]] Obtained result {res} for {ipfs_hash}."
         )
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import os
+import threading
+import typing
+
+from src.utils.http import session_manager
+from src.utils.metrics import metrics
+from src.utils.postgres import pool_registry
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerRuntime:
+    """WorkerRuntime runs a long-lived event loop in a background thread of a Celery
+    worker process.
+
+    Tasks submit their coroutines to the runtime instead of starting a new loop with
+    `asyncio.run`, so loop-bound clients (the pooled HTTP session and the PQL database
+    pools) outlive a single task and are reused by every task of the process.
+
+    Coroutines may be submitted from many threads at once (`EXECUTOR_MODE=asyncio`),
+    every worker thread waits for its coroutine, so the worker concurrency (`-c`)
+    bounds the number of running coroutines.
+
+    The following metrics are reported:
+        - `worker_runtime.in_flight`: number of running coroutines
+    """
+
+    def __init__(self):
+        """Inits WorkerRuntime."""
+        self.loop: typing.Optional[asyncio.AbstractEventLoop] = None
+
+        self._in_flight = 0
+        self._thread: typing.Optional[threading.Thread] = None
+        self._pid: typing.Optional[int] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the event loop thread if it is not running in this process."""
+        with self._lock:
+            if self._is_running():
+                return
+
+            # Threads do not survive a fork, start a new loop in the child process
+            self.loop = asyncio.new_event_loop()
+            self._in_flight = 0
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, args=(self.loop,), name="worker-runtime", daemon=True
+            )
+            self._thread.start()
+
+        logger.debug(f"Started worker runtime in process {self._pid}.")
+
+    def run(self, coro: typing.Awaitable, timeout: typing.Optional[float] = None):
+        """Run `coro` on the runtime loop and wait for its result.
+
+        The runtime is started on first use, e.g. when tasks run eagerly.
+
+        Args:
+            coro (Awaitable): coroutine to run
+            timeout (Optional[float]): seconds to wait for the result
+
+        Returns:
+            Any: result of the coroutine
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(self._track(coro), self.loop)
+        return future.result(timeout)
+
+    def stop(self, timeout: float = 10) -> None:
+        """Close the clients bound to the runtime loop and stop it.
+
+        Args:
+            timeout (float): seconds to wait for the clients to close
+        """
+        with self._lock:
+            if not self._is_running():
+                return
+
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self._close_clients(), self.loop
+                ).result(timeout)
+            except Exception as e:
+                logger.warning(f"Failed to close worker runtime clients: {e}")
+
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _is_running(self) -> bool:
+        """Check whether the loop thread is running in this process."""
+        return (
+            self._thread is not None
+            and self._thread.is_alive()
+            and self._pid == os.getpid()
+        )
+
+    async def _track(self, coro: typing.Awaitable) -> typing.Any:
+        """Run `coro` and report the number of running coroutines.
+
+        Args:
+            coro (Awaitable): coroutine to run
+
+        Returns:
+            Any: result of the coroutine
+        """
+        self._in_flight += 1
+        metrics.set("worker_runtime.in_flight", self._in_flight)
+        try:
+            return await coro
+        finally:
+            self._in_flight -= 1
+            metrics.set("worker_runtime.in_flight", self._in_flight)
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop) -> None:
+        """Run `loop` until it is stopped, then close it."""
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    @staticmethod
+    async def _close_clients() -> None:
+        """Close the HTTP session and database pools bound to the runtime loop."""
+        await session_manager.close()
+        await pool_registry.close()
+
+
+runtime = WorkerRuntime()
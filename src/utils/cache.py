@@ -0,0 +1,108 @@
+import threading
+import typing
+from collections import OrderedDict
+
+from src.utils.metrics import metrics
+
+# Sentinel returned by `LRUCache.get` for missing keys when no default is given
+MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe, size-bounded cache evicting the least recently used entries.
+
+    If the cache is given a `name`, the following metrics are reported:
+        - `<name>.hits`: lookups served from the cache
+        - `<name>.misses`: lookups of missing keys
+        - `<name>.hit_rate`: share of lookups served from the cache
+        - `<name>.evictions`: entries dropped to respect `maxsize`
+        - `<name>.size`: number of entries in the cache
+    """
+
+    def __init__(self, maxsize: int, name: typing.Optional[str] = None):
+        """Inits LRUCache.
+
+        Args:
+            maxsize (int): maximum number of entries.
+            name (Optional[str]): metrics prefix, metrics are not reported if omitted.
+        """
+        self.maxsize = maxsize
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._data: OrderedDict = OrderedDict()
+        self._hits = 0
+        self._lookups = 0
+
+    def get(self, key: typing.Hashable, default: typing.Any = MISSING) -> typing.Any:
+        """Get the value stored under `key` and mark it as recently used.
+
+        Args:
+            key (Hashable): cache key
+            default (Any): value returned if `key` is not cached
+
+        Returns:
+            Any: cached value or `default`
+        """
+        with self._lock:
+            self._lookups += 1
+            if key in self._data:
+                self._hits += 1
+                self._data.move_to_end(key)
+                self._report("hits")
+                return self._data[key]
+
+            self._report("misses")
+            return default
+
+    def set(self, key: typing.Hashable, value: typing.Any) -> None:
+        """Store `value` under `key`, evicting the least recently used entry if the
+        cache is full.
+
+        Args:
+            key (Hashable): cache key
+            value (Any): value to cache
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._report("evictions")
+
+            if self.name:
+                metrics.set(f"{self.name}.size", len(self._data))
+
+    def pop(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        """Remove `key` from the cache.
+
+        Args:
+            key (Hashable): cache key
+            default (Any): value returned if `key` is not cached
+
+        Returns:
+            Any: removed value or `default`
+        """
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def _report(self, event: str) -> None:
+        """Increase the `event` counter if the cache is named."""
+        if self.name:
+            metrics.inc(f"{self.name}.{event}")
+            if event in ("hits", "misses"):
+                metrics.set(f"{self.name}.hit_rate", self._hits / self._lookups)
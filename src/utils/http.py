@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import typing
+
+import aiohttp
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class HttpSessionManager:
+    """HttpSessionManager holds a process-wide pooled `aiohttp.ClientSession`.
+
+    aiohttp sessions are bound to the event loop they were created on, so one session
+    is kept per running loop. The Sanic server and a long-lived worker loop therefore
+    reuse a single session (keep-alive connections and cached DNS lookups), while
+    sessions left behind by closed loops are discarded.
+    """
+
+    def __init__(
+        self,
+        limit: int = config.HTTP_POOL_LIMIT,
+        limit_per_host: int = config.HTTP_POOL_LIMIT_PER_HOST,
+        dns_cache_ttl: int = config.HTTP_DNS_CACHE_TTL,
+        keepalive_timeout: float = config.HTTP_KEEPALIVE_TIMEOUT,
+        request_timeout: float = config.HTTP_REQUEST_TIMEOUT,
+    ):
+        """Inits HttpSessionManager.
+
+        Args:
+            limit (int): total number of simultaneous connections.
+            limit_per_host (int): number of simultaneous connections to a single host.
+            dns_cache_ttl (int): seconds for which resolved addresses are cached.
+            keepalive_timeout (float): seconds an idle connection is kept open.
+            request_timeout (float): total timeout of a single request in seconds.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+
+        self._sessions: typing.Dict[
+            asyncio.AbstractEventLoop, aiohttp.ClientSession
+        ] = {}
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session for the running event loop, creating it if needed.
+
+        Returns:
+            aiohttp.ClientSession: shared client session.
+        """
+        loop = asyncio.get_event_loop()
+        self._discard_stale_sessions()
+
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            # PQL definitions share the session, cookies set for one must not be
+            # sent with the requests of another
+            session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.DummyCookieJar(),
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+            self._sessions[loop] = session
+            logger.debug(f"Created pooled HTTP session for loop {id(loop)}.")
+
+        return session
+
+    async def start(self) -> None:
+        """Eagerly create the session for the running loop."""
+        self.get_session()
+
+    async def close(self) -> None:
+        """Close the session bound to the running loop."""
+        session = self._sessions.pop(asyncio.get_event_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def shutdown(self) -> None:
+        """Close every session whose event loop is still usable.
+
+        Called from synchronous contexts, e.g. when a Celery worker process exits.
+        """
+        self._discard_stale_sessions()
+        for loop, session in list(self._sessions.items()):
+            if not loop.is_running() and not session.closed:
+                loop.run_until_complete(session.close())
+        self._sessions = {}
+
+    def reset(self) -> None:
+        """Forget all sessions without closing them.
+
+        Used after a process fork, where inherited sockets must not be reused by the
+        child process.
+        """
+        self._sessions = {}
+
+    def _discard_stale_sessions(self) -> None:
+        """Drop sessions whose event loop has been closed."""
+        for loop in [loop for loop in self._sessions if loop.is_closed()]:
+            del self._sessions[loop]
+
+
+session_manager = HttpSessionManager()
@@ -1,6 +1,26 @@
 import binascii
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import typing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import base58
+import ipfshttpclient
+
+from src.config import config
+from src.utils.cache import MISSING, LRUCache
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Base58 alphabet, IPFS hashes are used as file names so anything else is rejected
+IPFS_HASH_PATTERN = re.compile(r"[1-9A-HJ-NP-Za-km-z]{32,128}")
 
 
 def ipfs_to_bytes32(hash_str: str):
@@ -13,3 +33,253 @@ def bytes32_to_ipfs(bytes_array):
     """Convert bytes32 type to IPFS hash."""
     merge = b"\x12\x20" + bytes_array
     return base58.b58encode(merge).decode("utf-8")
+
+
+class IpfsCache:
+    """IpfsCache caches JSON documents (PQL definitions) fetched from IPFS.
+
+    IPFS content is immutable by hash, so documents are cached without expiry in an
+    in-memory LRU and on disk (`<hash>.json` files). Only documents fetched from the
+    configured IPFS node are cached: the content is not verified against its hash, so
+    documents served by other nodes cannot be trusted to match it. The disk cache is
+    bounded to `max_disk_entries` files and warms the in-memory cache on start.
+    Documents requested at least `pin_threshold` times are pinned on the IPFS node in
+    the background, so the node keeps the hot definitions available. Requests are
+    counted for the `max_disk_entries` most recently requested documents.
+
+    The following metrics are reported:
+        - `ipfs_cache.hits`, `ipfs_cache.misses`, `ipfs_cache.hit_rate`: in-memory cache
+        - `ipfs_cache.disk_hits`: documents loaded from disk
+        - `ipfs_cache.fetches`: documents fetched from IPFS
+        - `ipfs_cache.pinned`: documents pinned on the IPFS node
+    """
+
+    def __init__(
+        self,
+        address: str = config.IPFS_API_SERVER_ADDRESS,
+        folder: Path = config.DATA_FOLDER.joinpath("ipfs_cache"),
+        maxsize: int = config.IPFS_CACHE_SIZE,
+        max_disk_entries: int = config.IPFS_CACHE_DISK_SIZE,
+        pin_threshold: int = config.IPFS_CACHE_PIN_THRESHOLD,
+    ):
+        """Inits IpfsCache.
+
+        Args:
+            address (str): default IPFS API server address.
+            folder (Path): folder of the on-disk cache.
+            maxsize (int): number of documents kept in memory.
+            max_disk_entries (int): number of documents kept on disk.
+            pin_threshold (int): number of requests after which a document is pinned,
+                0 disables pinning.
+        """
+        self.address = address
+        self.folder = Path(folder)
+        self.max_disk_entries = max_disk_entries
+        self.pin_threshold = pin_threshold
+
+        self._documents = LRUCache(maxsize, name="ipfs_cache")
+        self._requests = LRUCache(max_disk_entries)
+        self._pinned: typing.Set[str] = set()
+        self._pin_executor: typing.Optional[ThreadPoolExecutor] = None
+        self._pin_executor_pid: typing.Optional[int] = None
+        # Documents on disk from least to most recently used, read from disk once
+        self._disk_index: typing.Optional[typing.OrderedDict[str, None]] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def get_json(
+        self, ipfs_hash: str, timeout: float, address: typing.Optional[str] = None
+    ) -> typing.Any:
+        """Get the JSON document stored under `ipfs_hash`.
+
+        Documents fetched from another IPFS node than `self.address` are not cached
+        and their client is closed after the request.
+
+        Args:
+            ipfs_hash (str): IPFS hash of the document
+            timeout (float): IPFS request timeout in seconds
+            address (Optional[str]): IPFS API server address, `self.address` if omitted
+
+        Returns:
+            typing.Any: decoded JSON document
+
+        Raises:
+            ipfshttpclient.exceptions.DecodingError: document is not a JSON file.
+            requests.exceptions.ReadTimeout: IPFS timed out.
+        """
+        address = address or self.address
+        cacheable = IPFS_HASH_PATTERN.fullmatch(ipfs_hash) is not None
+
+        document = self._documents.get(ipfs_hash) if cacheable else MISSING
+        if document is MISSING and cacheable:
+            document = self._load(ipfs_hash)
+            if document is not MISSING:
+                metrics.inc("ipfs_cache.disk_hits")
+                self._documents.set(ipfs_hash, document)
+
+        if document is MISSING:
+            metrics.inc("ipfs_cache.fetches")
+            if address == self.address:
+                document = self.get_client().get_json(ipfs_hash, timeout=timeout)
+            else:
+                with ipfshttpclient.connect(address) as client:
+                    document = client.get_json(ipfs_hash, timeout=timeout)
+
+            if cacheable and address == self.address:
+                self._documents.set(ipfs_hash, document)
+                self._store(ipfs_hash, document)
+
+        if cacheable:
+            self._count_request(ipfs_hash)
+
+        return document
+
+    def get_client(self):
+        """Get the IPFS client of this thread for `self.address`.
+
+        The client keeps its HTTP session open, so consecutive requests reuse the
+        connection to the IPFS node. Clients are not shared between threads and are
+        recreated after a fork.
+
+        Returns:
+            ipfshttpclient.Client: IPFS client
+        """
+        if getattr(self._local, "pid", None) != os.getpid():
+            self._local.pid = os.getpid()
+            self._local.client = ipfshttpclient.connect(self.address, session=True)
+
+        return self._local.client
+
+    def warm_start(self) -> int:
+        """Load the most recently used documents from disk into memory.
+
+        Returns:
+            int: number of loaded documents
+        """
+        with self._lock:
+            recent = list(self._get_disk_index())[-self._documents.maxsize :]
+
+        loaded = 0
+        for ipfs_hash in recent:
+            document = self._load(ipfs_hash)
+            if document is not MISSING:
+                self._documents.set(ipfs_hash, document)
+                loaded += 1
+
+        logger.info(f"Warmed IPFS cache with {loaded} documents.")
+        return loaded
+
+    def _count_request(self, ipfs_hash: str) -> None:
+        """Count the request and pin the document on the IPFS node once it is hot.
+
+        Args:
+            ipfs_hash (str): IPFS hash of the document
+        """
+        with self._lock:
+            requests = self._requests.get(ipfs_hash, 0) + 1
+            self._requests.set(ipfs_hash, requests)
+            pin = (
+                self.pin_threshold
+                and requests >= self.pin_threshold
+                and ipfs_hash not in self._pinned
+            )
+            if pin:
+                self._pinned.add(ipfs_hash)
+                if self._pin_executor is None or self._pin_executor_pid != os.getpid():
+                    self._pin_executor_pid = os.getpid()
+                    self._pin_executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="ipfs-pin"
+                    )
+
+        if pin:
+            self._pin_executor.submit(self._pin, ipfs_hash)
+
+    def _pin(self, ipfs_hash: str) -> None:
+        """Pin the document on the IPFS node.
+
+        Args:
+            ipfs_hash (str): IPFS hash of the document
+        """
+        try:
+            self.get_client().pin.add(ipfs_hash)
+            metrics.inc("ipfs_cache.pinned")
+            logger.info(f"Pinned hot IPFS document {ipfs_hash}.")
+        except Exception as e:
+            logger.warning(f"Failed to pin IPFS document {ipfs_hash}: {e}")
+
+    def _load(self, ipfs_hash: str) -> typing.Any:
+        """Load the document from disk.
+
+        Args:
+            ipfs_hash (str): IPFS hash of the document
+
+        Returns:
+            typing.Any: decoded JSON document, `MISSING` if it is not on disk
+        """
+        document_file = self.folder.joinpath(f"{ipfs_hash}.json")
+        try:
+            document = json.loads(document_file.read_text())
+        except (OSError, ValueError):
+            return MISSING
+
+        # Refresh the modification time, it orders the index built on the next start
+        document_file.touch()
+        with self._lock:
+            index = self._get_disk_index()
+            index[ipfs_hash] = None
+            index.move_to_end(ipfs_hash)
+
+        return document
+
+    def _store(self, ipfs_hash: str, document: typing.Any) -> None:
+        """Store the document on disk and evict the least recently used ones.
+
+        Args:
+            ipfs_hash (str): IPFS hash of the document
+            document (Any): decoded JSON document
+        """
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+        document_file = self.folder.joinpath(f"{ipfs_hash}.json")
+        tmp_file = document_file.with_name(f".{ipfs_hash}.{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(document))
+        os.replace(tmp_file, document_file)
+
+        with self._lock:
+            index = self._get_disk_index()
+            index[ipfs_hash] = None
+            index.move_to_end(ipfs_hash)
+
+            excess = max(0, len(index) - self.max_disk_entries)
+            stale = [
+                stale_hash
+                for stale_hash in itertools.islice(index, excess)
+                if stale_hash not in self._pinned
+            ]
+            for stale_hash in stale:
+                del index[stale_hash]
+
+        for stale_hash in stale:
+            self.folder.joinpath(f"{stale_hash}.json").unlink(missing_ok=True)
+
+    def _get_disk_index(self) -> typing.OrderedDict[str, None]:
+        """Get the index of the documents on disk, listing the folder on first use.
+
+        Must be called with `self._lock` held.
+
+        Returns:
+            OrderedDict[str, None]: IPFS hashes from least to most recently used
+        """
+        if self._disk_index is None:
+            files = []
+            for document_file in self.folder.glob("*.json"):
+                try:
+                    files.append((document_file.stat().st_mtime, document_file.stem))
+                except OSError:
+                    continue
+            self._disk_index = OrderedDict.fromkeys(stem for _, stem in sorted(files))
+
+        return self._disk_index
+
+
+ipfs_cache = IpfsCache()
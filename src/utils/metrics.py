@@ -0,0 +1,63 @@
+import threading
+import typing
+from collections import defaultdict
+
+
+class Metrics:
+    """Metrics holds in-process counters and gauges reported by node components.
+
+    Counters only ever increase (e.g. cache hits), gauges hold the last observed value
+    (e.g. pool size). Metric names are dotted strings such as `sql_pool.hits`.
+    """
+
+    def __init__(self):
+        """Inits empty Metrics object."""
+        self._lock = threading.Lock()
+        self._counters: typing.Dict[str, float] = defaultdict(float)
+        self._gauges: typing.Dict[str, float] = {}
+
+    def inc(self, name: str, value: float = 1) -> None:
+        """Increase counter `name` by `value`.
+
+        Args:
+            name (str): counter name
+            value (float): amount to increase the counter by
+        """
+        with self._lock:
+            self._counters[name] += value
+
+    def set(self, name: str, value: float) -> None:
+        """Set gauge `name` to `value`.
+
+        Args:
+            name (str): gauge name
+            value (float): observed value
+        """
+        with self._lock:
+            self._gauges[name] = value
+
+    def get(self, name: str) -> float:
+        """Get the current value of counter or gauge `name`.
+
+        Args:
+            name (str): metric name
+
+        Returns:
+            float: metric value, 0 if it was never reported
+        """
+        with self._lock:
+            if name in self._gauges:
+                return self._gauges[name]
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict:
+        """Get all metrics.
+
+        Returns:
+            dict: a dict of {name: value} for every counter and gauge
+        """
+        with self._lock:
+            return {**self._counters, **self._gauges}
+
+
+metrics = Metrics()
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import time
+import typing
+from collections import Counter
+from contextlib import asynccontextmanager
+
+import asyncpg
+
+from src.config import config
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresPoolRegistry:
+    """PostgresPoolRegistry keeps one `asyncpg` connection pool per database URI.
+
+    Pools are bound to the event loop they were created on and are keyed by
+    (loop, uri). Each pooled connection keeps its own prepared statement cache, so
+    repeated queries skip both the handshake and query planning. Pools which were not
+    used for `idle_timeout` seconds are closed. URIs come from PQL definitions, so at
+    most `max_pools` pools are kept per loop and the least recently used one is
+    closed to make room for a new one.
+
+    The following metrics are reported:
+        - `sql_pool.hits`: acquisitions served by an existing pool
+        - `sql_pool.misses`: acquisitions which had to create a new pool
+        - `sql_pool.acquires`: number of acquired connections
+        - `sql_pool.wait_seconds`: total time spent waiting for a connection
+        - `sql_pool.evictions`: number of pools closed due to inactivity or to the
+          `max_pools` limit
+        - `sql_pool.pools`: number of open pools
+    """
+
+    def __init__(
+        self,
+        min_size: int = config.SQL_POOL_MIN_SIZE,
+        max_size: int = config.SQL_POOL_MAX_SIZE,
+        max_inactive_connection_lifetime: float = config.SQL_POOL_MAX_INACTIVE_CONNECTION_LIFETIME,
+        idle_timeout: float = config.SQL_POOL_IDLE_TIMEOUT,
+        statement_cache_size: int = config.SQL_STATEMENT_CACHE_SIZE,
+        max_cached_statement_lifetime: int = config.SQL_MAX_CACHED_STATEMENT_LIFETIME,
+        max_pools: int = config.SQL_MAX_POOLS,
+    ):
+        """Inits PostgresPoolRegistry.
+
+        Args:
+            min_size (int): number of connections a pool is initialised with.
+            max_size (int): maximum number of connections in a pool.
+            max_inactive_connection_lifetime (float): seconds after which an idle
+                connection in a pool is closed.
+            idle_timeout (float): seconds after which an unused pool is closed.
+            statement_cache_size (int): size of the prepared statement cache of each
+                connection.
+            max_cached_statement_lifetime (int): seconds a prepared statement is kept.
+            max_pools (int): maximum number of pools per event loop.
+        """
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_inactive_connection_lifetime = max_inactive_connection_lifetime
+        self.idle_timeout = idle_timeout
+        self.statement_cache_size = statement_cache_size
+        self.max_cached_statement_lifetime = max_cached_statement_lifetime
+        self.max_pools = max_pools
+
+        self._pools: typing.Dict[tuple, asyncpg.pool.Pool] = {}
+        self._last_used: typing.Dict[tuple, float] = {}
+        self._in_use: typing.Counter[tuple] = Counter()
+        self._pending: typing.Dict[tuple, asyncio.Future] = {}
+
+    async def get_pool(self, uri: str) -> asyncpg.pool.Pool:
+        """Get the pool for `uri` on the running loop, creating it if needed.
+
+        Args:
+            uri (str): database connection URI
+
+        Returns:
+            asyncpg.pool.Pool: connection pool
+        """
+        key = (asyncio.get_event_loop(), uri)
+        await self._evict_idle_pools()
+
+        if key in self._pools:
+            metrics.inc("sql_pool.hits")
+        elif key in self._pending:
+            # Another step is already creating the pool, share it
+            metrics.inc("sql_pool.hits")
+            await asyncio.shield(self._pending[key])
+        else:
+            metrics.inc("sql_pool.misses")
+            await self._evict_least_recently_used(key[0])
+            self._pending[key] = asyncio.ensure_future(self._create_pool(uri))
+            try:
+                self._pools[key] = await self._pending[key]
+            finally:
+                del self._pending[key]
+            metrics.set("sql_pool.pools", len(self._pools))
+
+        self._last_used[key] = time.monotonic()
+        return self._pools[key]
+
+    @asynccontextmanager
+    async def acquire(self, uri: str) -> typing.AsyncIterator[asyncpg.Connection]:
+        """Acquire a pooled connection to `uri`.
+
+        Args:
+            uri (str): database connection URI
+
+        Yields:
+            asyncpg.Connection: connection which is released back to the pool on exit
+        """
+        key = (asyncio.get_event_loop(), uri)
+        pool = await self.get_pool(uri)
+
+        # The pool is in use until the connection is released, it is not evicted
+        # meanwhile however long the query runs
+        self._in_use[key] += 1
+        try:
+            start = time.monotonic()
+            async with pool.acquire() as conn:
+                metrics.inc("sql_pool.acquires")
+                metrics.inc("sql_pool.wait_seconds", time.monotonic() - start)
+                yield conn
+        finally:
+            self._in_use[key] -= 1
+            if not self._in_use[key]:
+                del self._in_use[key]
+            self._last_used[key] = time.monotonic()
+
+    async def close(self) -> None:
+        """Close all pools bound to the running loop."""
+        loop = asyncio.get_event_loop()
+        for key in [key for key in self._pools if key[0] is loop]:
+            await self._close_pool(key)
+
+    def shutdown(self) -> None:
+        """Close every pool whose event loop is still usable.
+
+        Called from synchronous contexts, e.g. when a Celery worker process exits.
+        """
+        for key, pool in list(self._pools.items()):
+            loop = key[0]
+            if not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(pool.close())
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all pools without closing them, e.g. after a process fork."""
+        self._pools = {}
+        self._last_used = {}
+        self._in_use = Counter()
+        self._pending = {}
+        metrics.set("sql_pool.pools", 0)
+
+    async def _create_pool(self, uri: str) -> asyncpg.pool.Pool:
+        """Create a new pool for `uri`.
+
+        Args:
+            uri (str): database connection URI
+
+        Returns:
+            asyncpg.pool.Pool: connection pool
+        """
+        logger.debug("Creating Postgres connection pool.")
+        return await asyncpg.create_pool(
+            uri,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+            statement_cache_size=self.statement_cache_size,
+            max_cached_statement_lifetime=self.max_cached_statement_lifetime,
+        )
+
+    async def _evict_idle_pools(self) -> None:
+        """Close pools which were not used for `self.idle_timeout` seconds and drop
+        pools bound to closed loops."""
+        now = time.monotonic()
+        for key in list(self._pools):
+            if key[0].is_closed():
+                self._pools.pop(key)
+                self._last_used.pop(key, None)
+            elif (
+                key[0] is asyncio.get_event_loop()
+                and key not in self._in_use
+                and now - self._last_used.get(key, now) > self.idle_timeout
+            ):
+                metrics.inc("sql_pool.evictions")
+                await self._close_pool(key)
+
+    async def _evict_least_recently_used(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Close the least recently used pools of `loop` until a new pool fits within
+        `self.max_pools`.
+
+        Pools with acquired connections are only closed if every pool is in use,
+        closing them waits for their connections to be released.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): event loop of the new pool
+        """
+        keys = sorted(
+            (key for key in self._pools if key[0] is loop),
+            key=lambda key: (key in self._in_use, self._last_used.get(key, 0)),
+        )
+        for key in keys[: max(0, len(keys) - self.max_pools + 1)]:
+            metrics.inc("sql_pool.evictions")
+            await self._close_pool(key)
+
+    async def _close_pool(self, key: tuple) -> None:
+        """Close and forget the pool on `key`.
+
+        Args:
+            key (tuple): (loop, uri) pool key
+        """
+        pool = self._pools.pop(key)
+        self._last_used.pop(key, None)
+        metrics.set("sql_pool.pools", len(self._pools))
+        await pool.close()
+
+
+pool_registry = PostgresPoolRegistry()
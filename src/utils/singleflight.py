@@ -0,0 +1,51 @@
+import asyncio
+import typing
+
+from src.utils.metrics import metrics
+
+
+class SingleFlight:
+    """SingleFlight collapses concurrent calls for the same key into one execution.
+
+    The first caller for a key starts the coroutine, callers arriving while it is still
+    running await the same result (or exception). Once it completes, the next call for
+    the key executes again.
+
+    If given a `name`, the `<name>.shared` metric counts calls that were served by an
+    execution already in flight.
+    """
+
+    def __init__(self, name: typing.Optional[str] = None):
+        """Inits SingleFlight.
+
+        Args:
+            name (Optional[str]): metrics prefix, metrics are not reported if omitted.
+        """
+        self.name = name
+        self._calls: typing.Dict[tuple, asyncio.Future] = {}
+
+    async def do(
+        self, key: typing.Hashable, fn: typing.Callable[[], typing.Awaitable]
+    ) -> typing.Any:
+        """Execute `fn` unless an execution for `key` is already in flight.
+
+        Args:
+            key (Hashable): deduplication key
+            fn (Callable): function returning the awaitable to execute
+
+        Returns:
+            Any: result of the (shared) execution
+        """
+        # Futures are bound to their event loop, keep calls from different loops apart
+        call_key = (asyncio.get_event_loop(), key)
+
+        future = self._calls.get(call_key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[call_key] = future
+            future.add_done_callback(lambda _: self._calls.pop(call_key, None))
+        elif self.name:
+            metrics.inc(f"{self.name}.shared")
+
+        # Shield the shared execution from the cancellation of a single caller
+        return await asyncio.shield(future)
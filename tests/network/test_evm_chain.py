@@ -0,0 +1,30 @@
+import pytest
+
+from src.network.evm_chain import reconnect_middleware
+
+
+def dropping_request(calls):
+    def make_request(method, params):
+        calls.append(method)
+        if len(calls) == 1:
+            raise ConnectionResetError("connection reset")
+        return {"result": "0x1"}
+
+    return make_request
+
+
+def test_reconnect_middleware_retries_read_only_requests():
+    calls = []
+    middleware = reconnect_middleware(dropping_request(calls), None)
+
+    assert middleware("eth_getBalance", ["0x1", "latest"]) == {"result": "0x1"}
+    assert calls == ["eth_getBalance", "eth_getBalance"]
+
+
+def test_reconnect_middleware_does_not_resend_transactions():
+    calls = []
+    middleware = reconnect_middleware(dropping_request(calls), None)
+
+    with pytest.raises(ConnectionResetError):
+        middleware("eth_sendRawTransaction", ["0xf86c"])
+    assert calls == ["eth_sendRawTransaction"]
@@ -0,0 +1,124 @@
+import threading
+from concurrent.futures import Future
+
+from src.network.fulfillment import FulfillmentBatcher
+
+
+class FakeFunctions:
+    def fulfillRequest(self, *args):
+        return ("fulfillRequest", args)
+
+    def fulfillRequests(self, *args):
+        return ("fulfillRequests", args)
+
+
+class FakeChain:
+    name = "eth.test"
+    oracle_metadata = []
+
+    def __init__(self):
+        self.eth = self
+        self.functions = FakeFunctions()
+        self.sent = []
+
+    def get_connection(self):
+        return self
+
+    def contract(self, abi, address):
+        return self
+
+    def getCode(self, address):
+        return b""
+
+    @staticmethod
+    def fulfill_args(w3, event, res):
+        return (event["args"]["requestId"], res)
+
+    def send_transaction(self, contract_function, description, on_failure=None):
+        self.sent.append(contract_function)
+        self.on_failure = on_failure
+        return f"0x{len(self.sent)}"
+
+
+def request(request_id):
+    return {"address": "0xoracle", "args": {"requestId": request_id}}
+
+
+def test_fulfillment_batcher_bursts_without_batch_support():
+    chain = FakeChain()
+    batcher = FulfillmentBatcher(chain, window=10, max_size=3)
+
+    threads = [
+        threading.Thread(target=batcher.submit, args=(request(i), i)) for i in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert sorted(chain.sent) == [("fulfillRequest", (i, i)) for i in range(3)]
+
+
+def test_fulfillment_batcher_sends_batch(monkeypatch):
+    chain = FakeChain()
+    batcher = FulfillmentBatcher(chain, window=10, max_size=2)
+    monkeypatch.setattr(batcher, "_supports_batch", lambda w3, address: True)
+
+    threads = [
+        threading.Thread(target=batcher.submit, args=(request(i), i)) for i in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(chain.sent) == 1
+    name, (request_ids, results) = chain.sent[0]
+    assert name == "fulfillRequests"
+    assert sorted(request_ids) == sorted(results) == [0, 1]
+
+
+def test_fulfillment_batcher_fails_requests_if_batch_support_check_fails():
+    class UnreachableChain(FakeChain):
+        oracle_metadata = [
+            {"type": "function", "name": "fulfillRequests", "inputs": []}
+        ]
+
+        def getCode(self, address):
+            raise ConnectionError("node unreachable")
+
+    chain = UnreachableChain()
+    batcher = FulfillmentBatcher(chain, window=10, max_size=2)
+
+    errors = []
+
+    def submit(i):
+        try:
+            batcher.submit(request(i), i)
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=submit, args=(i,), daemon=True) for i in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 2
+
+
+def test_fulfillment_batcher_falls_back_when_batch_reverts(monkeypatch):
+    chain = FakeChain()
+    batcher = FulfillmentBatcher(chain, window=0, max_size=2)
+    monkeypatch.setattr(batcher, "_supports_batch", lambda w3, address: True)
+
+    batcher._send("0xoracle", [(request(i), i, Future()) for i in range(2)])
+    chain.on_failure("reverted")
+
+    assert [name for name, _ in chain.sent] == [
+        "fulfillRequests",
+        "fulfillRequest",
+        "fulfillRequest",
+    ]
@@ -0,0 +1,145 @@
+import threading
+from types import SimpleNamespace
+
+from src.network import head_tracker
+from src.network.head_tracker import FinalizedHeadTracker, HeadTracker
+
+
+class FakeChain:
+    name = "eth.test"
+    url = "http://localhost:8545"
+
+    def __init__(self):
+        self.eth = SimpleNamespace(blockNumber=100)
+        self.calls = 0
+
+    def get_connection(self):
+        self.calls += 1
+        return self
+
+
+def test_head_tracker_serves_block_number_from_memory(monkeypatch):
+    chain = FakeChain()
+    tracker = HeadTracker(chain, max_staleness=60, subscribe=False)
+    # No background polls racing the test
+    monkeypatch.setattr(tracker, "start", lambda: None)
+
+    tracker._update(100)
+    chain.eth.blockNumber = 101
+    assert tracker.get_block_number() == 100
+    assert chain.calls == 0
+    assert tracker.get_block_number(max_staleness=0) == 101
+
+    # The last notification or poll is too old, e.g. a stalled subscription
+    chain.eth.blockNumber = 102
+    tracker._checked_at -= 61
+    assert tracker.get_block_number() == 102
+
+
+def test_head_tracker_keeps_block_number_for_a_block_time(monkeypatch):
+    chain = FakeChain()
+    tracker = HeadTracker(chain, max_staleness=2, subscribe=False)
+    monkeypatch.setattr(tracker, "start", lambda: None)
+    tracker.block_time = 12
+
+    tracker._update(100)
+    tracker._checked_at -= 10
+    chain.eth.blockNumber = 101
+    assert tracker.get_block_number() == 100
+    assert chain.calls == 0
+
+    # The next block is due
+    tracker._checked_at -= 3
+    assert tracker.get_block_number() == 101
+
+    # New heads are pushed, a missing notification is awaited for a block time more
+    tracker.block_time = 12
+    tracker._subscribed.set()
+    tracker._checked_at -= 20
+    chain.eth.blockNumber = 102
+    assert tracker.get_block_number() == 101
+    tracker._checked_at -= 5
+    assert tracker.get_block_number() == 102
+
+
+def test_head_tracker_estimates_block_time():
+    tracker = HeadTracker(FakeChain(), max_staleness=2, min_poll_interval=0.5)
+
+    tracker._update(100)
+    tracker._head_seen_at -= 12
+    tracker._update(101)
+
+    assert 11 < tracker.block_time < 13
+    # Next poll just after the next block is expected
+    assert 11.5 < tracker.poll_interval() < 13.5
+
+
+def test_head_tracker_backs_off_while_blocks_are_late():
+    tracker = HeadTracker(
+        FakeChain(), min_poll_interval=0.5, max_poll_interval=30, subscribe=False
+    )
+    tracker.block_time = 2
+
+    tracker._update(100)
+    tracker._head_seen_at -= 2
+    assert tracker.poll_interval() == 0.5
+
+    tracker._head_seen_at -= 4
+    assert 3.9 < tracker.poll_interval() < 4.1
+
+    tracker._head_seen_at -= 600
+    assert tracker.poll_interval() == 30
+
+
+async def test_head_tracker_wakes_up_waiting_coroutines():
+    tracker = HeadTracker(FakeChain(), min_poll_interval=60, subscribe=False)
+    tracker._update(100)
+    threading.Timer(0.05, tracker._update, (101,)).start()
+
+    assert await tracker.wait_for_block_async(101, timeout=5) == 101
+    assert await tracker.wait_for_block_async(200, timeout=0.05) is None
+    assert tracker._async_waiters == []
+
+    tracker.stop()
+
+
+class FakeSubstrateChain:
+    name = "substrate.test"
+    url = "ws://localhost:9944"
+
+    def get_connection(self):
+        return self
+
+    def get_chain_finalised_head(self):
+        return "0x2a"
+
+    def get_block_number(self, block_hash):
+        return int(block_hash, 16)
+
+
+def test_finalized_head_tracker_polls_finalised_head():
+    tracker = FinalizedHeadTracker(
+        FakeSubstrateChain(), min_poll_interval=60, subscribe=False
+    )
+
+    assert tracker.get_block_number() == 42
+
+    tracker.stop()
+
+
+def test_finalized_head_tracker_follows_subscription(monkeypatch):
+    calls = []
+
+    def rpc_subscribe(url, method, params, timeout, on_subscribed=None):
+        calls.append(method)
+        yield {"number": "0x2b"}
+        yield {"number": "0x2c"}
+
+    monkeypatch.setattr(head_tracker, "rpc_subscribe", rpc_subscribe)
+    tracker = FinalizedHeadTracker(FakeSubstrateChain())
+
+    tracker._follow_subscription()
+
+    assert calls == ["chain_subscribeFinalizedHeads"]
+    assert tracker.block_number == 44
+    assert tracker.wait_for_block(44, timeout=0) == 44
@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+
+from src.network import substrate_chain
+from src.network.substrate_chain import SubstrateChain
+
+
+def system_event(name):
+    return SimpleNamespace(
+        event_module=SimpleNamespace(name="System"), event=SimpleNamespace(name=name)
+    )
+
+
+class FakeSubstrate:
+    def __init__(self):
+        self.calls = []
+        self.events = {}
+
+    def get_block_runtime_version(self, block_hash):
+        self.calls.append("runtime_version")
+        return {"specVersion": 1}
+
+    def get_block_metadata(self, block_hash):
+        self.calls.append("metadata")
+        return "metadata"
+
+    def get_block_events(self, block_hash, metadata):
+        self.calls.append("events")
+        return SimpleNamespace(elements=self.events.get(block_hash, []))
+
+
+def test_get_block_events_caches_runtime_metadata(monkeypatch):
+    substrate = FakeSubstrate()
+    chain = SubstrateChain("test")
+    monkeypatch.setattr(chain, "get_connection", lambda: substrate)
+    monkeypatch.setattr(
+        substrate_chain.ContractMetadata,
+        "create_from_file",
+        lambda metadata_file, substrate: "contract_metadata",
+    )
+    substrate.events["0x2"] = [system_event("CodeUpdated")]
+
+    for block_hash in ["0x1", "0x2", "0x3", "0x4"]:
+        assert chain.get_block_events(block_hash) == []
+
+    assert substrate.calls == [
+        "runtime_version",
+        "metadata",
+        "events",
+        "events",
+        # Runtime upgrade in 0x2, the version of 0x3 is checked again
+        "runtime_version",
+        "events",
+        "events",
+    ]
+
+
+ALICE = "5GrwvaEF5zXb26Fz9rcQpDWS57CtERHpNehXCPcNoHGKutQY"
+ALICE_ID = "0xd43593c715fdd31c61141abd04a99fd6822c8558854ccde39a5684e7a56da27d"
+BOB_ID = "0x8eaf04151687736326c9fea17e25fc5287613693c912909cb226aa4794f26a48"
+
+
+def contract_event(account_id):
+    return SimpleNamespace(
+        event_module=SimpleNamespace(name="Contracts"),
+        event=SimpleNamespace(name="ContractExecution"),
+        params=[{"value": account_id}, {"value": "0x00"}],
+    )
+
+
+def test_get_block_events_decodes_only_tracked_contracts(monkeypatch):
+    substrate = FakeSubstrate()
+    substrate.runtime_config = None
+    substrate.events["0x1"] = [contract_event(BOB_ID), contract_event(ALICE_ID)]
+    chain = SubstrateChain("test", tracked_contracts=[ALICE])
+    decoded = []
+
+    class FakeContractEvent:
+        def __init__(self, data, runtime_config, contract_metadata):
+            decoded.append(data)
+
+        def decode(self):
+            return {"name": "Request"}
+
+    monkeypatch.setattr(chain, "get_connection", lambda: substrate)
+    monkeypatch.setattr(substrate_chain, "ContractEvent", FakeContractEvent)
+    monkeypatch.setattr(
+        substrate_chain.ContractMetadata,
+        "create_from_file",
+        lambda metadata_file, substrate: "contract_metadata",
+    )
+
+    events = chain.get_block_events("0x1")
+
+    assert [event.params[0]["value"] for event, _ in events] == [ALICE_ID]
+    assert len(decoded) == 1
+
+
+def test_get_blocks_events_scans_in_block_order(monkeypatch):
+    substrate = FakeSubstrate()
+    substrate.get_block_hash = lambda block_nr: f"0x{block_nr}"
+    chain = SubstrateChain("test")
+    monkeypatch.setattr(chain, "get_connection", lambda: substrate)
+    monkeypatch.setattr(
+        substrate_chain.ContractMetadata,
+        "create_from_file",
+        lambda metadata_file, substrate: "contract_metadata",
+    )
+
+    blocks = list(chain.get_blocks_events(1, 20))
+
+    assert [block_nr for block_nr, _ in blocks] == list(range(1, 21))
+    # Both ends of the range share the spec version, blocks use it without a lookup
+    assert substrate.calls.count("runtime_version") == 2
+    assert substrate.calls.count("events") == 20
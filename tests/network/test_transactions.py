@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+from src.network.transactions import NonceManager, ReceiptWatcher
+
+ADDRESS = "0x0000000000000000000000000000000000000001"
+
+
+class FakeChain:
+    name = "eth.test"
+
+    def __init__(self):
+        self.receipts = {}
+        self.eth = SimpleNamespace(
+            getTransactionCount=self.get_transaction_count,
+            getTransactionReceipt=self.receipts.get,
+        )
+        self.nonce_manager = NonceManager(self)
+        self.transaction_count = 5
+        self.calls = 0
+
+    def get_connection(self):
+        return self
+
+    def get_transaction_count(self, address, block_identifier):
+        self.calls += 1
+        return self.transaction_count
+
+
+def test_nonce_manager_allocates_nonces_locally():
+    chain = FakeChain()
+    nonce_manager = NonceManager(chain)
+
+    assert [nonce_manager.allocate(ADDRESS) for _ in range(3)] == [5, 6, 7]
+    assert chain.calls == 1
+
+
+def test_nonce_manager_resyncs_from_node():
+    chain = FakeChain()
+    nonce_manager = NonceManager(chain)
+
+    nonce_manager.allocate(ADDRESS)
+    chain.transaction_count = 9
+    nonce_manager.resync(ADDRESS)
+
+    assert nonce_manager.allocate(ADDRESS) == 9
+    assert chain.calls == 2
+
+
+def test_receipt_watcher_reports_failed_transactions():
+    chain = FakeChain()
+    watcher = ReceiptWatcher(chain, timeout=0)
+    watcher.start = lambda: None
+    failures = []
+
+    chain.receipts["0x1"] = {"status": 0, "blockNumber": 10}
+    chain.receipts["0x2"] = {"status": 1, "blockNumber": 10}
+    for tx_hash in ("0x1", "0x2", "0x3"):
+        watcher.watch(tx_hash, ADDRESS, tx_hash, failures.append)
+    chain.nonce_manager.allocate(ADDRESS)
+
+    watcher._check_receipts()
+
+    assert sorted(failures) == ["dropped", "reverted"]
+    assert not watcher._pending
+    # The dropped transaction resynced the nonce
+    chain.nonce_manager.allocate(ADDRESS)
+    assert chain.calls == 2
+
+
+def test_receipt_watcher_replaces_transaction_until_one_is_mined():
+    chain = FakeChain()
+    watcher = ReceiptWatcher(chain, timeout=0)
+    watcher.start = lambda: None
+    failures = []
+    replacements = iter(["0x2", "0x3"])
+
+    watcher.watch(
+        "0x1", ADDRESS, "0x1", failures.append, nonce=5, replace=replacements.__next__
+    )
+
+    # Nonce 5 is still unused, the transaction is pending and gets replaced
+    watcher._check_receipts()
+    assert watcher._pending["0x1"]["hashes"] == ["0x1", "0x2"]
+
+    # The original transaction, considered dropped by now, is mined after all
+    chain.receipts["0x1"] = {"status": 1, "blockNumber": 10}
+    chain.transaction_count = 6
+    watcher._check_receipts()
+
+    assert failures == []
+    assert not watcher._pending
+
+
+def test_receipt_watcher_drops_transaction_once_its_nonce_is_used():
+    chain = FakeChain()
+    watcher = ReceiptWatcher(chain, timeout=0)
+    watcher.start = lambda: None
+    failures = []
+
+    watcher.watch(
+        "0x1", ADDRESS, "0x1", failures.append, nonce=5, replace=lambda: "0x2"
+    )
+    chain.transaction_count = 6
+    watcher._check_receipts()
+
+    assert failures == ["dropped"]
+    assert not watcher._pending
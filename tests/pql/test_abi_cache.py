@@ -0,0 +1,34 @@
+import asyncio
+
+from src.pql.handlers.abi_cache import AbiCache
+
+ADDRESS = "0xBb2b8038a1640196FbE3e38816F3e67Cba72D940"
+ABI = [{"type": "function", "name": "getReserves", "inputs": [], "outputs": []}]
+
+
+async def test_abi_cache_collapses_concurrent_fetches(tmp_path):
+    cache = AbiCache(folder=tmp_path, maxsize=2, contract_cache_size=2)
+    fetched = []
+
+    async def fetch(address):
+        fetched.append(address)
+        await asyncio.sleep(0.01)
+        return ABI
+
+    results = await asyncio.gather(*[cache.get_abi(ADDRESS, fetch) for _ in range(5)])
+
+    assert results == [ABI] * 5
+    assert fetched == [ADDRESS.lower()]
+
+
+async def test_abi_cache_persists_to_disk(tmp_path):
+    async def fetch(address):
+        return ABI
+
+    await AbiCache(folder=tmp_path).get_abi(ADDRESS, fetch)
+
+    async def fail(address):
+        raise AssertionError("ABI should be loaded from disk")
+
+    assert await AbiCache(folder=tmp_path).get_abi(ADDRESS, fail) == ABI
+    assert len(list(tmp_path.joinpath("objects").iterdir())) == 1
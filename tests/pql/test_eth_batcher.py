@@ -0,0 +1,111 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from src.pql.exceptions import ExternalError
+from src.pql.handlers.eth_batcher import EthRequestBatcher
+
+
+class FakeChain:
+    name = "eth.test"
+    url = "ws://localhost:8546"
+
+    def __init__(self):
+        self.requests = []
+        provider = SimpleNamespace(make_request=self.make_request)
+        self.w3 = SimpleNamespace(manager=SimpleNamespace(provider=provider))
+
+    def get_connection(self):
+        return self.w3
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+    def make_request(self, method, params):
+        self.requests.append((method, params))
+        if params[0] == "0xbad":
+            return {"id": 1, "error": {"message": "invalid address"}}
+        return {"id": 1, "result": hex(len(params[0]))}
+
+
+async def test_batcher_deduplicates_requests_in_window():
+    chain = FakeChain()
+    batcher = EthRequestBatcher(window=0.01, max_size=10)
+
+    results = await asyncio.gather(
+        batcher.request(chain, "eth_getBalance", ["0x1", "0xa"], 10),
+        batcher.request(chain, "eth_getBalance", ["0x1", "0xa"], 10),
+        batcher.request(chain, "eth_getBalance", ["0x123", "0xa"], 10),
+    )
+
+    assert results == ["0x3", "0x3", "0x5"]
+    assert len(chain.requests) == 2
+
+
+async def test_batcher_propagates_request_errors():
+    chain = FakeChain()
+    batcher = EthRequestBatcher(window=0.01, max_size=10)
+
+    ok, failed = await asyncio.gather(
+        batcher.request(chain, "eth_getBalance", ["0x1", "0xa"], 10),
+        batcher.request(chain, "eth_getBalance", ["0xbad", "0xa"], 10),
+        return_exceptions=True,
+    )
+
+    assert ok == "0x3"
+    assert isinstance(failed, ExternalError)
+
+
+async def test_batcher_timer_of_full_batch_does_not_flush_next_batch():
+    chain = FakeChain()
+    batcher = EthRequestBatcher(window=0.05, max_size=2)
+
+    # Full batch, sent before its window timer fires
+    await asyncio.gather(
+        batcher.request(chain, "eth_getBalance", ["0x1", "0xa"], 10),
+        batcher.request(chain, "eth_getBalance", ["0x12", "0xa"], 10),
+    )
+    await asyncio.sleep(0.03)
+    pending = asyncio.ensure_future(
+        batcher.request(chain, "eth_getBalance", ["0x123", "0xa"], 10)
+    )
+
+    # The first batch's timer fired, the second batch waits for its own window
+    await asyncio.sleep(0.03)
+    assert len(chain.requests) == 2
+    assert await pending == "0x5"
+    assert len(chain.requests) == 3
+
+
+async def test_batcher_sends_websocket_requests_sequentially():
+    class ThreadedChain(FakeChain):
+        def __init__(self):
+            super().__init__()
+            self.executor = ThreadPoolExecutor(max_workers=4)
+            self.in_flight = self.max_in_flight = 0
+
+        async def run(self, fn, *args):
+            return await asyncio.get_event_loop().run_in_executor(
+                self.executor, fn, *args
+            )
+
+        def make_request(self, method, params):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            time.sleep(0.01)
+            self.in_flight -= 1
+            return super().make_request(method, params)
+
+    chain = ThreadedChain()
+    batcher = EthRequestBatcher(window=0.01, max_size=10)
+
+    results = await asyncio.gather(
+        *[
+            batcher.request(chain, "eth_getBalance", ["0x" + "1" * i, "0xa"], 10)
+            for i in range(1, 5)
+        ]
+    )
+
+    assert results == ["0x3", "0x4", "0x5", "0x6"]
+    assert chain.max_in_flight == 1
@@ -0,0 +1,44 @@
+import pytest
+
+from src.pql.exceptions import PqlValidationError
+from src.pql.plan import compile_pql
+
+PQL = {
+    "name": "Simple HTTP GET request",
+    "psql_version": "0.1",
+    "sources": [
+        {
+            "name": "Bitcoin price CoinGecko",
+            "pipeline": [
+                {
+                    "step": "extract",
+                    "method": "http.get",
+                    "uri": "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd",
+                },
+                {"step": "traverse", "method": "json", "params": ["bitcoin", "usd"]},
+            ],
+        }
+    ],
+}
+
+
+def test_compile_pql_caches_by_canonical_hash() -> None:
+    plan = compile_pql(PQL)
+    reordered = {key: PQL[key] for key in reversed(list(PQL))}
+
+    assert compile_pql(reordered) is plan
+    assert len(plan.sources) == 1
+    assert [step for _, step in plan.sources[0]] == PQL["sources"][0]["pipeline"]
+
+
+def test_compile_pql_caches_by_content() -> None:
+    plan = compile_pql(PQL)
+    changed = {**PQL, "name": "Changed HTTP GET request"}
+
+    assert plan.key[0] == "sha256"
+    assert compile_pql(changed) is not plan
+
+
+def test_compile_pql_invalid() -> None:
+    with pytest.raises(PqlValidationError):
+        compile_pql({"name": "Invalid"})
@@ -0,0 +1,35 @@
+import asyncio
+
+from src.pql.result_cache import ResultCache
+from src.utils.metrics import metrics
+
+
+async def test_result_cache_reuses_fresh_results():
+    cache = ResultCache(maxsize=2)
+    executed = []
+
+    async def execute():
+        executed.append(1)
+        await asyncio.sleep(0.01)
+        return len(executed)
+
+    results = await asyncio.gather(
+        *[cache.get_or_execute("pql", 60, execute) for _ in range(3)]
+    )
+    assert results == [1, 1, 1]
+    assert await cache.get_or_execute("pql", 60, execute) == 1
+    assert len(executed) == 1
+
+
+async def test_result_cache_refreshes_stale_results():
+    cache = ResultCache(maxsize=2)
+    stale = metrics.get("pql_result_cache.stale")
+
+    async def execute():
+        return object()
+
+    first = await cache.get_or_execute("pql", 0.01, execute)
+    await asyncio.sleep(0.02)
+
+    assert await cache.get_or_execute("pql", 0.01, execute) is not first
+    assert metrics.get("pql_result_cache.stale") == stale + 1
@@ -0,0 +1,380 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from src.config import config
+from src.process import collector
+from src.utils.metrics import metrics
+
+
+class FakeChain:
+    name = "eth.test"
+
+    def __init__(self):
+        self.scanned = []
+
+    def get_request_events(self, from_block, to_block):
+        self.scanned.append((from_block, to_block))
+        return [{"blockNumber": to_block}]
+
+    def get_connection(self):
+        return SimpleNamespace(
+            eth=SimpleNamespace(
+                getBlock=lambda block_number: {"timestamp": time.time() - 3}
+            )
+        )
+
+
+class FakeCursor:
+    def __init__(self):
+        self.advanced = []
+
+    def advance(self, block_number, head):
+        self.advanced.append((block_number, head))
+
+
+def test_collect_evm_request_events_catches_up_in_ranges(monkeypatch):
+    monkeypatch.setattr(config, "EVM_LOG_SCAN_MAX_BLOCKS", 10)
+    dispatched = []
+    monkeypatch.setattr(
+        collector.handle_evm_request_event,
+        "delay",
+        lambda chain, event: dispatched.append(event["blockNumber"]),
+    )
+    chain, cursor = FakeChain(), FakeCursor()
+
+    collector.collect_evm_request_events(chain, 100, 125, cursor)
+
+    assert chain.scanned == [(100, 109), (110, 119), (120, 125)]
+    assert dispatched == [109, 119, 125]
+    assert cursor.advanced == [(109, 125), (119, 125), (125, 125)]
+    assert 3 <= metrics.get("collector.eth.test.detection_delay") < 4
+
+
+class FakeSubstrateChain:
+    name = "substrate.test"
+
+    def __init__(self):
+        self.scanned = []
+
+    def get_connection(self):
+        return self
+
+    def get_block_hash(self, block_nr):
+        return block_nr
+
+    def get_block_events(self, block_hash):
+        self.scanned.append(block_hash)
+        return [(SimpleNamespace(params=[]), {"block": block_hash})]
+
+    def get_blocks_events(self, from_block, to_block):
+        self.scanned.append((from_block, to_block))
+        return (
+            (block_nr, self.get_block_events(block_nr))
+            for block_nr in range(from_block, to_block + 1)
+        )
+
+
+def test_collect_substrate_request_events_catches_up_in_parallel(monkeypatch):
+    monkeypatch.setattr(config, "SUBSTRATE_CATCH_UP_THRESHOLD", 3)
+    monkeypatch.setattr(config, "SUBSTRATE_CATCH_UP_BATCH", 5)
+    dispatched = []
+    monkeypatch.setattr(
+        collector.handle_substrate_request_event,
+        "delay",
+        lambda chain, event, args: dispatched.append(args["block_number"]),
+    )
+    chain, cursor = FakeSubstrateChain(), FakeCursor()
+
+    collector.collect_substrate_request_events(chain, 100, 111, cursor)
+
+    # Ranges while more than 3 blocks are left, then block by block
+    assert [block for block in chain.scanned if isinstance(block, tuple)] == [
+        (100, 104),
+        (105, 109),
+    ]
+    assert dispatched == list(range(100, 112))
+    assert cursor.advanced == [(block_nr, 111) for block_nr in range(100, 112)]
+
+
+class FakeListenedChain:
+    type = "evm"
+
+    def __init__(
+        self, name, active=True, tracked_contracts=[], url="http://localhost:8545"
+    ):
+        self.name = name
+        self.active = active
+        self.tracked_contracts = tracked_contracts
+        self.url = url
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "url": self.url,
+            "active": self.active,
+            "tracked_contracts": self.tracked_contracts,
+        }
+
+
+async def test_collector_service_reconciles_chain_listeners(monkeypatch):
+    started, cancelled = [], []
+
+    async def listener(chain):
+        started.append((chain.name, chain.tracked_contracts, chain))
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(chain.name)
+            raise
+
+    monkeypatch.setitem(collector.LISTENERS, "evm", listener)
+    service = collector.CollectorService(processor=None)
+    service.loop = asyncio.get_event_loop()
+
+    service.reconcile(FakeListenedChain("eth.a"))
+    service.reconcile(FakeListenedChain("eth.b"))
+    await asyncio.sleep(0)
+    # Unchanged chains keep their listener
+    service.reconcile(FakeListenedChain("eth.a"))
+    await asyncio.sleep(0)
+    assert [(name, contracts) for name, contracts, _ in started] == [
+        ("eth.a", []),
+        ("eth.b", []),
+    ]
+
+    service.reconcile(FakeListenedChain("eth.a", tracked_contracts=["0x1"]))
+    service.reconcile(FakeListenedChain("eth.b", active=False))
+    await asyncio.sleep(0.01)
+
+    # The chain object is kept when only the contracts changed
+    assert started[2][:2] == ("eth.a", ["0x1"])
+    assert started[2][2] is started[0][2]
+    assert cancelled == ["eth.a", "eth.b"]
+    assert list(service._listeners) == ["eth.a"]
+    assert metrics.get("collector.listeners") == 1
+
+    service.reconcile(FakeListenedChain("eth.a", url="http://localhost:9545"))
+    await asyncio.sleep(0.01)
+
+    assert started[3][2] is not started[0][2]
+    assert started[3][2].url == "http://localhost:9545"
+
+    service.stop_listener("eth.a")
+    await asyncio.sleep(0)
+
+
+async def test_manage_collector_replaces_registered_task(monkeypatch):
+    registry, terminated = {"eth.a": "task-1"}, []
+
+    async def get_task_id(session, chain):
+        return registry.get(chain)
+
+    async def register(session, chain, task_id):
+        registry.pop(chain, None)
+        if task_id is not None:
+            registry[chain] = task_id
+
+    monkeypatch.setattr(config, "COLLECTOR_MODE", "celery")
+    monkeypatch.setattr(collector.Collector, "get_task_id", get_task_id)
+    monkeypatch.setattr(collector.Collector, "register", register)
+    monkeypatch.setattr(
+        collector.listen_for_evm_events,
+        "delay",
+        lambda payload: SimpleNamespace(id="task-2"),
+    )
+    processor = SimpleNamespace(control=SimpleNamespace(terminate=terminated.append))
+    chain = FakeListenedChain("eth.a")
+
+    await collector.manage_collector(processor, chain, session=None)
+    assert terminated == ["task-1"]
+    assert registry == {"eth.a": "task-2"}
+
+    chain.active = False
+    await collector.manage_collector(processor, chain, session=None)
+    assert terminated == ["task-1", "task-2"]
+    assert registry == {}
+
+
+async def test_registered_listener_stops_when_replaced(monkeypatch):
+    cancelled = []
+
+    async def listener():
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    monkeypatch.setattr(config, "COLLECTOR_HEARTBEAT_INTERVAL", 0.01)
+    monkeypatch.setattr(
+        collector, "collector_heartbeat", lambda chain, task_id: "task-2"
+    )
+
+    await collector.run_registered_listener("eth.a", "task-1", listener())
+    await asyncio.sleep(0)
+
+    assert cancelled == [True]
+
+
+async def test_registered_listener_survives_failed_heartbeats(monkeypatch):
+    heartbeats = [collector.HEARTBEAT_FAILED, "task-1", None]
+
+    async def listener():
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(config, "COLLECTOR_HEARTBEAT_INTERVAL", 0.01)
+    monkeypatch.setattr(
+        collector, "collector_heartbeat", lambda chain, task_id: heartbeats.pop(0)
+    )
+
+    # The listener stops once its registration is removed
+    await collector.run_registered_listener("eth.a", "task-1", listener())
+
+    assert heartbeats == []
+
+
+async def test_requeue_stale_collectors(monkeypatch):
+    managed = []
+
+    async def get_stale(session, max_age):
+        return ["eth.a", "eth.b", "eth.unknown"]
+
+    async def manage_collector(processor, chain, session):
+        managed.append(chain.name)
+
+    monkeypatch.setattr(collector.Collector, "get_stale", get_stale)
+    monkeypatch.setattr(collector, "manage_collector", manage_collector)
+    chains = SimpleNamespace(
+        get_chain={
+            "eth.a": FakeListenedChain("eth.a"),
+            "eth.b": FakeListenedChain("eth.b", active=False),
+        }.get
+    )
+
+    await collector.requeue_stale_collectors(None, chains, session=None)
+
+    assert managed == ["eth.a"]
+
+
+async def test_supervise_collectors_uses_own_session_per_check(monkeypatch):
+    sessions, checked = [], []
+
+    class FakeSession:
+        def __init__(self):
+            self.closed = False
+            sessions.append(self)
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            self.closed = True
+
+    async def requeue_stale_collectors(processor, chains, session):
+        checked.append(session)
+
+    monkeypatch.setattr(config, "COLLECTOR_HEARTBEAT_INTERVAL", 0.01)
+    monkeypatch.setattr(collector, "requeue_stale_collectors", requeue_stale_collectors)
+
+    supervisor = asyncio.ensure_future(
+        collector.supervise_collectors(None, None, FakeSession)
+    )
+    await asyncio.sleep(0.05)
+    supervisor.cancel()
+    await asyncio.gather(supervisor, return_exceptions=True)
+
+    assert len(checked) >= 2
+    assert checked == sessions[: len(checked)]
+    assert len(set(map(id, checked))) == len(checked)
+    assert all(session.closed for session in checked)
+
+
+async def run_evm_listener(monkeypatch, notified_block):
+    """Run the EVM listener of a chain at block 101 with an active `logs` subscription
+    and return the scanned ranges."""
+    scanned = []
+
+    class FakeSubscription:
+        def __init__(self, name, url, params):
+            self.active, self.notified = threading.Event(), threading.Event()
+            self.active.set()
+            if notified_block is not None:
+                self.notified.set()
+            self.notified_block = notified_block
+
+        def stop(self):
+            pass
+
+    class FakeHeadTracker:
+        def get_block_number(self):
+            return 101
+
+        async def wait_for_block_async(self, block_number, timeout):
+            await asyncio.sleep(0.01)
+
+    monkeypatch.setattr(config, "EVM_LOGS_SUBSCRIBE", True)
+    monkeypatch.setattr(collector, "SubscriptionSignal", FakeSubscription)
+    monkeypatch.setattr(
+        collector, "BlockCursor", lambda name: SimpleNamespace(load=lambda: 99)
+    )
+    monkeypatch.setattr(
+        collector,
+        "collect_evm_request_events",
+        lambda chain, from_block, to_block, cursor, stopped: scanned.append(
+            (from_block, to_block)
+        ),
+    )
+    chain = SimpleNamespace(
+        name="eth.test",
+        url="ws://localhost:8546",
+        tracked_contracts=[],
+        request_topic="0x0",
+        head_tracker=FakeHeadTracker(),
+        get_connection=lambda: None,
+    )
+
+    listener = asyncio.ensure_future(collector.evm_listener(chain))
+    await asyncio.sleep(0.05)
+    listener.cancel()
+    await asyncio.gather(listener, return_exceptions=True)
+
+    return scanned
+
+
+async def test_evm_listener_scans_up_to_notified_block(monkeypatch):
+    monkeypatch.setattr(config, "EVM_LOGS_SUBSCRIPTION_SCAN_INTERVAL", 60)
+
+    # Notification for a block the head tracker has not seen yet
+    assert await run_evm_listener(monkeypatch, notified_block=102) == [(100, 102)]
+
+
+async def test_evm_listener_scans_without_notification_after_interval(monkeypatch):
+    monkeypatch.setattr(config, "EVM_LOGS_SUBSCRIPTION_SCAN_INTERVAL", 60)
+    assert await run_evm_listener(monkeypatch, notified_block=None) == []
+
+    # A notification may have been missed, the blocks are scanned anyway
+    monkeypatch.setattr(config, "EVM_LOGS_SUBSCRIPTION_SCAN_INTERVAL", 0)
+    assert await run_evm_listener(monkeypatch, notified_block=None) == [(100, 101)]
+
+
+async def test_run_scan_stops_blocking_scan_when_cancelled():
+    scanned = []
+
+    def scan(blocks, stopped):
+        for block in blocks:
+            if stopped.is_set():
+                return
+            scanned.append(block)
+            time.sleep(0.01)
+
+    listener = asyncio.ensure_future(collector.run_scan(scan, range(100)))
+    await asyncio.sleep(0.03)
+    listener.cancel()
+    await asyncio.gather(listener, return_exceptions=True)
+
+    # The scan returned before the cancelled listener finished
+    stopped_at = len(scanned)
+    await asyncio.sleep(0.03)
+    assert stopped_at == len(scanned) < 100
@@ -0,0 +1,16 @@
+from src.config import config
+from src.process.cursor import BlockCursor
+from src.utils.metrics import metrics
+
+
+def test_block_cursor_reports_lag_without_database(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_DATABASE", False)
+    cursor = BlockCursor("eth.test")
+
+    assert cursor.load() is None
+
+    cursor.advance(90, 100)
+
+    assert cursor.block_number == 90
+    assert metrics.get("collector.eth.test.cursor") == 90
+    assert metrics.get("collector.eth.test.lag") == 10
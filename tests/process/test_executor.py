@@ -0,0 +1,28 @@
+import asyncio
+
+from src.process import executor
+from src.utils.metrics import metrics
+
+IPFS_HASH = "QmZTXQSDFpq4Y6ZTXXpCh8eWo3CpZ1ymqHnREJgSCTHMqg"
+
+
+async def test_identical_requests_share_execution(monkeypatch):
+    executed = []
+
+    async def parse_and_execute(req):
+        executed.append(req)
+        await asyncio.sleep(0.01)
+        return 42
+
+    monkeypatch.setattr(executor, "parse_and_execute", parse_and_execute)
+    shared = metrics.get("pql_executions.shared")
+
+    results = await asyncio.gather(
+        executor.execute_pql({}, IPFS_HASH, ("mainnet", 100)),
+        executor.execute_pql({}, IPFS_HASH, ("mainnet", 100)),
+        executor.execute_pql({}, IPFS_HASH, ("mainnet", 101)),
+    )
+
+    assert results == [42, 42, 42]
+    assert len(executed) == 2
+    assert metrics.get("pql_executions.shared") == shared + 1
@@ -0,0 +1,46 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from src.process.runtime import WorkerRuntime
+
+
+def test_worker_runtime_reuses_event_loop():
+    runtime = WorkerRuntime()
+
+    async def current_loop():
+        return asyncio.get_event_loop()
+
+    try:
+        first = runtime.run(current_loop())
+        second = runtime.run(current_loop())
+    finally:
+        runtime.stop()
+
+    assert first is second is runtime.loop
+    assert runtime.loop.is_closed()
+
+
+def test_worker_runtime_runs_coroutines_of_many_threads_concurrently():
+    runtime = WorkerRuntime()
+    running = []
+
+    async def create_event():
+        return asyncio.Event()
+
+    # Every coroutine waits until all of them are running, so they cannot pass one at
+    # a time
+    all_running = runtime.run(create_event())
+
+    async def request():
+        running.append(runtime._in_flight)
+        if len(running) == 5:
+            all_running.set()
+        await asyncio.wait_for(all_running.wait(), timeout=5)
+
+    try:
+        with ThreadPoolExecutor(5) as pool:
+            list(pool.map(lambda _: runtime.run(request()), range(5)))
+    finally:
+        runtime.stop()
+
+    assert sorted(running) == [1, 2, 3, 4, 5]
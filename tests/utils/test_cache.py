@@ -0,0 +1,30 @@
+from src.utils.cache import MISSING, LRUCache
+from src.utils.metrics import metrics
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    # "b" is now the least recently used entry
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_reports_hit_rate():
+    cache = LRUCache(2, name="test_lru_cache")
+
+    cache.set("a", None)
+    assert cache.get("a") is None
+    assert cache.get("b", "default") == "default"
+
+    assert metrics.get("test_lru_cache.hits") == 1
+    assert metrics.get("test_lru_cache.misses") == 1
+    assert metrics.get("test_lru_cache.hit_rate") == 0.5
@@ -0,0 +1,52 @@
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.utils.http import HttpSessionManager
+
+
+async def test_session_is_reused_within_loop():
+    manager = HttpSessionManager()
+
+    session = manager.get_session()
+    assert manager.get_session() is session
+
+    await manager.close()
+    assert session.closed
+    assert manager.get_session() is not session
+
+    await manager.close()
+
+
+async def test_session_applies_connection_limits():
+    manager = HttpSessionManager(limit=20, limit_per_host=4, dns_cache_ttl=60)
+
+    connector = manager.get_session().connector
+    assert connector.limit == 20
+    assert connector.limit_per_host == 4
+
+    await manager.close()
+
+
+async def test_session_does_not_keep_cookies():
+    cookies = []
+
+    async def handler(request):
+        cookies.append(request.headers.get("Cookie"))
+        return web.Response(text="ok", headers={"Set-Cookie": "session=secret"})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    # Cookies of IP address hosts are never stored, so the server has a hostname
+    server = TestServer(app, host="localhost")
+    await server.start_server()
+
+    manager = HttpSessionManager()
+    try:
+        for _ in range(2):
+            async with manager.get_session().get(server.make_url("/")) as resp:
+                await resp.text()
+    finally:
+        await manager.close()
+        await server.close()
+
+    assert cookies == [None, None]
@@ -0,0 +1,99 @@
+import json
+import threading
+from types import SimpleNamespace
+
+from src.utils import ipfs
+from src.utils.ipfs import IpfsCache
+
+IPFS_HASH = "QmZTXQSDFpq4Y6ZTXXpCh8eWo3CpZ1ymqHnREJgSCTHMqg"
+PQL = {"name": "Simple HTTP GET request", "psql_version": "0.1", "sources": []}
+
+
+def test_ipfs_cache_serves_documents_from_disk(tmp_path):
+    tmp_path.joinpath(f"{IPFS_HASH}.json").write_text(json.dumps(PQL))
+
+    # IPFS is never reached, the address does not resolve
+    cache = IpfsCache(address="/dns/unreachable/tcp/5001/http", folder=tmp_path)
+
+    assert cache.get_json(IPFS_HASH, timeout=1) == PQL
+    assert cache.get_json(IPFS_HASH, timeout=1) == PQL
+
+
+def test_ipfs_cache_warm_start_loads_recent_documents(tmp_path):
+    tmp_path.joinpath(f"{IPFS_HASH}.json").write_text(json.dumps(PQL))
+    tmp_path.joinpath("Qminvalid.json").write_text("not json")
+
+    cache = IpfsCache(folder=tmp_path, maxsize=10, pin_threshold=0)
+
+    assert cache.warm_start() == 1
+    assert cache.get_json(IPFS_HASH, timeout=1) == PQL
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+        self.pinned = []
+        self.pin = SimpleNamespace(add=self.pinned.append)
+
+    def get_json(self, ipfs_hash, timeout):
+        return PQL
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+
+
+def test_ipfs_cache_only_stores_documents_from_configured_node(tmp_path, monkeypatch):
+    cache = IpfsCache(address="/dns/ipfs/tcp/5001/http", folder=tmp_path)
+    clients = {}
+    monkeypatch.setattr(
+        ipfs.ipfshttpclient,
+        "connect",
+        lambda address, **kwargs: clients.setdefault(address, FakeClient()),
+    )
+
+    cache.get_json(IPFS_HASH, timeout=1, address="/dns/other/tcp/5001/http")
+    assert not tmp_path.joinpath(f"{IPFS_HASH}.json").exists()
+    assert clients["/dns/other/tcp/5001/http"].closed
+
+    cache.get_json(IPFS_HASH, timeout=1)
+    assert json.loads(tmp_path.joinpath(f"{IPFS_HASH}.json").read_text()) == PQL
+    assert not clients["/dns/ipfs/tcp/5001/http"].closed
+
+
+def test_ipfs_cache_pins_hot_documents_in_background(tmp_path):
+    cache = IpfsCache(folder=tmp_path, pin_threshold=2)
+    client = FakeClient()
+    unblock = threading.Event()
+    pinned = threading.Event()
+
+    def pin(ipfs_hash):
+        unblock.wait(timeout=5)
+        client.pinned.append(ipfs_hash)
+        pinned.set()
+
+    client.pin.add = pin
+    cache.get_client = lambda: client
+
+    cache.get_json(IPFS_HASH, timeout=1)
+    # The request reaching the threshold does not wait for the IPFS node to pin
+    cache.get_json(IPFS_HASH, timeout=1)
+    assert client.pinned == []
+
+    unblock.set()
+    assert pinned.wait(timeout=5)
+    assert client.pinned == [IPFS_HASH]
+
+
+def test_ipfs_cache_evicts_least_recently_used_files(tmp_path):
+    hashes = [IPFS_HASH[:-1] + c for c in "abc"]
+    cache = IpfsCache(folder=tmp_path, max_disk_entries=2, pin_threshold=0)
+
+    cache._store(hashes[0], PQL)
+    cache._store(hashes[1], PQL)
+    cache._load(hashes[0])
+    cache._store(hashes[2], PQL)
+
+    assert sorted(f.stem for f in tmp_path.glob("*.json")) == [hashes[0], hashes[2]]
@@ -0,0 +1,15 @@
+from src.utils.metrics import Metrics
+
+
+def test_metrics_counters_and_gauges():
+    metrics = Metrics()
+
+    metrics.inc("cache.hits")
+    metrics.inc("cache.hits", 2)
+    metrics.set("pool.size", 5)
+    metrics.set("pool.size", 3)
+
+    assert metrics.get("cache.hits") == 3
+    assert metrics.get("pool.size") == 3
+    assert metrics.get("cache.misses") == 0
+    assert metrics.snapshot() == {"cache.hits": 3, "pool.size": 3}
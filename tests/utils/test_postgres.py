@@ -0,0 +1,55 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from src.utils import postgres
+from src.utils.postgres import PostgresPoolRegistry
+
+
+class FakePool:
+    def __init__(self, uri):
+        self.uri = uri
+        self.closed = False
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    async def close(self):
+        self.closed = True
+
+
+def fake_create_pool(created):
+    async def create_pool(uri, **kwargs):
+        created.append((uri, kwargs["min_size"]))
+        return FakePool(uri)
+
+    return create_pool
+
+
+async def test_registry_closes_least_recently_used_pool(monkeypatch):
+    created = []
+    monkeypatch.setattr(postgres.asyncpg, "create_pool", fake_create_pool(created))
+    registry = PostgresPoolRegistry(min_size=0, max_pools=2)
+
+    first = await registry.get_pool("postgresql://a")
+    second = await registry.get_pool("postgresql://b")
+    async with registry.acquire("postgresql://a"):
+        pass
+    await registry.get_pool("postgresql://c")
+
+    assert second.closed and not first.closed
+    assert [min_size for _, min_size in created] == [0, 0, 0]
+    await registry.close()
+
+
+async def test_registry_keeps_pool_in_use_past_idle_timeout(monkeypatch):
+    monkeypatch.setattr(postgres.asyncpg, "create_pool", fake_create_pool([]))
+    registry = PostgresPoolRegistry(idle_timeout=0.01)
+
+    async with registry.acquire("postgresql://a") as conn:
+        # A long query on the pool, other steps trigger the idle sweep meanwhile
+        await asyncio.sleep(0.02)
+        await registry.get_pool("postgresql://b")
+        assert not conn.closed
+
+    await registry.close()